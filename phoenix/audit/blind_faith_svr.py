@@ -16,21 +16,44 @@ II. Semantic Clarity (SC): tiering (Tier 0–3) compressed to [0,1]
 III.Analytical Information Quotient (AIQ): mix of numeric density, header salience, FP entities, and anchor density
 
 Composite_v2 = 0.5*SI + 0.3*SC + 0.2*AIQ_v2
+
+All accords are derived from one TableFeatures record per processed table
+(table_features: one classification pass over every cell, one joined text).
 """
 
-import argparse, json, re
+import argparse, importlib, importlib.util, json, re, sys
+from dataclasses import dataclass
 from pathlib import Path
 from statistics import mean
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+def _shared_module(name: str):
+    """Import phoenix.<name>, or load it from its file when run as a plain script (root not on sys.path)."""
+    try:
+        return importlib.import_module(f"phoenix.{name}")
+    except ImportError:
+        qual = f"phoenix.{name}"
+        if qual in sys.modules:
+            return sys.modules[qual]
+        path = Path(__file__).resolve().parents[1].joinpath(*name.split(".")).with_suffix(".py")
+        spec = importlib.util.spec_from_file_location(qual, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[qual] = mod
+        spec.loader.exec_module(mod)
+        return mod
+
+KeywordMatcher = _shared_module("utils.text").KeywordMatcher
+_tabularity = _shared_module("metrics.tabularity")
+_anchors = _shared_module("utils.anchors")
 
 # -------------------------
 # Regex / tokens
 # -------------------------
 
 NUM_RE     = re.compile(r"^[0-9,.\-\(\)%₹`]+$")
-EMAIL_RE   = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
-URL_RE     = re.compile(r"(?:(?:https?://)?(?:www\.)?[A-Za-z0-9.-]+\.[A-Za-z]{2,}(?:/[^\s]*)?)", re.I)
-PHONE_RE   = re.compile(r"(?:\+?\d[\d\s\-]{7,}\d)")
+EMAIL_RE   = _anchors.EMAIL_RE  # bounded runs, see utils/anchors.py
+URL_RE     = _anchors.URL_RE
+PHONE_RE   = _anchors.PHONE_RE
 
 MONTH_TOKENS = ("jan","feb","mar","apr","may","jun","jul","aug","sep","sept","oct","nov","dec")
 YEAR_RE      = re.compile(r"(?:19|20)\d{2}")
@@ -46,6 +69,10 @@ HEADER_HINTS = (
   "sr. no.","description","details","total"
 )
 
+FRONTPAGE_MATCHER = KeywordMatcher(FRONTPAGE_TERMS)
+HEADER_HINT_MATCHER = KeywordMatcher(HEADER_HINTS)
+FS_LEXICON_MATCHER = KeywordMatcher(("balance","profit","loss","cash","equity","assets","liabilities","statement"))
+
 # -------------------------
 # Helpers (pure / deterministic)
 # -------------------------
@@ -62,26 +89,12 @@ def tokenized(s: str) -> List[str]:
 
 def tabularity_score(rows: List[List[str]]) -> float:
     """Measures column consistency (numeric vs non-numeric) + minimal width requirement."""
-    if not rows: return 0.0
-    cols = max((len(r) for r in rows), default=0)
-    if cols <= 1: return 0.0
-    col_scores = []
-    for j in range(cols):
-        vals = [norm_text(r[j]) for r in rows if j < len(r)]
-        vals = [v for v in vals if v]
-        if not vals: col_scores.append(0.0); continue
-        num = sum(is_numeric_cell(v) for v in vals)
-        frac = max(num/len(vals), 1 - num/len(vals))  # purity of a column
-        col_scores.append(frac)
-    purity = sum(col_scores)/len(col_scores)
-    strong = sum(1 for f in col_scores if f > 0.7)
-    width  = 1.0 if (cols >= 2 and strong >= 1) else 0.0
-    return round(0.7*purity + 0.3*width, 3)
+    return _tabularity.tabularity(rows, "svr")
 
 def is_frontpage_semantic_blob(table: Dict[str,Any]) -> bool:
     text = " ".join(" ".join(r) for r in (table.get("data",[]) or []))
     text = norm_text(text)
-    return any(term in text for term in FRONTPAGE_TERMS)
+    return FRONTPAGE_MATCHER.any(text)
 
 def header_has_period_tokens(headers: List[str]) -> bool:
     H = " ".join(norm_text(h) for h in headers or [])
@@ -93,7 +106,7 @@ def header_salience_score(headers: List[str]) -> float:
     heads = [norm_text(h) for h in headers]
     hits  = 0
     for h in heads:
-        if any(k in h for k in HEADER_HINTS) or header_has_period_tokens([h]):
+        if HEADER_HINT_MATCHER.any(h) or header_has_period_tokens([h]):
             hits += 1
     return hits / max(1, len(heads))
 
@@ -103,7 +116,7 @@ def numeric_density(rows: List[List[str]]) -> float:
     nums  = sum(is_numeric_cell(c) for r in rows for c in r)
     return nums / cells
 
-def tier_semantics(table: Dict[str,Any]) -> int:
+def tier_semantics(table: Dict[str,Any], tscore: Optional[float] = None) -> int:
     """Tier 0..3 heuristic:
        3: Multi-period (headers with years/months) or classic FS keywords and decent numeric density
        2: Good structure (tabularity ≥ 0.5) OR front-page semantic block
@@ -112,11 +125,11 @@ def tier_semantics(table: Dict[str,Any]) -> int:
     """
     headers = table.get("headers", []) or []
     data    = table.get("data", []) or []
-    tscore  = tabularity_score(data)
+    tscore  = tabularity_score(data) if tscore is None else tscore
     if header_has_period_tokens(headers) and numeric_density(data) >= 0.25:
         return 3
     blob = " ".join(tokenized(" ".join(headers)))
-    if any(k in blob for k in ("balance","profit","loss","cash","equity","assets","liabilities","statement")) and numeric_density(data) >= 0.25:
+    if FS_LEXICON_MATCHER.any(blob) and numeric_density(data) >= 0.25:
         return 3
     if tscore >= 0.5 or is_frontpage_semantic_blob(table):
         return 2
@@ -124,6 +137,71 @@ def tier_semantics(table: Dict[str,Any]) -> int:
         return 1
     return 0
 
+# -------------------------
+# Fused per-table features
+# -------------------------
+
+_WS_RE = re.compile(r"\s+")
+# header_has_period_tokens() on one header as a single scan
+_PERIOD_RE = re.compile("|".join(MONTH_TOKENS) + "|" + YEAR_RE.pattern)
+
+@dataclass(frozen=True, slots=True)
+class TableFeatures:
+    """Everything the accords read from one processed table."""
+    tabularity: float
+    numeric_density: float
+    header_salience: float
+    period_headers: bool   # header_has_period_tokens(headers)
+    fs_headers: bool       # FS lexicon in the tokenized headers
+    frontpage: bool        # is_frontpage_semantic_blob(table)
+    anchors: int           # anchor kinds (0..3) in data + headers
+
+    @property
+    def tier(self) -> int:
+        """tier_semantics() from the record."""
+        if (self.period_headers or self.fs_headers) and self.numeric_density >= 0.25:
+            return 3
+        if self.tabularity >= 0.5 or self.frontpage:
+            return 2
+        if self.tabularity >= 0.25:
+            return 1
+        return 0
+
+    @property
+    def anchor_density(self) -> float:
+        return self.anchors / 3.0  # normalize to [0,1]
+
+def table_features(tables: List[Dict[str,Any]]) -> List[TableFeatures]:
+    """
+    TableFeatures of every table. Cells are classified (non-empty / numeric) once for
+    all tables by the tabularity kernel, which yields both tabularity and numeric
+    density; each table's data is joined into text once, for the front-page terms
+    (normalized) and the anchors (lowercased, headers appended as-is).
+    """
+    datas = [t.get("data", []) or [] for t in tables]
+    out: List[TableFeatures] = []
+    for t, rows, (tscore, n_num) in zip(tables, datas, _tabularity.tabularity_numeric_batch(datas, "svr")):
+        headers = t.get("headers", []) or []
+        heads = [norm_text(h) for h in headers]
+        hits = period = 0
+        for h in heads:
+            p = _PERIOD_RE.search(h) is not None
+            period |= p
+            hits += p or HEADER_HINT_MATCHER.any(h)
+        head_text = " ".join(headers)
+        low = " ".join(" ".join(r) for r in rows).lower()
+        n_cells = sum(map(len, rows))
+        out.append(TableFeatures(
+            tabularity=tscore,
+            numeric_density=n_num / n_cells if n_cells else 0.0,
+            header_salience=hits / len(heads) if heads else 0.0,
+            period_headers=bool(period),
+            fs_headers=FS_LEXICON_MATCHER.any(" ".join(tokenized(head_text))),
+            frontpage=FRONTPAGE_MATCHER.any(_WS_RE.sub(" ", low.strip())),
+            anchors=_anchors.anchor_count(low + " " + head_text),
+        ))
+    return out
+
 # -------------------------
 # SVR computation
 # -------------------------
@@ -133,29 +211,23 @@ def compute_svr(doc: Dict[str,Any], source: str) -> Dict[str,Any]:
     skipped   = doc.get("skipped",   []) or []
     tallies   = {"processed": len(processed), "skipped": len(skipped)}
 
+    feats = table_features(processed)
+
     # Accord I: Structural Integrity
     per_si = [{"page": t.get("page_number"), "idx": t.get("table_index"),
-               "tabularity": tabularity_score(t.get("data", []))} for t in processed]
+               "tabularity": f.tabularity} for t, f in zip(processed, feats)]
     si_avg = round(mean([x["tabularity"] for x in per_si]) if per_si else 0.0, 4)
 
     # Accord II: Semantic Clarity (tiered)
-    tiers = [tier_semantics(t) for t in processed]
+    tiers = [f.tier for f in feats]
     t0 = tiers.count(0); t1 = tiers.count(1); t2 = tiers.count(2); t3 = tiers.count(3)
     sc_score = round(((0*t0 + 1*t1 + 2*t2 + 3*t3) / max(1, 3*len(processed))), 4)
 
     # Accord III: AIQ — include anchor density for front-page style contact slabs
-    def anchor_density(tbl: Dict[str,Any]) -> float:
-        txt = " ".join(" ".join(r) for r in (tbl.get("data",[]) or [])).lower() + " " + " ".join(tbl.get("headers",[]) or [])
-        anchors = 0
-        anchors += 1 if EMAIL_RE.search(txt) else 0
-        anchors += 1 if URL_RE.search(txt)   else 0
-        anchors += 1 if PHONE_RE.search(txt) else 0
-        return anchors/3.0  # normalize to [0,1]
-
-    nd = [numeric_density(t.get("data",[])) for t in processed] or [0.0]
-    hs = [header_salience_score(t.get("headers",[])) for t in processed] or [0.0]
-    fp = [1.0 if is_frontpage_semantic_blob(t) else 0.0 for t in processed] or [0.0]
-    ad = [anchor_density(t) for t in processed] or [0.0]
+    nd = [f.numeric_density for f in feats] or [0.0]
+    hs = [f.header_salience for f in feats] or [0.0]
+    fp = [1.0 if f.frontpage else 0.0 for f in feats] or [0.0]
+    ad = [f.anchor_density for f in feats] or [0.0]
 
     nd_avg = round(mean(nd),4); hs_avg = round(mean(hs),4); fp_avg = round(mean(fp),4); ad_avg = round(mean(ad),4)
     aiq_v1 = round(mean([nd_avg, hs_avg, fp_avg]), 4)
@@ -1,16 +1,34 @@
 import typer
-from phoenix.phoenix.spotter.spotter_heuristic import spot_pdf
-from phoenix.surgeon.preproc_v6_2 import preprocess_company_legacy
-from phoenix.metrics.eval import evaluate_batch
-from phoenix.utils.io import load_json, dump_json
+
+# stage imports live inside the commands, so one stage's dependencies do not gate the others
 
 app = typer.Typer()
 
+@app.command()
+def ingest(pdf: str, out: str, jobs: int = 1, chunk_pages: int = 8, engine: str = "pdfplumber"):
+    """Page-parallel PDF extraction (pdfplumber) to legacy JSON; tables only on Spotter-flagged pages."""
+    import json
+    from phoenix.ingest.pdf_ingest import ingest_pdf
+    meta = ingest_pdf(pdf, out, jobs=jobs, chunk_pages=chunk_pages, engine=engine)
+    print(json.dumps(dict(meta, input=pdf, output=out), ensure_ascii=False))
+
 @app.command()
 def spot(input: str, out: str):
     """Heuristic spotter over legacy JSON; saves .spot.json for audit."""
     ...
 
+@app.command()
+def spotcut(pdf: str, out: str, region_cache: str = "", cache_dir: str = "", gate: float = 0.35):
+    """Spotter -> Surgeon v6.2 in one process on a PDF; page regions cached by content in --region-cache."""
+    import json
+    from phoenix.ingest.spotcut import run_on_pdf
+    from phoenix.surgeon.preproc_v6_2 import PreprocessorConfig
+    res = run_on_pdf(pdf, PreprocessorConfig(cache_dir=cache_dir or None), region_cache or None, gate=gate)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(res, f, ensure_ascii=False, indent=2)
+    print(json.dumps({"ok": True, "processed": res["processed_count"], "skipped": res["skipped_count"],
+                      "out": out, "spot": {k: v for k, v in res["spot"].items() if k != "errors"}}))
+
 @app.command()
 def cut(input: str, out: str, patterns: str = "data/patterns/patterns.jsonl"):
     """Run Surgeon v6.2 on legacy JSON; write normalized .json.gz and review queue."""
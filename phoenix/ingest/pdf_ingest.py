@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Phoenix ingest: PDF -> legacy dossier JSON ({key: {filename, tables[page_number, table_data]}}),
+the input run_on_legacy / iter_legacy_tables consume.
+
+- Pages are handled in chunks of `chunk_pages` on a process pool; each worker opens the
+  PDF itself, so nothing but page numbers and small table payloads crosses processes.
+- Every page gets the cheap pass only: words + ruling lines. The Spotter flags a page
+  when its rules cross (lattice) or a word region passes the tabularity gate; only
+  flagged pages run pdfplumber's table extraction (default "lines" settings = strategy
+  "primary", the text-alignment settings when that finds nothing on a text-flagged page
+  = "pdfplumber_fallback"). engine="lattice" builds ruled tables from the Spotter's
+  lattice grids instead of a second pdfplumber pass.
+- Front-page contact slabs are single-column and never pass the gate, so a page whose
+  text carries >= 2 anchor kinds (email / URL / phone), or role terms with >= 3
+  "Label:" markers, is flagged too; when nothing else yields a table there, its
+  anchored / labelled lines become one table (strategy "spotter_contact") for the
+  Surgeon's FRONT_PAGE salvage.
+- Results are written in page order as they arrive, with at most 2*jobs chunks in
+  flight and each page's cached layout objects released, so memory stays flat on
+  900-page filings. The file is written to <out>.tmp and renamed when complete.
+
+Usage:
+  python -m phoenix.ingest.pdf_ingest filing.pdf --out data/filing.json --jobs 4
+  python phoenix/ingest/pdf_ingest.py --indir pdfs/ --outdir data/ --jobs 4
+  python scripts/make_test_pdfs.py --outdir out/perf/pdfs    # local PDFs to try it on
+"""
+from __future__ import annotations
+
+import argparse, importlib, importlib.util, json, os, sys, time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+def _shared_module(name: str):
+    """Import phoenix.<name>, or load it from its file when run as a plain script (root not on sys.path)."""
+    try:
+        return importlib.import_module(f"phoenix.{name}")
+    except ImportError:
+        qual = f"phoenix.{name}"
+        if qual in sys.modules:
+            return sys.modules[qual]
+        path = Path(__file__).resolve().parents[1].joinpath(*name.split(".")).with_suffix(".py")
+        spec = importlib.util.spec_from_file_location(qual, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[qual] = mod
+        spec.loader.exec_module(mod)
+        return mod
+
+_spotter = _shared_module("spotter.spotter_heuristic")
+_lattice = _shared_module("spotter.lattice")
+_anchors = _shared_module("utils.anchors")
+
+FALLBACK_SETTINGS = {"vertical_strategy": "text", "horizontal_strategy": "text"}
+CONTACT_ROLE_MATCHER = _shared_module("utils.text").KeywordMatcher((
+    "registrar", "lead manager", "merchant banker", "brlm", "contact person", "compliance officer",
+    "company secretary", "telephone", "phone", "fax", "website", "email", "e-mail",
+    "issue opens", "issue closes", "anchor investor"))
+
+def page_words(page: Any) -> List[Dict[str, Any]]:
+    """pdfplumber words as Spotter word dicts (x, y, w, h, text)."""
+    return [{"x": w["x0"], "y": w["top"], "w": w["x1"] - w["x0"], "h": w["bottom"] - w["top"], "text": w["text"]}
+            for w in page.extract_words()]
+
+def _legacy_table(page_number: int, grid: Sequence[Sequence[Optional[str]]]) -> Optional[Dict[str, Any]]:
+    rows = [{f"col_{j}": ("" if c is None else c) for j, c in enumerate(r)} for r in grid]
+    if not rows:
+        return None
+    return {"page_number": page_number, "table_data": rows, "rows": len(rows), "cols": max(len(r) for r in grid)}
+
+def _contact_text(text: str) -> bool:
+    if _anchors.anchor_count(text.lower()) >= 2:
+        return True
+    return CONTACT_ROLE_MATCHER.any(text.lower()) and _anchors.count(_anchors.KV_RE, text, cap=3) >= 3
+
+def contact_rows(words: Any, texts: Sequence[str], regions: Any, order: Any) -> List[List[str]]:
+    """Rows of a contact page's anchored / labelled regions, padded to one width; [] if not a contact page."""
+    if not len(regions) or not _contact_text(" ".join(texts)):
+        return []
+    rows: List[List[str]] = []
+    for reg in regions:
+        reg_rows = _spotter.region_rows(words, order, reg, texts)
+        blob = " ".join(" ".join(r) for r in reg_rows)
+        if _anchors.anchor_count(blob.lower()) or _anchors.count(_anchors.KV_RE, blob, cap=1):
+            rows += reg_rows
+    width = max(map(len, rows), default=0)
+    return [r + [""] * (width - len(r)) for r in rows]
+
+def spot_page(page_number: int, words: List[Dict[str, Any]], lines: Sequence[Dict[str, Any]],
+              rects: Sequence[Dict[str, Any]], gate: float = 0.35) -> Dict[str, Any]:
+    """
+    Spotter verdict for one page: lattice tables (ruled), text candidates (regions passing
+    the gate) and contact-slab rows (contact).
+    """
+    arr, texts = _spotter.words_array([(page_number, words)])
+    ruled = _lattice.lattice_tables(page_number, lines, rects, arr, texts) if (lines or rects) else []
+    text, contact = [], []
+    if len(arr):
+        regions, order = _spotter.propose_regions_batch(arr)
+        text = _spotter.table_candidates(arr, texts, regions, order, gate=gate)
+        contact = contact_rows(arr, texts, regions, order)
+    return {"ruled": ruled, "text": text, "contact": contact}
+
+def _ingest_pages(pdf_path: str, page_numbers: List[int], engine: str, gate: float) -> List[Dict[str, Any]]:
+    import pdfplumber
+    out = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for pn in page_numbers:
+            page = pdf.pages[pn - 1]
+            rec: Dict[str, Any] = {"page_number": pn, "tables": [], "strategy": None, "error": None}
+            try:
+                spot = spot_page(pn, page_words(page), page.lines, page.rects, gate)
+                rec["flagged"] = bool(spot["ruled"] or spot["text"] or spot["contact"])
+                if engine == "lattice" and spot["ruled"]:
+                    rec["tables"] = [{k: t[k] for k in ("page_number", "table_data", "rows", "cols")} for t in spot["ruled"]]
+                    rec["strategy"] = "primary"
+                elif spot["ruled"] or spot["text"]:
+                    grids = page.extract_tables()
+                    rec["strategy"] = "primary"
+                    if not grids and spot["text"]:
+                        grids = page.extract_tables(FALLBACK_SETTINGS)
+                        rec["strategy"] = "pdfplumber_fallback"
+                    rec["tables"] = [t for t in (_legacy_table(pn, g) for g in grids) if t]
+                if spot["contact"] and not rec["tables"]:
+                    rec["tables"] = [_legacy_table(pn, spot["contact"])]
+                    rec["strategy"] = "spotter_contact"
+            except Exception as e:
+                rec["error"] = f"page {pn}: {type(e).__name__}: {e}"
+            finally:
+                page.close()  # drop the page's cached chars / objects
+            out.append(rec)
+    return out
+
+def _page_chunks(n_pages: int, size: int) -> Iterator[List[int]]:
+    for lo in range(1, n_pages + 1, size):
+        yield list(range(lo, min(n_pages, lo + size - 1) + 1))
+
+def iter_pages(pdf_path: str, n_pages: int, jobs: int = 1, chunk_pages: int = 8, engine: str = "pdfplumber",
+               gate: float = 0.35) -> Iterator[Dict[str, Any]]:
+    """Per-page results in page order; at most 2*jobs chunks are in flight."""
+    chunks = _page_chunks(n_pages, max(1, int(chunk_pages)))
+    if jobs <= 1:
+        for pages in chunks:
+            yield from _ingest_pages(pdf_path, pages, engine, gate)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        pending: deque = deque()
+        for pages in chunks:
+            pending.append(ex.submit(_ingest_pages, pdf_path, pages, engine, gate))
+            if len(pending) >= 2 * jobs:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def ingest_pdf(pdf_path: str, out_path: str, jobs: int = 1, chunk_pages: int = 8, engine: str = "pdfplumber",
+               gate: float = 0.35) -> Dict[str, Any]:
+    """Write the legacy JSON for one PDF; returns its meta (everything but the tables)."""
+    import pdfplumber
+    t0 = time.perf_counter()
+    src = Path(pdf_path)
+    with pdfplumber.open(str(src)) as pdf:
+        n_pages = len(pdf.pages)
+    key = src.name
+    out = Path(out_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp")
+    n_tables = n_rows = flagged = 0
+    strategies = set()
+    errors: List[str] = []
+    with tmp.open("w", encoding="utf-8") as f:
+        # filename precedes tables, as iter_legacy_tables expects
+        f.write("{" + json.dumps(key, ensure_ascii=False) + ": {\"filename\": " + json.dumps(key, ensure_ascii=False)
+                + ", \"tables\": [")
+        for rec in iter_pages(str(src), n_pages, jobs, chunk_pages, engine, gate):
+            flagged += bool(rec.get("flagged"))
+            if rec["error"]:
+                errors.append(rec["error"])
+            if rec["strategy"] and rec["tables"]:
+                strategies.add(rec["strategy"])
+            for t in rec["tables"]:
+                f.write((",\n" if n_tables else "\n") + json.dumps(t, ensure_ascii=False))
+                n_tables += 1
+                n_rows += t["rows"]
+        meta = {
+            "filename": key,
+            "file_size_mb": round(src.stat().st_size / (1024 * 1024), 2),
+            "duration": round(time.perf_counter() - t0, 2),
+            "total_pages": n_pages,
+            "strategy_used": "pdfplumber_fallback" if "pdfplumber_fallback" in strategies else "primary",
+            "table_count": n_tables,
+            "total_rows": n_rows,
+            "avg_tables_per_page": round(n_tables / n_pages, 3) if n_pages else 0.0,
+            "error": "; ".join(errors[:20]) or None,
+        }
+        f.write("\n]")
+        for k, v in meta.items():
+            if k != "filename":
+                f.write(", " + json.dumps(k) + ": " + json.dumps(v, ensure_ascii=False))
+        f.write("}}\n")
+    os.replace(tmp, out)
+    meta["flagged_pages"] = flagged
+    return meta
+
+def main():
+    ap = argparse.ArgumentParser(description="Phoenix ingest: PDF -> legacy dossier JSON (page-parallel pdfplumber)")
+    ap.add_argument("pdfs", nargs="*", help="PDF files")
+    ap.add_argument("--indir", help="Every *.pdf in this directory")
+    ap.add_argument("--out", help="Output JSON (single PDF)")
+    ap.add_argument("--outdir", help="Output directory: <stem>.json per PDF (default: next to each PDF)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes (pages in parallel)")
+    ap.add_argument("--chunk-pages", type=int, default=8, help="Pages per worker task")
+    ap.add_argument("--engine", choices=("pdfplumber", "lattice"), default="pdfplumber",
+                    help="Ruled pages: pdfplumber extract_tables, or the Spotter's lattice grids")
+    ap.add_argument("--gate", type=float, default=0.35, help="Tabularity gate for text-only table candidates")
+    args = ap.parse_args()
+    pdfs = list(args.pdfs)
+    if args.indir:
+        pdfs += sorted(str(p) for p in Path(args.indir).glob("*.pdf"))
+    if not pdfs:
+        ap.error("no PDFs given")
+    if args.out and len(pdfs) != 1:
+        ap.error("--out takes a single PDF; use --outdir")
+    for p in pdfs:
+        out = args.out or str(Path(args.outdir or Path(p).parent) / (Path(p).stem + ".json"))
+        meta = ingest_pdf(p, out, jobs=args.jobs, chunk_pages=args.chunk_pages, engine=args.engine, gate=args.gate)
+        print(json.dumps(dict(meta, input=p, output=out), ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
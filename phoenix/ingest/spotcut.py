@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Phoenix spot -> cut in one process: Spotter regions go straight to Surgeon.preprocess_table.
+
+- Per page, the Spotter's candidate tables are the lattice grids (ruled) plus every
+  word region passing the tabularity gate that does not sit inside a grid; a region
+  candidate is its bbox and the words inside it, split into rows / cells
+  (spotter_heuristic.region_rows), in the legacy table schema. A page with neither but
+  with a contact slab (pdf_ingest.contact_rows) yields that slab as one candidate.
+- Nothing is written between the stages: candidates are built page by page and fed
+  to one Surgeon as they come (same per-dossier dedup / near-dup state as run_on_legacy).
+- Region results are cached by page content, so re-running after a Surgeon / pattern
+  change skips region proposal and grid building for every unchanged page. For a PDF
+  the key is the raw page (content-stream bytes, fonts, page box, rotation) plus the
+  gate and the Spotter code digest, taken before pdfplumber parses the page, so a hit
+  skips word / rule extraction too; page inputs given as words are keyed on word boxes
+  + texts and rules. Any object with get(key) / put(key, value) works as the cache;
+  --region-cache uses surgeon.cache.DiskLRUCache.
+
+Usage:
+  python -m phoenix.ingest.spotcut filing.pdf --out out/filing.preproc_v6_2.json --region-cache out/cache/regions
+"""
+from __future__ import annotations
+
+import argparse, importlib, importlib.util, json, os, sys, time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+def _shared_module(name: str):
+    """Import phoenix.<name>, or load it from its file when run as a plain script (root not on sys.path)."""
+    try:
+        return importlib.import_module(f"phoenix.{name}")
+    except ImportError:
+        qual = f"phoenix.{name}"
+        if qual in sys.modules:
+            return sys.modules[qual]
+        path = Path(__file__).resolve().parents[1].joinpath(*name.split(".")).with_suffix(".py")
+        spec = importlib.util.spec_from_file_location(qual, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[qual] = mod
+        spec.loader.exec_module(mod)
+        return mod
+
+_spotter = _shared_module("spotter.spotter_heuristic")
+_lattice = _shared_module("spotter.lattice")
+_cache = _shared_module("surgeon.cache")
+_ingest = _shared_module("ingest.pdf_ingest")
+
+# a page's cached candidates are only valid for the code that built them
+_SPOT_VERSION = _cache.digest_bytes(
+    _cache.file_digest(Path(m.__file__)).encode() for m in (_spotter, _lattice, sys.modules[__name__]))
+
+PageInput = Tuple[int, Sequence[Dict[str, Any]], Sequence[Dict[str, Any]], Sequence[Dict[str, Any]]]
+# (page_number, thunk -> (candidate tables, cache hit)); the thunk is called before the next page is read
+PageJob = Tuple[int, Callable[[], Tuple[List[Dict[str, Any]], bool]]]
+
+def _rule_bytes(objs: Sequence[Dict[str, Any]]) -> bytes:
+    if not objs:
+        return b""
+    a = np.array([(o["x0"], o["x1"], o["top"], o["bottom"]) for o in objs], dtype="f8")
+    return np.round(a, 2).tobytes()
+
+def page_key(words: np.ndarray, texts: Sequence[str], lines: Sequence[Dict[str, Any]],
+             rects: Sequence[Dict[str, Any]], gate: float) -> str:
+    """Content key of one page's Spotter input; the page number is not part of it."""
+    boxes = np.round(np.stack([words["x"], words["y"], words["w"], words["h"]], axis=1), 2) if len(words) else np.zeros(0)
+    return _cache.digest_bytes([
+        _SPOT_VERSION.encode(), repr(float(gate)).encode(), b"\x1e",
+        boxes.tobytes(), b"\x1e", "\x1f".join(texts).encode("utf-8"), b"\x1e",
+        _rule_bytes(lines), b"\x1e", _rule_bytes(rects),
+    ])
+
+def raw_page_key(page: Any, gate: float) -> str:
+    """Content key of one pdfplumber page, read from the PDF objects without parsing the layout."""
+    from pdfminer.pdftypes import resolve1
+    obj = page.page_obj
+    res = resolve1(obj.resources) or {}
+    fonts = resolve1(res.get("Font")) or {}
+    font_names = sorted(f"{k}={resolve1(resolve1(v).get('BaseFont'))}" for k, v in fonts.items())
+    # form XObjects draw text / rules of their own; images do not reach the Spotter
+    forms = [x for x in map(resolve1, (resolve1(res.get("XObject")) or {}).values())
+             if getattr(x, "get", None) and str(x.get("Subtype")).endswith("Form")]
+    return _cache.digest_bytes([
+        _SPOT_VERSION.encode(), repr(float(gate)).encode(), b"\x1e",
+        repr((tuple(map(float, page.mediabox)), page.rotation)).encode(), b"\x1e",
+        "\x1f".join(font_names).encode("utf-8"), b"\x1e",
+        *(resolve1(c).get_data() for c in (obj.contents or [])), b"\x1e",
+        *(x.get_data() for x in forms),
+    ])
+
+def _cached(cache: Optional[Any], key: Optional[str], page_number: int,
+            build: Callable[[], List[Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], bool]:
+    if key is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            return [dict(t, page_number=page_number) for t in hit], True
+    tables = build()
+    if key is not None:
+        cache.put(key, [{k: v for k, v in t.items() if k != "page_number"} for t in tables])
+    return tables, False
+
+def _inside(bbox: Sequence[float], grids: List[Sequence[float]]) -> bool:
+    cx, cy = (bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2
+    return any(g[0] <= cx <= g[2] and g[1] <= cy <= g[3] for g in grids)
+
+def _region_table(page_number: int, reg: np.void, rows: List[List[str]], score: float) -> Dict[str, Any]:
+    n_cols = max(len(r) for r in rows)
+    return {
+        "page_number": page_number,
+        "table_data": [{f"col_{j}": (r[j] if j < len(r) else "") for j in range(n_cols)} for r in rows],
+        "rows": len(rows),
+        "cols": n_cols,
+        "bbox": [float(reg["x1"]), float(reg["y1"]), float(reg["x2"]), float(reg["y2"])],
+        "spot_score": round(float(score), 4),
+        "source_extractor": "spotter",
+    }
+
+def spot_tables(page_number: int, words: np.ndarray, texts: Sequence[str], lines: Sequence[Dict[str, Any]],
+                rects: Sequence[Dict[str, Any]], gate: float = 0.35) -> List[Dict[str, Any]]:
+    """Candidate tables of one page (words_array of that page), top to bottom."""
+    tables = _lattice.lattice_tables(page_number, lines, rects, words, texts) if (lines or rects) else []
+    grids = [t["bbox"] for t in tables]
+    if len(words):
+        regions, order = _spotter.propose_regions_batch(words)
+        for k, rows, score in _spotter.table_candidates(words, texts, regions, order, gate=gate):
+            t = _region_table(page_number, regions[k], rows, score)
+            if not _inside(t["bbox"], grids):
+                tables.append(t)
+        contact = [] if tables else _ingest.contact_rows(words, texts, regions, order)
+        if contact:
+            box = np.zeros(1, dtype=_spotter.REGION_DTYPE)[0]
+            box["x1"], box["y1"] = words["x"].min(), words["y"].min()
+            box["x2"], box["y2"] = (words["x"] + words["w"]).max(), (words["y"] + words["h"]).max()
+            tables.append(dict(_region_table(page_number, box, contact, 0.0), source_extractor="spotter_contact"))
+    tables.sort(key=lambda t: (t["bbox"][1], t["bbox"][0]))
+    return tables
+
+def page_tables(page_number: int, words: Sequence[Dict[str, Any]], lines: Sequence[Dict[str, Any]] = (),
+                rects: Sequence[Dict[str, Any]] = (), gate: float = 0.35, cache: Optional[Any] = None
+                ) -> Tuple[List[Dict[str, Any]], bool]:
+    """(candidate tables, cache hit) for one page of Spotter word dicts and pdfplumber lines / rects."""
+    arr, texts = _spotter.words_array([(page_number, words)])
+    key = page_key(arr, texts, lines, rects, gate) if cache is not None else None
+    return _cached(cache, key, page_number, lambda: spot_tables(page_number, arr, texts, lines, rects, gate))
+
+def pdf_page_jobs(pdf_path: str, cache: Optional[Any] = None, gate: float = 0.35) -> Iterator[PageJob]:
+    """One job per page; words and rules are only extracted on a cache miss, and each page is closed after its job."""
+    import pdfplumber
+
+    def job(pn: int, page: Any) -> Tuple[List[Dict[str, Any]], bool]:
+        def build() -> List[Dict[str, Any]]:
+            arr, texts = _spotter.words_array([(pn, _ingest.page_words(page))])
+            return spot_tables(pn, arr, texts, page.lines, page.rects, gate)
+        return _cached(cache, raw_page_key(page, gate) if cache is not None else None, pn, build)
+
+    with pdfplumber.open(pdf_path) as pdf:
+        for pn, page in enumerate(pdf.pages, start=1):
+            try:
+                yield pn, lambda pn=pn, page=page: job(pn, page)
+            finally:
+                page.close()
+
+def spot_and_cut(pages: Iterable[PageInput], dossier_name: str, surgeon: Optional[Any] = None,
+                 cache: Optional[Any] = None, gate: float = 0.35) -> Dict[str, Any]:
+    """run_on_legacy's result for the Spotter's candidates of `pages`, plus a "spot" block."""
+    jobs = ((pn, lambda pn=pn, w=words, l=lines, r=rects: page_tables(pn, w, l, r, gate, cache))
+            for pn, words, lines, rects in pages)
+    return cut_jobs(jobs, dossier_name, surgeon)
+
+def cut_jobs(jobs: Iterable[PageJob], dossier_name: str, surgeon: Optional[Any] = None) -> Dict[str, Any]:
+    """spot_and_cut over page jobs (see pdf_page_jobs)."""
+    preproc = _shared_module("surgeon.preproc_v6_2")
+    surgeon = surgeon or preproc.Surgeon(preproc.PreprocessorConfig())
+    spot = {"pages": 0, "cache_hits": 0, "ruled": 0, "text": 0, "errors": []}
+
+    def candidates() -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for pn, run in jobs:
+            spot["pages"] += 1
+            try:
+                tables, hit = run()
+            except Exception as e:
+                spot["errors"].append(f"page {pn}: {type(e).__name__}: {e}")
+                continue
+            spot["cache_hits"] += hit
+            for t in tables:
+                spot["ruled" if t.get("source_extractor") == "lattice" else "text"] += 1
+                yield dossier_name, t
+
+    processed, skipped = [], []
+    t0 = time.perf_counter()
+    for proc, skip in preproc._surgeon_results(candidates(), surgeon):
+        if proc:
+            processed.append(proc)
+        elif skip:
+            skipped.append(skip)
+    spot["duration"] = round(time.perf_counter() - t0, 2)
+    spot["errors"] = spot["errors"][:20]
+    result = {
+        "source": dossier_name,
+        "filename": dossier_name,
+        "processed_count": len(processed),
+        "skipped_count": len(skipped),
+        "processed": processed,
+        "skipped": skipped,
+        "spot": spot,
+    }
+    if surgeon.cache is not None:
+        result["cache"] = dict(surgeon.cache.stats)
+    if isinstance(surgeon.timer, preproc.StageTimer):
+        result["timings"] = surgeon.timer.as_dict()
+    return result
+
+def run_on_pdf(pdf_path: str, cfg: Optional[Any] = None, region_cache: Optional[str] = None,
+               region_cache_mb: int = 64, gate: float = 0.35) -> Dict[str, Any]:
+    preproc = _shared_module("surgeon.preproc_v6_2")
+    cache = _cache.DiskLRUCache(region_cache, max_bytes=int(region_cache_mb) * 1024 * 1024) if region_cache else None
+    res = cut_jobs(pdf_page_jobs(pdf_path, cache, gate), Path(pdf_path).name,
+                   preproc.Surgeon(cfg or preproc.PreprocessorConfig()))
+    if cache is not None:
+        res["spot"]["region_cache"] = dict(cache.stats)
+    return res
+
+def main():
+    ap = argparse.ArgumentParser(description="Phoenix spot -> cut: Spotter candidates straight into Surgeon v6.2")
+    ap.add_argument("pdf", help="PDF file")
+    ap.add_argument("--out", help="Output JSON (default: <pdf stem>.preproc_v6_2.json next to the PDF)")
+    ap.add_argument("--region-cache", help="Cache Spotter candidates per page content here")
+    ap.add_argument("--region-cache-mb", type=int, default=64, help="Size bound for --region-cache")
+    ap.add_argument("--cache-dir", help="Surgeon per-table result cache (see preproc_v6_2 --cache-dir)")
+    ap.add_argument("--patterns", default="out/patterns/patterns.jsonl",
+                    help="Memory-layer patterns: JSONL, or a SQLite store (.db/.sqlite)")
+    ap.add_argument("--gate", type=float, default=0.35, help="Tabularity gate for text-only table candidates")
+    args = ap.parse_args()
+    preproc = _shared_module("surgeon.preproc_v6_2")
+    cfg = preproc.PreprocessorConfig(cache_dir=args.cache_dir, patterns_path=args.patterns)
+    res = run_on_pdf(args.pdf, cfg, args.region_cache,
+                     args.region_cache_mb, args.gate)
+    out = args.out or (os.path.splitext(args.pdf)[0] + ".preproc_v6_2.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(res, f, ensure_ascii=False, indent=2)
+    print(json.dumps({"ok": True, "processed": res["processed_count"], "skipped": res["skipped_count"],
+                      "out": out, "spot": {k: v for k, v in res["spot"].items() if k != "errors"}}))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sharded learning-event log (memory_layer, events_layout: sharded).
+
+Layout under the log directory (events_path without ".jsonl"):
+  <worker>.<seq>.jsonl      active segment of one worker (host-pid); only that process appends
+  <worker>.<seq>.jsonl.gz   sealed segment
+  <worker>.idx.jsonl        sidecar index, one line per appended batch:
+                            {"seq", "off", "len", "n", "t0", "t1", "d": dossiers, "s": stages, "f": families}
+Each batch is one os.write() on an O_APPEND descriptor and is indexed only after it
+landed, so a crashed worker leaves at most a torn last line (skipped on read) and an
+index that never points past the data. A segment is sealed (gzipped via a temp file +
+os.replace) once it reaches rotate_bytes or has been open rotate_s seconds; index
+offsets are into the uncompressed stream, so they stay valid. A writer whose
+active segment was sealed by someone else (seal_idle) moves on to the next seq,
+and sealing never replaces an existing .gz.
+
+EventLog(dir).read(dossier=..., stage=..., family=...) merges the shards lazily by
+"ts". Filtered reads consult the index and only decode the batches that can match;
+events whose batch never reached the index (crash between the two writes) are seen
+by unfiltered reads only.
+"""
+from __future__ import annotations
+
+import gzip, heapq, io, json, os, re, shutil, socket, time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+_SEG_RE = re.compile(r"^(?P<worker>.+)\.(?P<seq>\d{6})\.jsonl(?P<gz>\.gz)?$")
+
+def log_dir(events_path: Union[str, Path]) -> Path:
+    p = Path(events_path)
+    return p.with_suffix("") if p.suffix == ".jsonl" else p
+
+def event_family(evt: Dict[str, Any]) -> Optional[str]:
+    fams = evt.get("family_candidates") or []
+    return evt.get("family") or (fams[0] if fams else None)
+
+def _write_all(path: Path, data: bytes) -> None:
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+class ShardWriter:
+    """Appender for one worker's shard; not shared between processes (fork -> new writer)."""
+
+    def __init__(self, root: Union[str, Path], worker: Optional[str] = None,
+                 rotate_bytes: int = 64 << 20, rotate_s: Optional[float] = 86400.0):
+        self.root = Path(root)
+        self.worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+        self.rotate_bytes = int(rotate_bytes)
+        self.rotate_s = rotate_s
+        self.root.mkdir(parents=True, exist_ok=True)
+        # a reused pid continues after its previous segments instead of appending to them
+        seqs = [int(m["seq"]) for m in map(_SEG_RE.match, os.listdir(self.root))
+                if m and m["worker"] == self.worker]
+        self.seq = max(seqs, default=-1) + 1
+        self._size = 0
+        self._opened = time.time()
+
+    @property
+    def segment(self) -> Path:
+        return self.root / f"{self.worker}.{self.seq:06d}.jsonl"
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / f"{self.worker}.idx.jsonl"
+
+    def append(self, events: Sequence[Dict[str, Any]], lines: Optional[Sequence[str]] = None) -> None:
+        """Append one batch (lines are the events' serialized JSON lines, if already built)."""
+        if not events:
+            return
+        if lines is None:
+            lines = [json.dumps(e, ensure_ascii=False) + "\n" for e in events]
+        if self._size and not self.segment.exists():
+            self._next_segment()  # sealed under us (EventLog.seal_idle); offsets restart in a fresh one
+        elif self._size and (self._size >= self.rotate_bytes or
+                             (self.rotate_s is not None and time.time() - self._opened >= self.rotate_s)):
+            self.seal()
+        data = "".join(lines).encode("utf-8")
+        _write_all(self.segment, data)
+        ts = [e.get("ts") for e in events if isinstance(e.get("ts"), (int, float))]
+        entry = {
+            "seq": self.seq, "off": self._size, "len": len(data), "n": len(events),
+            "t0": min(ts, default=None), "t1": max(ts, default=None),
+            "d": sorted({str(e.get("dossier")) for e in events}),
+            "s": sorted({str(e.get("stage")) for e in events}),
+            "f": sorted({str(event_family(e)) for e in events}),
+        }
+        _write_all(self.index_path, (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+        self._size += len(data)
+
+    def seal(self) -> None:
+        """gzip the active segment and start the next one."""
+        if self.segment.exists():
+            seal_segment(self.segment)
+        self._next_segment()
+
+    def _next_segment(self) -> None:
+        self.seq += 1
+        self._size = 0
+        self._opened = time.time()
+
+def seal_segment(path: Path) -> Path:
+    """gzip path into path.gz; an existing .gz is kept and the data appended as a further gzip member."""
+    gz = path.with_name(path.name + ".gz")
+    tmp = path.with_name(path.name + ".gz.tmp")
+    with path.open("rb") as src, tmp.open("wb") as raw:
+        if gz.exists():
+            with gz.open("rb") as old:
+                shutil.copyfileobj(old, raw)
+        with gzip.GzipFile(fileobj=raw, mode="wb") as dst:
+            shutil.copyfileobj(src, dst)
+    os.replace(tmp, gz)
+    path.unlink()
+    return gz
+
+def _owner_alive(worker: str) -> Optional[bool]:
+    """Whether the host-pid worker still runs; None when it is not a process of this host."""
+    host, _, pid = worker.rpartition("-")
+    if host != socket.gethostname() or not pid.isdigit():
+        return None
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists, owned by another user
+    return True
+
+# ---- reading ----
+
+def _segment_file(root: Path, worker: str, seq: int) -> Optional[Path]:
+    for name in (f"{worker}.{seq:06d}.jsonl", f"{worker}.{seq:06d}.jsonl.gz"):
+        p = root / name
+        if p.exists():
+            return p
+    return None
+
+def _open_segment(path: Path) -> io.BufferedIOBase:
+    return gzip.open(path, "rb") if path.suffix == ".gz" else path.open("rb")
+
+def _decode(lines: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    for ln in lines:
+        try:
+            yield json.loads(ln)
+        except ValueError:
+            continue  # torn tail of a crashed writer
+
+class EventLog:
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def workers(self) -> List[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted({m["worker"] for m in map(_SEG_RE.match, os.listdir(self.root)) if m})
+
+    def segments(self, worker: str) -> List[Tuple[int, Path]]:
+        out = []
+        for name in os.listdir(self.root):
+            m = _SEG_RE.match(name)
+            if m and m["worker"] == worker:
+                out.append((int(m["seq"]), self.root / name))
+        return sorted(out)
+
+    def index(self, worker: str) -> List[Dict[str, Any]]:
+        p = self.root / f"{worker}.idx.jsonl"
+        if not p.exists():
+            return []
+        with p.open("rb") as f:
+            return list(_decode(f))
+
+    def _worker_events(self, worker: str, dossier: Optional[str], stage: Optional[str],
+                       family: Optional[str]) -> Iterator[Dict[str, Any]]:
+        if dossier is None and stage is None and family is None:
+            for _, path in self.segments(worker):
+                with _open_segment(path) as f:
+                    yield from _decode(f)
+            return
+        want = [(k, str(v)) for k, v in (("d", dossier), ("s", stage), ("f", family)) if v is not None]
+        ranges: Dict[int, List[Tuple[int, int]]] = {}
+        for e in self.index(worker):
+            if all(v in e.get(k, ()) for k, v in want):
+                ranges.setdefault(int(e["seq"]), []).append((int(e["off"]), int(e["len"])))
+        for seq in sorted(ranges):
+            path = _segment_file(self.root, worker, seq)
+            if path is None:
+                continue
+            with _open_segment(path) as f:
+                pos = 0
+                for off, ln in ranges[seq]:
+                    if path.suffix == ".gz":
+                        f.read(off - pos)  # gzip streams decompress forward only
+                    else:
+                        f.seek(off)
+                    chunk = f.read(ln)
+                    pos = off + ln
+                    for evt in _decode(chunk.splitlines()):
+                        if ((dossier is None or str(evt.get("dossier")) == str(dossier)) and
+                                (stage is None or str(evt.get("stage")) == str(stage)) and
+                                (family is None or str(event_family(evt)) == str(family))):
+                            yield evt
+
+    def read(self, dossier: Optional[str] = None, stage: Optional[str] = None,
+             family: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Events of every shard merged by "ts" (each shard is already in append order)."""
+        streams = [self._worker_events(w, dossier, stage, family) for w in self.workers()]
+        return heapq.merge(*streams, key=lambda e: e.get("ts") or 0)
+
+    def seal_idle(self, idle_s: float = 3600.0) -> List[Path]:
+        """
+        Seal plain segments not written for idle_s seconds (workers that exited mid-segment).
+        Segments of a live worker on this host are left to the worker itself.
+        """
+        sealed = []
+        now = time.time()
+        for w in self.workers():
+            if _owner_alive(w):
+                continue
+            for _, path in self.segments(w):
+                if path.suffix == ".jsonl" and now - path.stat().st_mtime >= idle_s:
+                    sealed.append(seal_segment(path))
+        return sealed
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    ap = argparse.ArgumentParser(description="Read a sharded learning-event log as merged JSONL.")
+    ap.add_argument("root", help="log directory (or the events .jsonl path it replaces)")
+    ap.add_argument("--dossier")
+    ap.add_argument("--stage")
+    ap.add_argument("--family")
+    ap.add_argument("--seal-idle-s", type=float, default=None, help="first gzip segments idle this long")
+    args = ap.parse_args(argv)
+    log = EventLog(log_dir(args.root))
+    if args.seal_idle_s is not None:
+        log.seal_idle(args.seal_idle_s)
+    for evt in log.read(args.dossier, args.stage, args.family):
+        print(json.dumps(evt, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,10 @@
 from __future__ import annotations
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, Iterable, List, Tuple
 import math, re, hashlib
+
+import numpy as np
+
+from . import sigcache
 from .schemas import Signature
 
 _num_pat = re.compile(r"^[0-9,.\-\(\)%₹`]+$")
@@ -20,10 +24,31 @@ def _ngrams(tokens: List[str], n: int = 2, limit: int = 16) -> List[str]:
         if len(grams) >= limit: break
     return grams
 
-def compute_signature(table: Dict[str, Any]) -> Signature:
-    headers: List[str] = table.get("headers", []) or []
-    data: List[List[str]] = table.get("data", []) or []
-    cols = max((len(r) for r in data), default=len(headers))
+# ---- MinHash ----
+# MH_PERMS universal hashes h(x) = (a*x + b) mod p over 32-bit token hashes (md5, the
+# same token hash older sketches stored), with p = 2^31-1 so a*x + b stays inside uint64.
+# The coefficients come from a fixed seed: sketches are comparable across runs.
+MH_PERMS = 64
+MH_BANDS, MH_ROWS = 16, 4
+_MH_PRIME = np.uint64((1 << 31) - 1)
+_mh_rng = np.random.default_rng(0x6D68)
+_MH_A = _mh_rng.integers(1, (1 << 31) - 1, size=MH_PERMS, dtype=np.uint64)[:, None]
+_MH_B = _mh_rng.integers(0, (1 << 31) - 1, size=MH_PERMS, dtype=np.uint64)[:, None]
+
+def _token_hash(t: str) -> int:
+    return int(hashlib.md5(t.encode("utf-8")).hexdigest()[:8], 16)
+
+def minhash_hashes(hashes: np.ndarray) -> List[int]:
+    """MinHash signature of a set of 32-bit token hashes; [] for the empty set."""
+    if not len(hashes):
+        return []
+    x = np.unique(np.asarray(hashes, dtype=np.uint64))[None, :]
+    return ((_MH_A * x + _MH_B) % _MH_PRIME).min(axis=1).tolist()
+
+def minhash(tokens: List[str]) -> List[int]:
+    return minhash_hashes(np.fromiter((_token_hash(t) for t in set(tokens)), dtype=np.uint64))
+
+def _data_features(data: List[List[str]], cols: int) -> Tuple[Tuple[float, ...], Tuple[float, ...], float, float, float]:
     rows = len(data)
 
     # column fractions
@@ -39,13 +64,6 @@ def compute_signature(table: Dict[str, Any]) -> Signature:
         num_frac.append(nums/total)
         alpha_frac.append(alps/total)
 
-    # cue counts
-    h_text = " ".join(h.lower() for h in headers)
-    contact_terms = ("email","website","tel","phone","contact","brlm","registrar","anchor investor")
-    period_terms = ("fy","fiscal","year","as on","ended","mar","jun","sep","dec","20","19")
-    cc = sum(h_text.count(t) for t in contact_terms)
-    pc = sum(h_text.count(t) for t in period_terms)
-
     # row-label density (left-most stringy stubs)
     left = [ (r[0] if r else "") for r in data ]
     lbl = sum(1 for v in left if isinstance(v,str) and len(v.strip())>0 and not _num_pat.match(v.strip()))
@@ -58,29 +76,48 @@ def compute_signature(table: Dict[str, Any]) -> Signature:
     # proto-grid score: balance of numeric/textive columns
     strong = sum(1 for f in num_frac if f>0.7) + sum(1 for f in alpha_frac if f>0.7)
     proto_grid = strong / (cols or 1)
+    return tuple(num_frac), tuple(alpha_frac), row_label_density, linebreak_entropy, proto_grid
+
+def _header_features(headers: List[str]) -> Tuple[int, int, Tuple[str, ...], Tuple[int, ...]]:
+    # cue counts
+    h_text = " ".join(h.lower() for h in headers)
+    contact_terms = ("email","website","tel","phone","contact","brlm","registrar","anchor investor")
+    period_terms = ("fy","fiscal","year","as on","ended","mar","jun","sep","dec","20","19")
+    cc = sum(h_text.count(t) for t in contact_terms)
+    pc = sum(h_text.count(t) for t in period_terms)
 
     # header ngrams
     toks = re.findall(r"[a-zA-Z]{2,}", h_text)
     hgrams = _ngrams(toks, 2, limit=16)
 
-    # tiny minhash-ish sketch: take first 16 token hashes
-    mh = []
-    for t in toks[:32]:
-        mh.append(int(hashlib.md5(t.encode("utf-8")).hexdigest()[:8], 16))
+    # MinHash over the header token set
+    return cc, pc, tuple(hgrams), tuple(minhash(toks))
+
+def compute_signature(table: Dict[str, Any]) -> Signature:
+    """Signature of a table; data- and header-derived parts are shared through sigcache."""
+    headers: List[str] = table.get("headers", []) or []
+    data: List[List[str]] = table.get("data", []) or []
+    cols = max((len(r) for r in data), default=len(headers))
+    rows = len(data)
+    dk = sigcache.data_key(data)
+    num_frac, alpha_frac, row_label_density, linebreak_entropy, proto_grid = sigcache.cached(
+        "matcher.data", None if dk is None else (cols, dk), lambda: _data_features(data, cols))
+    cc, pc, hgrams, mh = sigcache.cached(
+        "matcher.headers", sigcache.headers_key(headers), lambda: _header_features(headers))
 
     return Signature(
         page_no=table.get("page_number", -1),
         table_idx=table.get("table_index", -1),
         cols=cols, rows=rows,
-        num_frac_per_col=num_frac,
-        alpha_frac_per_col=alpha_frac,
-        header_ngrams=hgrams,
+        num_frac_per_col=list(num_frac),
+        alpha_frac_per_col=list(alpha_frac),
+        header_ngrams=list(hgrams),
         contact_cues=cc,
         period_cues=pc,
         row_label_density=row_label_density,
         linebreak_entropy=linebreak_entropy,
         proto_grid_score=proto_grid,
-        minhash=mh,
+        minhash=list(mh),
         source_extractor=str(table.get("source_extractor","")),
         ocr_flag=bool(table.get("ocr_flag", False))
     )
@@ -103,15 +140,143 @@ def jaccard_overlap(a: List[int], b: List[int]) -> float:
     inter=len(A&B); union=len(A|B) or 1
     return inter/union
 
-def match_patterns(sig: Signature, patterns: List[Dict[str, Any]], topk: int = 3) -> List[Tuple[str,float]]:
-    scored = []
+def minhash_similarity(a: List[int], b: List[int]) -> float:
+    """Estimated Jaccard of two MinHash signatures (fraction of agreeing slots)."""
+    if len(a) != MH_PERMS or len(b) != MH_PERMS: return 0.0
+    return float(np.count_nonzero(np.asarray(a, dtype=np.uint64) == np.asarray(b, dtype=np.uint64))) / MH_PERMS
+
+def _sketch_minhash(sketch: Dict[str, Any]) -> List[int]:
+    """A stored sketch's MinHash; older sketches kept raw header-token hashes (<= 32), re-hashed here."""
+    mh = list(sketch.get("minhash", []) or [])
+    if not mh or len(mh) == MH_PERMS:
+        return mh
+    return minhash_hashes(np.asarray(mh, dtype=np.uint64))
+
+class PatternIndex:
+    """Banded LSH over the patterns' MinHash sketches.
+
+    Signatures are cut into MH_BANDS bands of MH_ROWS slots; a pattern is a candidate
+    for a query when some band is identical, i.e. with probability 1-(1-J^r)^b for
+    Jaccard J (~0.5 at the 50% point for 16x4). Only candidates are scored, so a query
+    costs O(bands + candidates) whatever the store size. Patterns without a sketch
+    (hand-written family entries) cannot be hashed and are always scored. A query with
+    no MinHash (no header tokens), or with fewer than topk candidates, is ranked over
+    every pattern exactly as the linear scan would, vectorized.
+    """
+
+    def __init__(self, patterns: List[Dict[str, Any]] = ()):
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(MH_BANDS)]
+        self._sigs = np.zeros((0, MH_PERMS), dtype=np.uint64)
+        self._pos = np.zeros(0, dtype=np.int64)      # sketch row -> pattern position
+        self._rows_of: Dict[int, int] = {}
+        self._colv = np.zeros(0, dtype=np.float64)   # sketch cols per position (nan = none)
+        self._fam_ids = np.zeros(0, dtype=np.int64)
+        self._fam_code: Dict[str, int] = {}
+        self._n = 0
+        self._fams: List[str] = []
+        self._cols: List[Any] = []
+        self._loose: List[int] = []
+        for p in patterns:
+            self.add(p)
+
+    def __len__(self) -> int:
+        return len(self._fams)
+
+    def add(self, pattern: Dict[str, Any]) -> int:
+        """Insert one pattern; returns its position (the order ties are broken by)."""
+        i = len(self._fams)
+        sketch = pattern.get("signature_sketch", {}) or {}
+        fam = pattern.get("family", "generic")
+        self._fams.append(fam)
+        self._cols.append(sketch.get("cols"))
+        if i == len(self._colv):
+            size = max(16, 2 * i)
+            self._colv = np.resize(self._colv, size)
+            self._fam_ids = np.resize(self._fam_ids, size)
+        c = sketch.get("cols")
+        self._colv[i] = np.nan if c is None else c
+        self._fam_ids[i] = self._fam_code.setdefault(fam, len(self._fam_code))
+        mh = _sketch_minhash(sketch)
+        if len(mh) != MH_PERMS:
+            self._loose.append(i)
+            return i
+        row = np.asarray(mh, dtype=np.uint64)
+        if self._n == len(self._sigs):
+            grown = np.zeros((max(16, 2 * self._n), MH_PERMS), dtype=np.uint64)
+            grown[:self._n] = self._sigs[:self._n]
+            self._sigs = grown
+            self._pos = np.resize(self._pos, len(grown))
+        self._sigs[self._n] = row
+        self._pos[self._n] = i
+        self._rows_of[i] = self._n
+        self._n += 1
+        for b, buckets in enumerate(self._buckets):
+            buckets.setdefault(row[b*MH_ROWS:(b+1)*MH_ROWS].tobytes(), []).append(i)
+        return i
+
+    def candidates(self, mh: List[int]) -> Dict[int, float]:
+        """{pattern position: estimated Jaccard} for patterns sharing a band with mh."""
+        if len(mh) != MH_PERMS or not self._n:
+            return {}
+        q = np.asarray(mh, dtype=np.uint64)
+        hits = set()
+        for b, buckets in enumerate(self._buckets):
+            hits.update(buckets.get(q[b*MH_ROWS:(b+1)*MH_ROWS].tobytes(), ()))
+        if not hits:
+            return {}
+        pos = sorted(hits)
+        rows = self._sigs[[self._rows_of[i] for i in pos]]
+        est = np.count_nonzero(rows == q, axis=1) / MH_PERMS
+        return dict(zip(pos, est.tolist()))
+
+    def _score(self, i: int, est: float, sig: Signature, hints: List[str]) -> float:
+        c = self._cols[i]
+        score = 0.5 * est
+        score += 0.25 * min(1.0, abs(sig.cols - (sig.cols if c is None else c)) / max(1, sig.cols))
+        score += 0.25 * (1.0 if self._fams[i] in hints else 0.0)
+        return round(score, 3)
+
+    def _linear(self, sig: Signature, hints: List[str], topk: int) -> List[Tuple[str,float]]:
+        """The linear scan's top-k: every pattern scored with NumPy, the leaders re-scored exactly."""
+        n = len(self._fams)
+        if not n:
+            return []
+        colv = self._colv[:n]
+        cols = np.where(np.isnan(colv), sig.cols, colv)
+        score = 0.25 * np.minimum(1.0, np.abs(sig.cols - cols) / max(1, sig.cols))
+        codes = [self._fam_code[h] for h in hints if h in self._fam_code]
+        score += 0.25 * np.isin(self._fam_ids[:n], codes)
+        est: Dict[int, float] = {}
+        if len(sig.minhash) == MH_PERMS and self._n:
+            e = np.count_nonzero(self._sigs[:self._n] == np.asarray(sig.minhash, dtype=np.uint64), axis=1) / MH_PERMS
+            score[self._pos[:self._n]] += 0.5 * e
+            est = dict(zip(self._pos[:self._n].tolist(), e.tolist()))
+        k = min(topk, n)
+        kth = -np.partition(-score, k - 1)[k - 1] if k else np.inf
+        # anything within rounding distance of the k-th score may tie with it after round(., 3)
+        picks = np.flatnonzero(score >= kth - 1e-3).tolist()
+        scored = [(self._fams[i], self._score(i, est.get(i, 0.0), sig, hints)) for i in picks]
+        scored.sort(key=lambda x: x[1], reverse=True)
+        return scored[:topk]
+
+    def query(self, sig: Signature, topk: int = 3) -> List[Tuple[str,float]]:
+        hints = family_hints(sig)
+        est = self.candidates(sig.minhash)
+        if len(est) < topk:
+            return self._linear(sig, hints, topk)
+        scored = [(self._fams[i], self._score(i, est.get(i, 0.0), sig, hints))
+                  for i in sorted(set(est) | set(self._loose))]
+        scored.sort(key=lambda x: x[1], reverse=True)
+        return scored[:topk]
+
+def pattern_index(patterns: Iterable[Dict[str, Any]]) -> PatternIndex:
+    """Index over patterns; callers that match repeatedly hold it and add() confirmed patterns to it."""
+    idx = PatternIndex()
     for p in patterns:
-        fam = p.get("family","generic")
-        sketch = p.get("signature_sketch",{})
-        mh = sketch.get("minhash",[])
-        score = 0.5 * jaccard_overlap(sig.minhash, mh)
-        score += 0.25 * min(1.0, abs(sig.cols - sketch.get("cols", sig.cols)) / max(1, sig.cols))
-        score += 0.25 * (1.0 if fam in family_hints(sig) else 0.0)
-        scored.append((fam, round(score,3)))
-    scored.sort(key=lambda x: x[1], reverse=True)
-    return scored[:topk]
+        idx.add(p)
+    return idx
+
+def match_patterns(sig: Signature, patterns: List[Dict[str, Any]] | PatternIndex, topk: int = 3) -> List[Tuple[str,float]]:
+    """Best families for sig; a plain list is indexed for this call only (pass a PatternIndex to reuse one)."""
+    idx = patterns if isinstance(patterns, PatternIndex) else pattern_index(patterns)
+    return idx.query(sig, topk)
@@ -355,14 +355,16 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-import json, re, random, time, os
+import atexit, hashlib, json, queue, re, random, threading, time, os
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from phoenix.memory import eventlog, sigcache
+from phoenix.memory.store import PatternStore, is_store_path
+from phoenix.metrics.tabularity import tabularity
+from phoenix.utils.anchors import EMAIL_RE, KV_RE, PHONE_RE, URL_RE, anchor_count, count
+from phoenix.utils.text import KeywordMatcher
 
-EMAIL_RE  = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
-URL_RE    = re.compile(r"(?:(?:https?://)?(?:www\.)?[A-Za-z0-9.-]+\.[A-Za-z]{2,}(?:/[^\s]*)?)", re.I)
-PHONE_RE  = re.compile(r"(?:\+?\d[\d\s\-]{7,}\d)")
-KV_RE     = re.compile(r"[A-Za-z][A-Za-z\s]{1,30}:")
 MONTH_TOK = ("jan","feb","mar","apr","may","jun","jul","aug","sep","sept","oct","nov","dec")
 YEAR_RE   = re.compile(r"(?:19|20)\d{2}")
 LEX_TOKS  = (
@@ -370,6 +372,7 @@ LEX_TOKS  = (
   "contact person","company secretary","compliance officer","investor relations",
   "email","e-mail","website","tel","telephone","phone","fax","price band","isin","cin","pan","sebi"
 )
+LEX_MATCHER = KeywordMatcher(LEX_TOKS)
 
 def _norm(x: Any) -> str:
     return re.sub(r"\s+"," ",("" if x is None else str(x)).strip())
@@ -380,46 +383,93 @@ def _flat_text(table: Dict[str,Any], rows:int=12) -> str:
     return " ".join(" ".join(r) for r in head)
 
 def _tabularity_proxy(rows: List[List[str]]) -> float:
-    if not rows: return 0.0
-    cols = max((len(r) for r in rows), default=0)
-    if cols <= 1: return 0.0
-    col_scores=[]
-    for j in range(cols):
-        vals=[_norm(r[j]) for r in rows if j<len(r)]
-        vals=[v for v in vals if v]
-        if not vals: col_scores.append(0.0); continue
-        nums=sum(bool(re.fullmatch(r"[0-9,.\-()%₹]+",v)) for v in vals)
-        frac=max(nums/len(vals), 1-nums/len(vals))
-        col_scores.append(frac)
-    purity=sum(col_scores)/len(col_scores)
-    strong=sum(1 for f in col_scores if f>0.7)
-    width=1.0 if (cols>=2 and strong>=1) else 0.0
-    return round(0.7*purity+0.3*width,3)
-
-def _signature(table: Dict[str,Any]) -> Dict[str,Any]:
-    txt = (_flat_text(table) + " " + " ".join(table.get("headers",[]) or [])).lower()
+    return tabularity(rows, "memory")
+
+def _page_band(page_number: Any) -> str:
+    pn = page_number or 9999
+    return "front" if pn<=2 else ("mid" if pn<=6 else "back")
+
+def _data_part(data: List[List[str]]) -> Tuple[float, float, int]:
+    return (_tabularity_proxy(data),
+            (sum(1 for r in data for c in r if (c or "").strip()) / max(1,sum(len(r) for r in data))) if data else 0.0,
+            max((len(r) for r in data), default=0))
+
+def _text_part(txt: str) -> Tuple[int, int, int, int, int, bool]:
+    return (count(EMAIL_RE, txt), count(URL_RE, txt), count(PHONE_RE, txt), count(KV_RE, txt),
+            LEX_MATCHER.n_hits(txt),
+            (any(m in txt for m in MONTH_TOK) or bool(YEAR_RE.search(txt))))
+
+def _signature(table: Dict[str,Any], flat: Optional[str] = None) -> Dict[str,Any]:
+    # Parts are cached by content (sigcache): the post_gate call for a table whose
+    # rows pre_gate already saw reuses the data part, and the scans run again only
+    # when the flattened text + headers differ.
     data = table.get("data",[]) or []
+    txt = ((_flat_text(table) if flat is None else flat) + " " + " ".join(table.get("headers",[]) or [])).lower()
+    tab, ner, ncol = sigcache.cached("memory.data", sigcache.data_key(data), lambda: _data_part(data))
+    em, url, ph, kv, lex, period = sigcache.cached("memory.text", txt, lambda: _text_part(txt))
     sig = {
         "table_type": table.get("table_type"),
         "page_number": table.get("page_number"),
-        "tabularity_proxy": _tabularity_proxy(data),
-        "email_count": len(EMAIL_RE.findall(txt)),
-        "url_count": len(URL_RE.findall(txt)),
-        "phone_count": len(PHONE_RE.findall(txt)),
-        "kv_label_count": len(KV_RE.findall(txt)),
-        "lex_hits": sum(1 for t in LEX_TOKS if t in txt),
-        "non_empty_ratio": (sum(1 for r in data for c in r if (c or "").strip()) / max(1,sum(len(r) for r in data))) if data else 0.0,
-        "has_period_tokens": (any(m in txt for m in MONTH_TOK) or bool(YEAR_RE.search(txt))),
-        "col_count": max((len(r) for r in data), default=0)
+        "tabularity_proxy": tab,
+        "email_count": em,
+        "url_count": url,
+        "phone_count": ph,
+        "kv_label_count": kv,
+        "lex_hits": lex,
+        "non_empty_ratio": ner,
+        "has_period_tokens": period,
+        "col_count": ncol
     }
     # band: weak heuristic; still useful for policy context
-    pn = sig["page_number"] or 9999
-    sig["page_band"] = "front" if pn<=2 else ("mid" if pn<=6 else "back")
+    sig["page_band"] = _page_band(sig["page_number"])
     sig["anchor_count"] = int(sig["email_count"]>0) + int(sig["url_count"]>0) + int(sig["phone_count"]>0)
     return sig
 
-def _load_patterns(path: Path) -> List[Dict[str,Any]]:
-    if not path.exists(): return []
+# SQLite pattern stores (learning.patterns_path ending in .db / .sqlite), one per path
+_STORES: Dict[str, PatternStore] = {}
+
+def _pattern_store(path: Path) -> PatternStore:
+    db = _STORES.get(str(path))
+    if db is None:
+        db = _STORES[str(path)] = PatternStore(path)
+    return db
+
+def patterns_digest(path: Path) -> str:
+    """Fingerprint of a SQLite store's patterns (not its counters); "absent" when missing."""
+    if not path.exists():
+        return "absent"
+    body = json.dumps(_pattern_store(path).patterns(), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(body.encode("utf-8")).hexdigest()
+
+# process-level pattern cache: path -> ((mtime_ns, size) / (-1, store revision), or None if absent; patterns; last stat time)
+_PATTERN_CACHE: Dict[str, Tuple[Optional[Tuple[int,int]], List[Dict[str,Any]], float]] = {}
+
+def _load_patterns(path: Path, recheck_s: float = 0.0) -> List[Dict[str,Any]]:
+    """
+    Parsed patterns store, re-read only when the file's mtime/size changes (a SQLite
+    store: when its revision changes). Within recheck_s of the last look the cached
+    list is returned without a stat().
+    """
+    key = str(path)
+    hit = _PATTERN_CACHE.get(key)
+    now = time.monotonic()
+    if hit is not None and recheck_s > 0 and now - hit[2] < recheck_s:
+        return hit[1]
+    try:
+        st = path.stat()
+    except OSError:
+        empty = hit[1] if hit is not None and hit[0] is None else []
+        _PATTERN_CACHE[key] = (None, empty, now)
+        return empty
+    db = _pattern_store(path) if is_store_path(path) else None
+    stamp = (-1, db.revision()) if db is not None else (st.st_mtime_ns, st.st_size)
+    if hit is not None and hit[0] == stamp:
+        _PATTERN_CACHE[key] = (stamp, hit[1], now)
+        return hit[1]
+    if db is not None:
+        out = db.patterns()
+        _PATTERN_CACHE[key] = (stamp, out, now)
+        return out
     lines = path.read_text(encoding="utf-8").splitlines()
     out=[]
     for ln in lines:
@@ -427,68 +477,251 @@ def _load_patterns(path: Path) -> List[Dict[str,Any]]:
         if not ln: continue
         try: out.append(json.loads(ln))
         except Exception: continue
+    _PATTERN_CACHE[key] = (stamp, out, now)
     return out
 
-def _apply_ops(table: Dict[str,Any], recipe: Dict[str,Any]) -> Dict[str,Any]:
-    ops = recipe.get("ops",[])
-    data = table.get("data",[]) or []
-    headers = table.get("headers",[]) or []
-
-    for op in ops:
-        kind = op.get("op")
-        if kind == "singlecol_compose":
-            # Ensure single text column with a stable header
-            headers = ["Contact Block"]
-            data = [[_norm(" ".join(r))] for r in data if any((c or "").strip() for c in r)]
-        elif kind == "kv_pair_extractor":
-            # Pull key:value pairs into columns (best-effort)
-            txt = _flat_text({"data":data})
-            pairs = re.findall(r"([A-Za-z][A-Za-z\s]{1,30}):\s*([^\n;|]+)", txt)
-            if pairs:
-                # normalize labels and collapse to one row (conservative)
-                labels = []
-                values = []
-                for k,v in pairs:
-                    lab = re.sub(r"\s+"," ",k).strip().title()
-                    if lab not in labels:
-                        labels.append(lab)
-                        values.append(_norm(v))
-                headers = labels or headers or ["Contact Block"]
-                data = [values] if values else data
-        elif kind == "promote_front_fields":
-            # If we see Email/Website/Tel in text, surface canonical labels as headers
-            txt = _flat_text({"data":data})
-            labs = []
-            for pat,name in [
-                (r"email|e-?mail", "Email"),
-                (r"website|web\s*site|url", "Website"),
-                (r"tel|telephone|phone|fax", "Telephone"),
-                (r"registrar(\s+to\s+the)?\s+(issue|offer)", "Registrar"),
-                (r"(lead\s+manager|merchant\s+banker|brlm)", "Lead Manager"),
-                (r"(contact\s+person|compliance\s+officer|company\s+secretary)", "Contact")
-            ]:
-                if re.search(pat, txt, re.I): labs.append(name)
-            if labs:
-                # Keep data as-is but rename headers to reflect intent
-                n = max(1, len(data[0]) if data else 1)
-                headers = (labs + [f"Field_{i}" for i in range(max(0, n-len(labs)))])[:n]
-        elif kind == "drop_empty_cols":
-            thr = float(op.get("threshold",0.30))
-            if data:
-                keep=[]
-                for j in range(len(data[0])):
-                    non_empty=sum(1 for r in data if (j<len(r) and (r[j] or "").strip() not in {"","-"}))
-                    if non_empty/len(data) >= thr:
-                        keep.append(j)
-                if keep:
-                    data = [[(r[j] if j<len(r) else "") for j in keep] for r in data]
-                    headers = [(headers[j] if j<len(headers) else f"Column_{k}") for k,j in enumerate(keep)]
-        # else: ignore unknown ops
-    out = dict(table)
-    out["headers"] = headers
-    out["data"] = data
+# ---- pattern preconditions ----
+# A pattern's "signature" is a precondition on the tables its recipe may touch, e.g.
+#   {"table_type":"FRONT_PAGE","min_anchor_count":1,"page_band":["front","mid"]}
+# PreconditionIndex groups enabled patterns by (table_type, page_band); apply() looks up
+# a table's bucket, runs the structural predicates (rows / chars / header columns), and
+# only computes the memory signature for the survivors, whose anchor / KV minimums are
+# then checked. Keys the index does not know are ignored.
+
+_RECIPES: Dict[str, Dict[str,Any]] = {
+    "FRONT_CONTACT_SLIM": {"ops":[{"op":"singlecol_compose"},{"op":"promote_front_fields"}]},
+    "FRONT_CONTACT_KV":   {"ops":[{"op":"singlecol_compose"},{"op":"kv_pair_extractor"},{"op":"promote_front_fields"}]},
+}
+# used when the store defines no usable pattern (same families as baselines/patterns_phase1B.jsonl)
+_DEFAULT_PATTERNS: List[Dict[str,Any]] = [
+    {"family":"FRONT_CONTACT_SLIM","signature":{"table_type":"FRONT_PAGE","min_anchor_count":1,"page_band":["front","mid"]}},
+    {"family":"FRONT_CONTACT_KV","signature":{"table_type":"FRONT_PAGE","min_kv_labels":3}},
+]
+_BANDS = ("front", "mid", "back")
+
+def _as_set(v: Any) -> Optional[set]:
+    if v is None:
+        return None
+    return {v} if isinstance(v, str) else set(v)
+
+class _Precondition:
+    __slots__ = ("order", "family", "recipe", "table_types", "bands", "table_checks", "sig_checks")
+
+    def __init__(self, order: int, family: str, recipe: Dict[str,Any], sig: Dict[str,Any]):
+        self.order, self.family, self.recipe = order, family, recipe
+        self.table_types = _as_set(sig.get("table_type"))
+        self.bands = _as_set(sig.get("page_band"))
+        tc: List[Any] = []
+        if sig.get("min_rows") is not None:
+            n = int(sig["min_rows"]); tc.append(lambda t, d: len(d) >= n)
+        if sig.get("max_rows") is not None:
+            m = int(sig["max_rows"]); tc.append(lambda t, d: len(d) <= m)
+        if sig.get("max_char_per_row") is not None:
+            c = int(sig["max_char_per_row"])
+            tc.append(lambda t, d: max((len(" ".join(x or "" for x in r)) for r in d), default=0) <= c)
+        if sig.get("has_columns"):
+            terms = [str(x).lower() for x in sig["has_columns"]]
+            def has_columns(t: Dict[str,Any], d: List[List[str]]) -> bool:
+                hs = [str(h).lower() for h in (t.get("headers") or [])]
+                return all(any(term in h for h in hs) for term in terms)
+            tc.append(has_columns)
+        sc: List[Any] = []
+        if sig.get("min_anchor_count") is not None:
+            a = int(sig["min_anchor_count"]); sc.append(lambda s: s["anchor_count"] >= a)
+        if sig.get("min_kv_labels") is not None:
+            k = int(sig["min_kv_labels"]); sc.append(lambda s: s["kv_label_count"] >= k)
+        self.table_checks, self.sig_checks = tuple(tc), tuple(sc)
+
+    def matches_table(self, table: Dict[str,Any], data: List[List[str]]) -> bool:
+        return all(f(table, data) for f in self.table_checks)
+
+    def matches_signature(self, sig: Dict[str,Any]) -> bool:
+        return all(f(sig) for f in self.sig_checks)
+
+class PreconditionIndex:
+    def __init__(self, patterns: List[Dict[str,Any]]):
+        self._buckets: Dict[Tuple[str,str], List[_Precondition]] = {}
+        n = 0
+        for p in patterns:
+            if not p.get("enabled", True):
+                continue
+            fam = (p.get("family") or str(p.get("id") or "").split(".")[0]).upper()
+            recipe = {"ops": p["ops"]} if p.get("ops") else _RECIPES.get(fam)
+            if not fam or recipe is None:
+                continue
+            pc = _Precondition(n, fam, recipe, p.get("signature") or {})
+            n += 1
+            for tt in (pc.table_types or {"*"}):
+                for band in (pc.bands or _BANDS):
+                    self._buckets.setdefault((tt, band), []).append(pc)
+        self.size = n
+
+    def candidates(self, table: Dict[str,Any], band: str) -> List[_Precondition]:
+        """Patterns whose type / band / structural predicates hold for the table (store order)."""
+        exact = self._buckets.get((table.get("table_type"), band), [])
+        wild = self._buckets.get(("*", band), [])
+        pcs = sorted(exact + wild, key=lambda pc: pc.order) if (exact and wild) else (exact or wild)
+        if not pcs:
+            return pcs
+        data = table.get("data") or []
+        return [pc for pc in pcs if pc.matches_table(table, data)]
+
+_INDEX_CACHE: Dict[str, Tuple[List[Dict[str,Any]], PreconditionIndex]] = {}
+
+def _precondition_index(path: Path, recheck_s: float = 0.0) -> PreconditionIndex:
+    """Index over the store (rebuilt when it is re-read); built-in FRONT_CONTACT patterns when it has none."""
+    patterns = _load_patterns(path, recheck_s)
+    hit = _INDEX_CACHE.get(str(path))
+    if hit is not None and hit[0] is patterns:
+        return hit[1]
+    idx = PreconditionIndex(patterns)
+    if not idx.size:
+        idx = PreconditionIndex(_DEFAULT_PATTERNS)
+    _INDEX_CACHE[str(path)] = (patterns, idx)
+    return idx
+
+# ---- recipe executor ----
+# Recipes are compiled once into tuples of op keys. A _RecipeRun holds one table's
+# intermediate states keyed by op prefix, so families that share a prefix (both
+# FRONT_CONTACT families start with singlecol_compose) run it once. Each state keeps
+# its flattened text and anchor / KV results, shared by the later text ops and by
+# the reward proxy.
+
+_KV_PAIR_RE = re.compile(r"([A-Za-z][A-Za-z\s]{1,30}):\s*([^\n;|]+)")
+_FRONT_FIELDS = (
+    (r"email|e-?mail", "Email"),
+    (r"website|web\s*site|url", "Website"),
+    (r"tel|telephone|phone|fax", "Telephone"),
+    (r"registrar(?:\s+to\s+the)?\s+(?:issue|offer)", "Registrar"),
+    (r"(?:lead\s+manager|merchant\s+banker|brlm)", "Lead Manager"),
+    (r"(?:contact\s+person|compliance\s+officer|company\s+secretary)", "Contact"),
+)
+_FRONT_FIELDS_RES = tuple((re.compile(p, re.I), name) for p, name in _FRONT_FIELDS)
+
+class _OpState:
+    __slots__ = ("headers", "data", "_flat", "_anchors", "_kv")
+
+    def __init__(self, headers: List[str], data: List[List[str]], flat: Optional[str] = None):
+        self.headers = headers
+        self.data = data
+        self._flat = flat
+        self._anchors: Optional[int] = None
+        self._kv: Optional[int] = None
+
+    @property
+    def flat(self) -> str:
+        if self._flat is None:
+            self._flat = _flat_text({"data": self.data})
+        return self._flat
+
+    @property
+    def anchors(self) -> int:
+        if self._anchors is None:
+            self._anchors = anchor_count(self.flat)
+        return self._anchors
+
+    @property
+    def kv(self) -> int:
+        if self._kv is None:
+            self._kv = count(KV_RE, self.flat)
+        return self._kv
+
+_OpKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+_COMPILED: Dict[str, Tuple[_OpKey, ...]] = {}
+
+def _compile_recipe(recipe: Dict[str,Any]) -> Tuple[_OpKey, ...]:
+    """Recipe -> hashable op tuple (memoized by the recipe's JSON)."""
+    key = json.dumps(recipe.get("ops", []), sort_keys=True, default=str)
+    ops = _COMPILED.get(key)
+    if ops is None:
+        ops = tuple((str(op.get("op")), tuple(sorted((k, v) for k, v in op.items() if k != "op")))
+                    for op in recipe.get("ops", []))
+        _COMPILED[key] = ops
+    return ops
+
+def _op_singlecol_compose(st: _OpState, params: Dict[str,Any]) -> _OpState:
+    # Ensure single text column with a stable header
+    rows = [[" ".join(" ".join(r).split())] for r in st.data if any((c or "").strip() for c in r)]
+    return _OpState(["Contact Block"], rows)
+
+def _op_kv_pair_extractor(st: _OpState, params: Dict[str,Any]) -> _OpState:
+    # Pull key:value pairs into columns (best-effort); conservative: collapse to one row
+    pairs = _KV_PAIR_RE.findall(st.flat)
+    if not pairs:
+        return st
+    labels: List[str] = []
+    values: List[str] = []
+    for k, v in pairs:
+        lab = " ".join(k.split()).title()
+        if lab not in labels:
+            labels.append(lab)
+            values.append(" ".join(v.split()))
+    headers = labels or st.headers or ["Contact Block"]
+    return _OpState(headers, [values] if values else st.data, None if values else st._flat)
+
+def _op_promote_front_fields(st: _OpState, params: Dict[str,Any]) -> _OpState:
+    # If we see Email/Website/Tel in text, surface canonical labels as headers (data as-is)
+    txt = st.flat
+    labs = [name for rx, name in _FRONT_FIELDS_RES if rx.search(txt)]
+    if not labs:
+        return st
+    data = st.data
+    n = max(1, len(data[0]) if data else 1)
+    out = _OpState((labs + [f"Field_{i}" for i in range(max(0, n-len(labs)))])[:n], data, st._flat)
+    out._anchors, out._kv = st._anchors, st._kv
     return out
 
+def _op_drop_empty_cols(st: _OpState, params: Dict[str,Any]) -> _OpState:
+    thr = float(params.get("threshold", 0.30))
+    data, headers = st.data, st.headers
+    if not data:
+        return st
+    keep = []
+    for j in range(len(data[0])):
+        non_empty = sum(1 for r in data if (j < len(r) and (r[j] or "").strip() not in {"", "-"}))
+        if non_empty/len(data) >= thr:
+            keep.append(j)
+    if not keep:
+        return st
+    return _OpState([(headers[j] if j < len(headers) else f"Column_{k}") for k, j in enumerate(keep)],
+                    [[(r[j] if j < len(r) else "") for j in keep] for r in data])
+
+_OPS = {
+    "singlecol_compose": _op_singlecol_compose,
+    "kv_pair_extractor": _op_kv_pair_extractor,
+    "promote_front_fields": _op_promote_front_fields,
+    "drop_empty_cols": _op_drop_empty_cols,
+}
+
+class _RecipeRun:
+    """One table's recipe executions; states are memoized per op prefix."""
+
+    def __init__(self, table: Dict[str,Any]):
+        self.table = table
+        self.base = _OpState(table.get("headers",[]) or [], table.get("data",[]) or [])
+        self._states: Dict[Tuple[_OpKey, ...], _OpState] = {(): self.base}
+
+    def state(self, ops: Tuple[_OpKey, ...]) -> _OpState:
+        st = self._states.get(ops)
+        if st is not None:
+            return st
+        prev = self.state(ops[:-1])
+        kind, params = ops[-1]
+        fn = _OPS.get(kind)
+        st = fn(prev, dict(params)) if fn is not None else prev  # unknown ops are ignored
+        self._states[ops] = st
+        return st
+
+    def run(self, recipe: Dict[str,Any]) -> Tuple[Dict[str,Any], _OpState]:
+        st = self.state(_compile_recipe(recipe))
+        out = dict(self.table)
+        out["headers"] = st.headers
+        out["data"] = st.data
+        return out, st
+
+def _apply_ops(table: Dict[str,Any], recipe: Dict[str,Any]) -> Dict[str,Any]:
+    return _RecipeRun(table).run(recipe)[0]
+
 def _score_candidate(sig: Dict[str,Any], kind:str) -> float:
     # Lightweight scoring that the bandit can bias with exploration.
     base = 0.0
@@ -498,50 +731,173 @@ def _score_candidate(sig: Dict[str,Any], kind:str) -> float:
         base = 0.30*sig["anchor_count"] + 0.35*(sig["kv_label_count"]>=3) + 0.15*(sig["page_band"] in {"front","mid"}) + 0.10*(sig["tabularity_proxy"]<0.35)
     return float(base)
 
-def _write_event(path: Path, evt: Dict[str,Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(evt, ensure_ascii=False) + "\n")
+class _EventWriter:
+    """
+    Buffered appender for one learning-events file.
+    Lines are serialized on write() and appended in batches of `flush_every`;
+    with background=True a daemon thread does the file I/O off the Surgeon's path.
+    With a ShardWriter sink (events_layout: sharded) batches go to this process's
+    shard of the log directory instead, indexed by dossier / stage / family.
+    """
+
+    def __init__(self, path: Path, flush_every: int = 256, background: bool = False,
+                 sink: Optional[eventlog.ShardWriter] = None):
+        self.path = path
+        self.flush_every = max(1, int(flush_every))
+        self.sink = sink
+        self._buf: List[Tuple[str, Optional[Dict[str,Any]]]] = []
+        self._lock = threading.Lock()
+        self._q: Optional[queue.Queue] = None
+        if background:
+            self._q = queue.Queue()
+            threading.Thread(target=self._drain, name="phoenix-events", daemon=True).start()
+
+    def write(self, evt: Dict[str,Any]) -> None:
+        line = json.dumps(evt, ensure_ascii=False) + "\n"
+        key = {"ts": evt.get("ts"), "dossier": evt.get("dossier"), "stage": evt.get("stage"),
+               "family": eventlog.event_family(evt)} if self.sink is not None else None
+        with self._lock:
+            self._buf.append((line, key))
+            if len(self._buf) < self.flush_every:
+                return
+            batch, self._buf = self._buf, []
+        self._emit(batch)
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._buf = self._buf, []
+        if batch:
+            self._emit(batch)
+        if self._q is not None:
+            self._q.join()
+
+    def _emit(self, batch: List[Tuple[str, Optional[Dict[str,Any]]]]) -> None:
+        if self._q is not None:
+            self._q.put(batch)
+        else:
+            self._append(batch)
+
+    def _append(self, batch: List[Tuple[str, Optional[Dict[str,Any]]]]) -> None:
+        if self.sink is not None:
+            self.sink.append([k for _, k in batch], [ln for ln, _ in batch])
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # one O_APPEND write per batch: concurrent appenders do not interleave inside it
+        eventlog._write_all(self.path, "".join(ln for ln, _ in batch).encode("utf-8"))
+
+    def _drain(self) -> None:
+        while True:
+            batch = self._q.get()
+            try:
+                self._append(batch)
+            except Exception:
+                pass
+            finally:
+                self._q.task_done()
+
+_WRITERS: Dict[str, _EventWriter] = {}
+_WRITERS_LOCK = threading.Lock()
+
+def _event_writer(path: Path, config: Dict[str,Any]) -> _EventWriter:
+    key = str(path)
+    w = _WRITERS.get(key)
+    if w is None:
+        with _WRITERS_LOCK:
+            w = _WRITERS.get(key)
+            if w is None:
+                sink = None
+                if config.get("events_layout", "file") == "sharded":
+                    rot_s = config.get("events_rotate_s", 86400)
+                    sink = eventlog.ShardWriter(eventlog.log_dir(path),
+                                                rotate_bytes=int(float(config.get("events_rotate_mb", 64)) * (1 << 20)),
+                                                rotate_s=None if rot_s is None else float(rot_s))
+                w = _EventWriter(path,
+                                 flush_every=int(config.get("events_flush_every", 256)),
+                                 background=bool(config.get("events_background", False)),
+                                 sink=sink)
+                _WRITERS[key] = w
+    return w
+
+def flush_events() -> None:
+    """Flush every buffered learning-event writer (also runs at interpreter exit)."""
+    for w in list(_WRITERS.values()):
+        try:
+            w.flush()
+        except Exception:
+            pass
+
+def _reset_after_fork() -> None:
+    # a forked worker must not re-emit the parent's buffered lines or wait on its thread
+    global _WRITERS_LOCK
+    _WRITERS.clear()
+    _WRITERS_LOCK = threading.Lock()
+
+atexit.register(flush_events)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def _write_event(path: Path, evt: Dict[str,Any], config: Optional[Dict[str,Any]] = None) -> None:
+    _event_writer(path, config or {}).write(evt)
 
 def apply(table_dict: Dict[str,Any], dossier_name: str, config: Dict[str,Any], stage: str="pre_gate") -> Tuple[Dict[str,Any], Dict[str,Any]]:
     """
     Returns (possibly modified table, decision dict).
     decision = {action, family, accept_override(bool), reward_proxy(float)}
+
+    Only families whose pattern preconditions hold are considered. A table no pattern
+    targets comes back untouched with action "none": no event, no patterns-store stat
+    within config["patterns_recheck_s"] (default 2s) of the last one, and no signature
+    unless it is a pre_gate FRONT_PAGE table, which still gets its accept_override.
     """
-    rng = random.Random((hash(dossier_name) ^ int(time.time()) ) & 0xFFFFFFFF)
     patterns_path = Path(config.get("patterns_path","out/patterns/patterns.jsonl"))
     events_path   = Path(config.get("events_path","out/review/learning_events.jsonl"))
     eps           = float(config.get("exploration_rate", 0.15))
     enabled       = bool(config.get("enabled", True))
+    no_action     = {"action":"none","family":None,"accept_override":False,"reward_proxy":0.0}
 
-    sig = _signature(table_dict)
+    if not enabled:
+        table_dict = dict(table_dict)
+        table_dict["_signature"] = _signature(table_dict)  # stash for lineage
+        return table_dict, no_action
+
+    # Candidate families: patterns whose preconditions hold (store; built-in FRONT_CONTACT pair if empty)
+    index = _precondition_index(patterns_path, float(config.get("patterns_recheck_s", 2.0)))
+    cands = index.candidates(table_dict, _page_band(table_dict.get("page_number")))
+    front_gate = stage=="pre_gate" and (table_dict.get("table_type")=="FRONT_PAGE")
+    if not cands and not front_gate:
+        return table_dict, no_action
+
+    run = _RecipeRun(table_dict)
+    sig = _signature(table_dict, run.base.flat)
+
+    # Policy can optionally override acceptance for FRONT_PAGE, low-tabularity but high anchors
+    accept_override = False
+    if front_gate:
+        if sig["tabularity_proxy"] < 0.35 and (sig["anchor_count"]>=2 or sig["kv_label_count"]>=3):
+            accept_override = True
+
+    cands = [pc for pc in cands if pc.matches_signature(sig)]
+    if not cands:
+        return table_dict, dict(no_action, accept_override=accept_override)
     table_dict = dict(table_dict)
     table_dict["_signature"] = sig  # stash for lineage
-
-    if not enabled:
-        return table_dict, {"action":"none","family":None,"accept_override":False,"reward_proxy":0.0}
-
-    # Candidate families (from patterns store; fall back to hardcoded two)
-    patterns = _load_patterns(patterns_path)
-    families: List[str] = []
-    for p in patterns:
-        fam = (p.get("family") or p.get("id") or "").upper()
-        if fam.startswith("FRONT_CONTACT_SLIM") or fam.startswith("FRONT_CONTACT_KV"):
-            families.append(fam.split(".")[0])
-    if not families:
-        families = ["FRONT_CONTACT_SLIM","FRONT_CONTACT_KV"]
+    recipes: Dict[str, Dict[str,Any]] = {}
+    for pc in cands:
+        recipes.setdefault(pc.family, pc.recipe)
+    families = list(recipes)
+
+    seed = config.get("seed")
+    if seed is None:
+        rng = random.Random((hash(dossier_name) ^ int(time.time()) ) & 0xFFFFFFFF)
+    else:
+        # deterministic mode: same table, same exploration draw, on every run and worker
+        rng = random.Random(f"{seed}|{dossier_name}|{table_dict.get('page_number')}|{table_dict.get('table_index')}|{stage}")
 
     # Pick action via epsilon-greedy on simple feature-based score
     explore = rng.random() < eps
     scored = [(fam, _score_candidate(sig, fam)) for fam in families]
     scored.sort(key=lambda x: x[1], reverse=True)
-    chosen_fam = (rng.choice(families) if explore else (scored[0][0] if scored else "FRONT_CONTACT_SLIM"))
-
-    # Define ops per family (recipe template)
-    recipes = {
-      "FRONT_CONTACT_SLIM": {"ops":[{"op":"singlecol_compose"},{"op":"promote_front_fields"}]},
-      "FRONT_CONTACT_KV":   {"ops":[{"op":"singlecol_compose"},{"op":"kv_pair_extractor"},{"op":"promote_front_fields"}]}
-    }
+    chosen_fam = rng.choice(families) if explore else scored[0][0]
 
     before = {
         "headers": table_dict.get("headers",[]),
@@ -550,24 +906,19 @@ def apply(table_dict: Dict[str,Any], dossier_name: str, config: Dict[str,Any], s
         "tabularity_proxy": sig["tabularity_proxy"]
     }
 
-    modified = _apply_ops(table_dict, recipes[chosen_fam])
-    # Proxy reward: delta in anchor density & header salience proxy
-    flat_before = _flat_text(table_dict)
-    flat_after  = _flat_text(modified)
+    after = run.state(_compile_recipe(recipes[chosen_fam]))
+    modified = dict(table_dict, headers=after.headers, data=after.data)
+    # Proxy reward: delta in anchor density & header salience proxy (texts / scans shared with the ops)
+    before_st = run.base
+    flat_after = after.flat
 
-    anchor_before = int(bool(EMAIL_RE.search(flat_before))) + int(bool(URL_RE.search(flat_before))) + int(bool(PHONE_RE.search(flat_before)))
-    anchor_after  = int(bool(EMAIL_RE.search(flat_after)))  + int(bool(URL_RE.search(flat_after)))  + int(bool(PHONE_RE.search(flat_after)))
-    kv_before = len(KV_RE.findall(flat_before))
-    kv_after  = len(KV_RE.findall(flat_after))
+    anchor_before = before_st.anchors
+    anchor_after  = after.anchors
+    kv_before = before_st.kv
+    kv_after  = after.kv
 
     reward_proxy = 0.6*max(0, anchor_after - anchor_before) + 0.4*max(0, kv_after - kv_before)
 
-    # Policy can optionally override acceptance for FRONT_PAGE, low-tabularity but high anchors
-    accept_override = False
-    if stage=="pre_gate" and (table_dict.get("table_type")=="FRONT_PAGE"):
-        if sig["tabularity_proxy"] < 0.35 and (sig["anchor_count"]>=2 or sig["kv_label_count"]>=3):
-            accept_override = True
-
     event = {
         "ts": int(time.time()),
         "dossier": dossier_name,
@@ -587,9 +938,17 @@ def apply(table_dict: Dict[str,Any], dossier_name: str, config: Dict[str,Any], s
         "accept_override": accept_override
     }
     try:
-        _write_event(events_path, event)
+        _write_event(events_path, event, config)
     except Exception:
         pass
+    if is_store_path(patterns_path):
+        # shared recipe stats: one atomic UPSERT, visible to every worker on the store
+        try:
+            _pattern_store(patterns_path).bump_recipe(
+                chosen_fam, recipes[chosen_fam], reward_proxy,
+                win=reward_proxy >= float(config.get("min_gain", 0.08)))
+        except Exception:
+            pass
 
     decision = {"action":"apply_recipe","family":chosen_fam,"accept_override":accept_override,"reward_proxy":reward_proxy}
     return modified, decision
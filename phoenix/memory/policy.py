@@ -1,12 +1,16 @@
 from __future__ import annotations
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import random
 
+from .store import PatternStore
+
 class ContextualBandit:
-    def __init__(self, exploration: float = 0.15):
+    def __init__(self, exploration: float = 0.15, store: Optional[PatternStore] = None):
         self.epsilon = exploration
         self.arms: Dict[str, Dict[str, Dict[str, float]]] = {}
         # structure: arms[family][op] = {"trials": n, "wins": m, "avg_gain": g}
+        # with a store, arms live in its bandit_arms table (shared across processes and runs)
+        self.store = store
 
     def _arm_stats(self, family: str, op: str) -> Dict[str,float]:
         fam = self.arms.setdefault(family, {})
@@ -17,15 +21,19 @@ class ContextualBandit:
             random.shuffle(ops)
             return ops
         # exploit first: sort by empirical win-rate then avg gain
+        shared = self.store.arms(family) if self.store is not None else None
         scored = []
         for op in ops:
-            s = self._arm_stats(family, op)
+            s = self._arm_stats(family, op) if shared is None else shared.get(op, {"trials":0.0, "wins":0.0, "avg_gain":0.0})
             wr = (s["wins"]/s["trials"]) if s["trials"]>0 else 0.0
             scored.append((op, wr, s["avg_gain"]))
         scored.sort(key=lambda x: (x[1], x[2]), reverse=True)
         return [op for op,_,_ in scored]
 
     def update(self, family: str, op: str, gain: float, guard_ok: bool, threshold: float) -> None:
+        if self.store is not None:
+            self.store.update_arm(family, op, gain, guard_ok and (gain >= threshold))
+            return
         s = self._arm_stats(family, op)
         s["trials"] += 1.0
         win = guard_ok and (gain >= threshold)
@@ -1,10 +1,20 @@
 from __future__ import annotations
 from dataclasses import dataclass, field, asdict
 from typing import List, Dict, Any, Optional
-import hashlib, json, time
+import hashlib, json, math, time
 
-@dataclass
-class Signature:
+import numpy as np
+
+# Fixed-width numeric view of a Signature (Signature.vector / memory.sigstore):
+# column fractions padded/truncated to SIG_COLS, counts log1p-scaled so that cosine
+# and L1 distances are not dominated by table size.
+SIG_COLS = 8
+SIG_SCALARS = ("cols", "rows", "contact_cues", "period_cues",
+               "row_label_density", "linebreak_entropy", "proto_grid_score", "ocr_flag")
+SIG_DIM = 2 * SIG_COLS + len(SIG_SCALARS)
+
+@dataclass(frozen=True, slots=True)
+class _SignatureFields:
     page_no: int
     table_idx: int
     cols: int
@@ -21,7 +31,15 @@ class Signature:
     source_extractor: str = ""
     ocr_flag: bool = False
 
+class Signature(_SignatureFields):
+    # the id memo is an extra slot, not a field: asdict() / eq / repr never see it,
+    # and the fields are frozen, so it cannot go stale
+    __slots__ = ("_sid",)
+
     def id(self) -> str:
+        sid = getattr(self, "_sid", None)
+        if sid:
+            return sid
         s = json.dumps({
             "p": self.page_no, "i": self.table_idx, "c": self.cols, "r": self.rows,
             "nf": [round(x,3) for x in self.num_frac_per_col[:8]],
@@ -34,7 +52,22 @@ class Signature:
             "mh": self.minhash[:8],
             "se": self.source_extractor, "oc": self.ocr_flag
         }, sort_keys=True, ensure_ascii=False)
-        return hashlib.md5(s.encode("utf-8")).hexdigest()
+        sid = hashlib.md5(s.encode("utf-8")).hexdigest()
+        object.__setattr__(self, "_sid", sid)
+        return sid
+
+    def vector(self) -> np.ndarray:
+        """float32[SIG_DIM]: num fracs, alpha fracs (zero-padded), then SIG_SCALARS."""
+        v = np.zeros(SIG_DIM, dtype=np.float32)
+        nf = self.num_frac_per_col[:SIG_COLS]
+        af = self.alpha_frac_per_col[:SIG_COLS]
+        v[:len(nf)] = nf
+        v[SIG_COLS:SIG_COLS + len(af)] = af
+        v[2 * SIG_COLS:] = (math.log1p(self.cols), math.log1p(self.rows),
+                            math.log1p(self.contact_cues), math.log1p(self.period_cues),
+                            self.row_label_density, self.linebreak_entropy,
+                            self.proto_grid_score, float(self.ocr_flag))
+        return v
 
 @dataclass
 class RecipeRecord:
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Process-level cache of table-signature parts, shared by memory_layer._signature and
+matcher.compute_signature.
+
+A signature is assembled from parts that depend on different table fields:
+  - data parts (tabularity proxy, fill ratio, column fractions, ...) keyed by the
+    data rows' content
+  - text / header parts (anchor and KV counts, lexicon hits, header cues, MinHash)
+    keyed by the text or header tuple they are computed from
+A table seen again at a later Surgeon stage with only its headers changed reuses
+its data parts and recomputes the header-dependent ones. Keys are the content
+itself (tuples of cells), so a hit is exact, never a hash collision.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional, Sequence, Tuple
+
+_MAXSIZE = 2048
+_CACHE: "OrderedDict[Tuple[str, Hashable], Any]" = OrderedDict()
+
+def data_key(data: Sequence[Sequence[Any]]) -> Optional[Tuple[Tuple[Any, ...], ...]]:
+    """Hashable content key of the data rows; None when a cell is unhashable."""
+    try:
+        key = tuple(map(tuple, data))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+def headers_key(headers: Sequence[Any]) -> Optional[Tuple[Any, ...]]:
+    return data_key((headers,))
+
+def cached(part: str, key: Optional[Hashable], compute: Callable[[], Any]) -> Any:
+    """compute() memoized under (part, key); uncached when key is None."""
+    if key is None:
+        return compute()
+    k = (part, key)
+    hit = _CACHE.get(k, _CACHE)
+    if hit is not _CACHE:
+        _CACHE.move_to_end(k)
+        return hit
+    val = compute()
+    _CACHE[k] = val
+    if len(_CACHE) > _MAXSIZE:
+        _CACHE.popitem(last=False)
+    return val
+
+def clear() -> None:
+    _CACHE.clear()
+
+def parts() -> List[str]:
+    """Part names currently cached (diagnostics)."""
+    return sorted({p for p, _ in _CACHE})
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Array-backed store of table signatures for the learning loop.
+
+Each Signature is packed into one row of fixed-width arrays:
+  - features  float32[n, SIG_DIM]   Signature.vector() (fractions padded to 8, log1p counts)
+  - minhash   uint32[n, MH_PERMS]   header MinHash (values < 2^31), zeros when absent
+  - page_no / table_idx  int32[n]
+  - ids       S32[n]               Signature.id()
+Row norms are kept alongside so cosine queries are one matrix-vector product per
+chunk of rows. save(dir) writes one .npy per array; load(dir) memory-maps them
+read-only, and the first add() after a load copies into growable memory.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .matcher import MH_PERMS
+from .schemas import SIG_DIM, Signature
+
+_ARRAYS = ("features", "minhash", "page_no", "table_idx", "ids")
+_CHUNK = 65536  # rows scored per block, bounds the temporaries of a batch query
+
+class SignatureStore:
+    def __init__(self, capacity: int = 1024):
+        self._n = 0
+        self._alloc(max(1, int(capacity)))
+
+    def _alloc(self, cap: int) -> None:
+        old = getattr(self, "features", None)
+        arrays = {
+            "features": np.zeros((cap, SIG_DIM), dtype=np.float32),
+            "minhash": np.zeros((cap, MH_PERMS), dtype=np.uint32),
+            "page_no": np.zeros(cap, dtype=np.int32),
+            "table_idx": np.zeros(cap, dtype=np.int32),
+            "ids": np.zeros(cap, dtype="S32"),
+            "norms": np.zeros(cap, dtype=np.float32),
+        }
+        if old is not None:
+            for name, a in arrays.items():
+                a[:self._n] = getattr(self, name)[:self._n]
+        for name, a in arrays.items():
+            setattr(self, name, a)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def add(self, sig: Signature) -> int:
+        """Append one signature; returns its row."""
+        i = self._n
+        if i >= len(self.features) or not self.features.flags.writeable:
+            self._alloc(max(16, 2 * len(self.features)))
+        v = sig.vector()
+        self.features[i] = v
+        self.norms[i] = np.linalg.norm(v)
+        if len(sig.minhash) == MH_PERMS:
+            self.minhash[i] = sig.minhash
+        self.page_no[i] = sig.page_no
+        self.table_idx[i] = sig.table_idx
+        self.ids[i] = sig.id().encode("ascii")
+        self._n += 1
+        return i
+
+    def extend(self, sigs: Iterable[Signature]) -> None:
+        for s in sigs:
+            self.add(s)
+
+    def id_at(self, i: int) -> str:
+        return self.ids[i].decode("ascii")
+
+    # ---- nearest neighbours ----
+
+    def nearest(self, query: Union[Signature, np.ndarray], k: int = 5,
+                metric: str = "cosine") -> List[Tuple[int, float]]:
+        """[(row, score)] best first; score is cosine similarity or L1 distance."""
+        q = query.vector() if isinstance(query, Signature) else np.asarray(query, dtype=np.float32)
+        rows, scores = self.nearest_batch(q[None, :], k, metric)
+        return list(zip(rows[0].tolist(), scores[0].tolist()))
+
+    def nearest_batch(self, queries: np.ndarray, k: int = 5,
+                      metric: str = "cosine") -> Tuple[np.ndarray, np.ndarray]:
+        """(rows int64[m, k'], scores float32[m, k']) with k' = min(k, len(self))."""
+        if metric not in ("cosine", "l1"):
+            raise ValueError(f"unknown metric: {metric}")
+        Q = np.asarray(queries, dtype=np.float32).reshape(-1, SIG_DIM)
+        n, k = self._n, min(int(k), self._n)
+        if not n or k <= 0:
+            return np.zeros((len(Q), 0), dtype=np.int64), np.zeros((len(Q), 0), dtype=np.float32)
+        if metric == "cosine":
+            qn = np.linalg.norm(Q, axis=1)
+            qn[qn == 0] = 1.0
+            Q = Q / qn[:, None]
+        # distance-like key: smaller is better (negated similarity for cosine)
+        best_d = np.full((len(Q), 0), np.inf, dtype=np.float32)
+        best_i = np.zeros((len(Q), 0), dtype=np.int64)
+        for lo in range(0, n, _CHUNK):
+            hi = min(n, lo + _CHUNK)
+            F = self.features[lo:hi]
+            if metric == "cosine":
+                fn = self.norms[lo:hi].copy()
+                fn[fn == 0] = 1.0
+                d = -(Q @ F.T) / fn[None, :]
+            else:
+                # per query row so the temporary stays (chunk, SIG_DIM)
+                d = np.stack([np.abs(F - q).sum(axis=1) for q in Q])
+            d = np.concatenate([best_d, d.astype(np.float32)], axis=1)
+            ids = np.concatenate([best_i, np.broadcast_to(np.arange(lo, hi), (len(Q), hi - lo))], axis=1)
+            kk = min(k, d.shape[1])
+            part = np.argpartition(d, kk - 1, axis=1)[:, :kk] if d.shape[1] > kk else np.argsort(d, axis=1)
+            best_d = np.take_along_axis(d, part, axis=1)
+            best_i = np.take_along_axis(ids, part, axis=1)
+        order = np.argsort(best_d, axis=1, kind="stable")
+        best_d = np.take_along_axis(best_d, order, axis=1)
+        best_i = np.take_along_axis(best_i, order, axis=1)
+        return best_i, (-best_d if metric == "cosine" else best_d)
+
+    def nearest_minhash(self, minhash: List[int], k: int = 5) -> List[Tuple[int, float]]:
+        """[(row, estimated header Jaccard)] best first, over rows that carry a MinHash."""
+        if len(minhash) != MH_PERMS or not self._n:
+            return []
+        M = self.minhash[:self._n]
+        est = np.count_nonzero(M == np.asarray(minhash, dtype=np.uint32), axis=1) / MH_PERMS
+        est[~M.any(axis=1)] = 0.0
+        k = min(int(k), self._n)
+        top = np.argsort(-est, kind="stable")[:k]
+        return [(int(i), float(est[i])) for i in top]
+
+    # ---- persistence ----
+
+    def save(self, path: Union[str, Path]) -> None:
+        d = Path(path)
+        d.mkdir(parents=True, exist_ok=True)
+        # tmp + os.replace: the arrays may be memory-mapped from these very files (load)
+        for name in _ARRAYS:
+            tmp = d / f"{name}.npy.tmp"
+            with tmp.open("wb") as f:
+                np.save(f, getattr(self, name)[:self._n])
+            os.replace(tmp, d / f"{name}.npy")
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "SignatureStore":
+        """Store over the arrays in path; memory-mapped read-only unless mmap=False."""
+        d = Path(path)
+        st = cls.__new__(cls)
+        mode: Optional[str] = "r" if mmap else None
+        arrays: Dict[str, np.ndarray] = {name: np.load(d / f"{name}.npy", mmap_mode=mode) for name in _ARRAYS}
+        for name, a in arrays.items():
+            setattr(st, name, a)
+        st._n = len(arrays["features"])
+        norms = np.empty(st._n, dtype=np.float32)
+        for lo in range(0, st._n, _CHUNK):
+            norms[lo:lo + _CHUNK] = np.linalg.norm(arrays["features"][lo:lo + _CHUNK], axis=1)
+        st.norms = norms
+        return st
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Embedded SQLite store for learned patterns, recipe stats and bandit arms.
+
+memory_layer reads it in place of patterns.jsonl when learning.patterns_path ends in
+.db / .sqlite / .sqlite3. Several Surgeon workers can share one file:
+  - WAL journal, so readers never block the writer; busy_timeout for writer contention
+  - counters (recipe stats, bandit arms) are single UPSERT statements, so concurrent
+    increments from different processes are never lost
+  - every pattern write bumps meta.rev in the same transaction; readers poll that
+    integer instead of re-reading the patterns
+
+Patterns keep their JSON body verbatim (export round-trips the baselines); family,
+table_type and the (table_type, page_band) buckets the precondition index uses are
+broken out into indexed columns. import_jsonl() accepts one object per line as well
+as objects spanning several lines (baselines/patterns_phase1B.jsonl has one).
+"""
+from __future__ import annotations
+
+import hashlib, json, os, sqlite3, threading, time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+_BANDS = ("front", "mid", "back")
+_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta(k, v) VALUES ('rev', 0);
+CREATE TABLE IF NOT EXISTS patterns (
+    id TEXT PRIMARY KEY,
+    ord INTEGER NOT NULL,
+    family TEXT NOT NULL,
+    table_type TEXT,
+    enabled INTEGER NOT NULL DEFAULT 1,
+    body TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS patterns_family ON patterns(family, ord);
+CREATE TABLE IF NOT EXISTS pattern_buckets (
+    pattern_id TEXT NOT NULL REFERENCES patterns(id) ON DELETE CASCADE,
+    table_type TEXT NOT NULL,
+    band TEXT NOT NULL,
+    PRIMARY KEY (table_type, band, pattern_id)
+);
+CREATE INDEX IF NOT EXISTS pattern_buckets_id ON pattern_buckets(pattern_id);
+CREATE TABLE IF NOT EXISTS recipe_stats (
+    family TEXT NOT NULL,
+    recipe TEXT NOT NULL,
+    trials INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    gain_sum REAL NOT NULL DEFAULT 0,
+    guard_failures INTEGER NOT NULL DEFAULT 0,
+    last_success REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (family, recipe)
+);
+CREATE TABLE IF NOT EXISTS bandit_arms (
+    family TEXT NOT NULL,
+    op TEXT NOT NULL,
+    trials INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    gain_sum REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (family, op)
+);
+"""
+
+def is_store_path(path: Union[str, Path]) -> bool:
+    return Path(path).suffix.lower() in _SUFFIXES
+
+def pattern_family(p: Dict[str, Any]) -> str:
+    return (p.get("family") or str(p.get("id") or "").split(".")[0]).upper()
+
+def pattern_id(p: Dict[str, Any]) -> str:
+    if p.get("id"):
+        return str(p["id"])
+    body = json.dumps(p, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return f"{pattern_family(p)}.{hashlib.md5(body).hexdigest()[:10]}"
+
+def recipe_key(recipe: Dict[str, Any]) -> str:
+    return json.dumps(recipe.get("ops", []), sort_keys=True, separators=(",", ":"))
+
+def _as_list(v: Any) -> List[str]:
+    if v is None:
+        return []
+    return [str(x) for x in (v if isinstance(v, (list, tuple, set)) else [v])]
+
+def _buckets(p: Dict[str, Any]) -> List[Tuple[str, str]]:
+    sig = p.get("signature") or {}
+    types = _as_list(sig.get("table_type")) or ["*"]
+    bands = [b for b in _as_list(sig.get("page_band")) if b in _BANDS] or list(_BANDS)
+    return [(t, b) for t in types for b in bands]
+
+def iter_json_objects(text: str) -> Iterator[Dict[str, Any]]:
+    """JSON objects in a JSONL-ish text; an object may span lines, unparsable lines are skipped."""
+    dec = json.JSONDecoder()
+    i, n = 0, len(text)
+    while i < n:
+        while i < n and text[i].isspace():
+            i += 1
+        if i >= n:
+            break
+        try:
+            obj, i = dec.raw_decode(text, i)
+        except ValueError:
+            nl = text.find("\n", i)
+            i = n if nl < 0 else nl + 1
+            continue
+        if isinstance(obj, dict):
+            yield obj
+
+class PatternStore:
+    def __init__(self, path: Union[str, Path], timeout_s: float = 30.0):
+        self.path = Path(path)
+        self.timeout_s = float(timeout_s)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = -1
+
+    # ---- connection ----
+
+    def _db(self) -> sqlite3.Connection:
+        # a connection must not cross fork(); each process opens its own
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=self.timeout_s, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute(f"PRAGMA busy_timeout={int(self.timeout_s * 1000)}")
+            conn.executescript(_SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    def _write(self, fn) -> Any:
+        """Run fn(conn) in one IMMEDIATE transaction (takes the write lock up front)."""
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn(db)
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+            return out
+
+    def revision(self) -> int:
+        """Bumped by every pattern write; cheap change detection for cached readers."""
+        with self._lock:
+            return int(self._db().execute("SELECT v FROM meta WHERE k='rev'").fetchone()[0])
+
+    # ---- patterns ----
+
+    def upsert_patterns(self, patterns: Iterable[Dict[str, Any]], replace: bool = False) -> int:
+        """Insert or update patterns by id (appended after the existing order); replace=True clears first."""
+        pats = list(patterns)
+        def fn(db: sqlite3.Connection) -> int:
+            if replace:
+                db.execute("DELETE FROM patterns")
+            ord0 = db.execute("SELECT COALESCE(MAX(ord), -1) + 1 FROM patterns").fetchone()[0]
+            now = time.time()
+            for k, p in enumerate(pats):
+                pid = pattern_id(p)
+                row = db.execute("SELECT ord FROM patterns WHERE id=?", (pid,)).fetchone()
+                sig = p.get("signature") or {}
+                db.execute(
+                    "INSERT INTO patterns(id, ord, family, table_type, enabled, body, updated) VALUES (?,?,?,?,?,?,?) "
+                    "ON CONFLICT(id) DO UPDATE SET family=excluded.family, table_type=excluded.table_type, "
+                    "enabled=excluded.enabled, body=excluded.body, updated=excluded.updated",
+                    (pid, row[0] if row else ord0 + k, pattern_family(p),
+                     ",".join(_as_list(sig.get("table_type"))) or None,
+                     int(bool(p.get("enabled", True))), json.dumps(p, ensure_ascii=False), now))
+                db.execute("DELETE FROM pattern_buckets WHERE pattern_id=?", (pid,))
+                db.executemany("INSERT OR IGNORE INTO pattern_buckets(pattern_id, table_type, band) VALUES (?,?,?)",
+                               [(pid, t, b) for t, b in _buckets(p)])
+            db.execute("UPDATE meta SET v = v + 1 WHERE k='rev'")
+            return len(pats)
+        return self._write(fn)
+
+    def set_enabled(self, pid: str, enabled: bool) -> None:
+        def fn(db: sqlite3.Connection) -> None:
+            row = db.execute("SELECT body FROM patterns WHERE id=?", (pid,)).fetchone()
+            if row is None:
+                raise KeyError(pid)
+            body = dict(json.loads(row[0]), enabled=bool(enabled))
+            db.execute("UPDATE patterns SET enabled=?, body=?, updated=? WHERE id=?",
+                       (int(bool(enabled)), json.dumps(body, ensure_ascii=False), time.time(), pid))
+            db.execute("UPDATE meta SET v = v + 1 WHERE k='rev'")
+        self._write(fn)
+
+    def _select(self, sql: str, args: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [json.loads(b) for (b,) in self._db().execute(sql, args).fetchall()]
+
+    def patterns(self, enabled_only: bool = False) -> List[Dict[str, Any]]:
+        """All patterns in store order (the order the JSONL file would list them)."""
+        where = " WHERE enabled=1" if enabled_only else ""
+        return self._select(f"SELECT body FROM patterns{where} ORDER BY ord")
+
+    def by_family(self, family: str, enabled_only: bool = True) -> List[Dict[str, Any]]:
+        extra = " AND enabled=1" if enabled_only else ""
+        return self._select(f"SELECT body FROM patterns WHERE family=?{extra} ORDER BY ord", (family.upper(),))
+
+    def by_bucket(self, table_type: Optional[str], band: str) -> List[Dict[str, Any]]:
+        """Enabled patterns whose table_type / page_band preconditions admit (table_type, band)."""
+        return self._select(
+            "SELECT p.body FROM pattern_buckets b JOIN patterns p ON p.id = b.pattern_id "
+            "WHERE b.band=? AND b.table_type IN (?, '*') AND p.enabled=1 GROUP BY p.id ORDER BY p.ord",
+            (band, str(table_type)))
+
+    # ---- counters ----
+
+    def bump_recipe(self, family: str, recipe: Union[str, Dict[str, Any]], gain: float, win: bool,
+                    guard_ok: bool = True) -> None:
+        key = recipe if isinstance(recipe, str) else recipe_key(recipe)
+        self._write(lambda db: db.execute(
+            "INSERT INTO recipe_stats(family, recipe, trials, wins, gain_sum, guard_failures, last_success) "
+            "VALUES (?,?,1,?,?,?,?) ON CONFLICT(family, recipe) DO UPDATE SET trials=trials+1, "
+            "wins=wins+excluded.wins, gain_sum=gain_sum+excluded.gain_sum, "
+            "guard_failures=guard_failures+excluded.guard_failures, "
+            "last_success=MAX(last_success, excluded.last_success)",
+            (family, key, int(bool(win)), float(gain), int(not guard_ok), time.time() if win else 0.0)))
+
+    def recipe_stats(self, family: Optional[str] = None) -> List[Dict[str, Any]]:
+        sql = "SELECT family, recipe, trials, wins, gain_sum, guard_failures, last_success FROM recipe_stats"
+        args: Tuple[Any, ...] = ()
+        if family is not None:
+            sql, args = sql + " WHERE family=?", (family,)
+        with self._lock:
+            rows = self._db().execute(sql + " ORDER BY family, recipe", args).fetchall()
+        return [{"family": f, "ops": json.loads(r), "trials": t, "wins": w,
+                 "win_rate": (w / t) if t else 0.0, "avg_gain": (g / t) if t else 0.0,
+                 "guard_failures": gf, "last_success": ls}
+                for f, r, t, w, g, gf, ls in rows]
+
+    def update_arm(self, family: str, op: str, gain: float, win: bool) -> None:
+        self._write(lambda db: db.execute(
+            "INSERT INTO bandit_arms(family, op, trials, wins, gain_sum) VALUES (?,?,1,?,?) "
+            "ON CONFLICT(family, op) DO UPDATE SET trials=trials+1, wins=wins+excluded.wins, "
+            "gain_sum=gain_sum+excluded.gain_sum",
+            (family, op, int(bool(win)), float(gain))))
+
+    def arms(self, family: str) -> Dict[str, Dict[str, float]]:
+        """{op: {"trials", "wins", "avg_gain"}} (policy.ContextualBandit's arm layout)."""
+        with self._lock:
+            rows = self._db().execute("SELECT op, trials, wins, gain_sum FROM bandit_arms WHERE family=?",
+                                      (family,)).fetchall()
+        return {op: {"trials": float(t), "wins": float(w), "avg_gain": (g / t) if t else 0.0}
+                for op, t, w, g in rows}
+
+    # ---- JSONL interchange ----
+
+    def import_jsonl(self, path: Union[str, Path], replace: bool = False) -> int:
+        return self.upsert_patterns(iter_json_objects(Path(path).read_text(encoding="utf-8")), replace=replace)
+
+    def export_jsonl(self, path: Union[str, Path], with_stats: bool = False) -> int:
+        """One pattern per line, store order; with_stats adds a "stats" list from recipe_stats."""
+        pats = self.patterns()
+        stats: Dict[str, List[Dict[str, Any]]] = {}
+        if with_stats:
+            for s in self.recipe_stats():
+                stats.setdefault(s["family"], []).append(s)
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tmp = out.with_name(out.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for p in pats:
+                if with_stats and stats.get(pattern_family(p)):
+                    p = dict(p, stats=stats[pattern_family(p)])
+                f.write(json.dumps(p, ensure_ascii=False) + "\n")
+        os.replace(tmp, out)
+        return len(pats)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    ap = argparse.ArgumentParser(description="Phoenix pattern store (SQLite) import / export")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    imp = sub.add_parser("import", help="load a patterns JSONL into the store")
+    imp.add_argument("jsonl")
+    imp.add_argument("db")
+    imp.add_argument("--replace", action="store_true", help="drop existing patterns first")
+    exp = sub.add_parser("export", help="write the store's patterns as JSONL")
+    exp.add_argument("db")
+    exp.add_argument("jsonl")
+    exp.add_argument("--with-stats", action="store_true")
+    args = ap.parse_args(argv)
+    store = PatternStore(args.db)
+    if args.cmd == "import":
+        n = store.import_jsonl(args.jsonl, replace=args.replace)
+        print(json.dumps({"imported": n, "db": args.db, "revision": store.revision()}))
+    else:
+        n = store.export_jsonl(args.jsonl, with_stats=args.with_stats)
+        print(json.dumps({"exported": n, "jsonl": args.jsonl}))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
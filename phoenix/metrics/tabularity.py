@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tabularity / column-purity kernel shared by the Surgeon, memory layer, Spotter,
+SVR and validator.
+
+A table is scored from two boolean cell masks (non-empty, numeric) reduced per
+column with NumPy:
+  purity(col)  = max(f, 1-f), f = numeric / non-empty cells (0 for an empty column)
+  purity       = mean purity over all columns
+  width        = 1 when the table has >=2 columns and some column has purity > 0.7
+  label_signal = 1 - 0.5 * distinct/total over non-empty first-column cells
+
+Each caller keeps its historical formula as a named Weighting, so scores are
+reproduced exactly:
+  "surgeon"              0.5*purity + 0.3*label_signal + 0.2*width        (unrounded)
+  "memory"               0.7*purity + 0.3*width, rounded to 3 places
+  "svr" / "spotter" /
+  "validator"            same as "memory", but a backtick also counts as numeric
+
+tabularity_batch() scores many tables with one pass over all of their cells;
+tabularity_numeric_batch() also returns each table's numeric cell count from it.
+"""
+from __future__ import annotations
+
+import itertools, re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+NUMERIC_RE          = re.compile(r"[0-9,.\-()%₹]+")
+NUMERIC_BACKTICK_RE = re.compile(r"[0-9,.\-()%₹`]+")
+_WS_RE = re.compile(r"\s+")
+
+@dataclass(frozen=True)
+class Weighting:
+    numeric_re: "re.Pattern[str]"
+    purity: float
+    width: float
+    label: float = 0.0
+    ndigits: Optional[int] = None
+
+WEIGHTINGS: Dict[str, Weighting] = {
+    "surgeon":   Weighting(NUMERIC_RE, purity=0.5, width=0.2, label=0.3),
+    "memory":    Weighting(NUMERIC_RE, purity=0.7, width=0.3, ndigits=3),
+    "svr":       Weighting(NUMERIC_BACKTICK_RE, purity=0.7, width=0.3, ndigits=3),
+    "spotter":   Weighting(NUMERIC_BACKTICK_RE, purity=0.7, width=0.3, ndigits=3),
+    "validator": Weighting(NUMERIC_BACKTICK_RE, purity=0.7, width=0.3, ndigits=3),
+}
+
+def _stripped(cells: List[Any]) -> List[str]:
+    try:
+        return list(map(str.strip, cells))
+    except TypeError:  # None / numbers mixed in
+        return [("" if c is None else str(c)).strip() for c in cells]
+
+def _grid_counts(tables: Sequence[Sequence[Sequence[Any]]], numeric_re: "re.Pattern[str]"
+                 ) -> Tuple[List[int], np.ndarray, np.ndarray]:
+    """
+    Per-column (non_empty, numeric) counts for every table in one vectorized pass.
+    Returns (n_cols per table, non_empty, numeric) where the count arrays hold the
+    columns of all tables back to back.
+    """
+    n_cols = [max(map(len, rows), default=0) for rows in tables]
+    if len(tables) == 1:
+        return n_cols, *_single_counts(tables[0], n_cols[0], numeric_re)
+    col_base = np.zeros(len(tables), dtype=np.int64)
+    col_base[1:] = np.cumsum(n_cols[:-1])
+    total_cols = int(sum(n_cols))
+    flat: List[Any] = []
+    row_lens: List[int] = []
+    row_base: List[int] = []
+    for t, rows in enumerate(tables):
+        base = int(col_base[t])
+        for r in rows:
+            flat.extend(r)
+            row_lens.append(len(r))
+            row_base.append(base)
+    if not flat:
+        zeros = np.zeros(total_cols, dtype=np.int64)
+        return n_cols, zeros, zeros.copy()
+
+    lens = np.asarray(row_lens, dtype=np.int64)
+    starts = np.cumsum(lens) - lens
+    # column slot of every cell: table base + position within its row
+    slot = np.arange(len(flat), dtype=np.int64) - np.repeat(starts, lens) + np.repeat(np.asarray(row_base, dtype=np.int64), lens)
+
+    cells = _stripped(flat)
+    non_empty = np.fromiter(map(len, cells), dtype=np.int64, count=len(cells)) > 0
+    numeric = np.fromiter(map(bool, map(numeric_re.fullmatch, cells)), dtype=bool, count=len(cells))
+    ne = np.bincount(slot[non_empty], minlength=total_cols)
+    num = np.bincount(slot[numeric & non_empty], minlength=total_cols)
+    return n_cols, ne, num
+
+def _single_counts(rows: Sequence[Sequence[Any]], n_cols: int, numeric_re: "re.Pattern[str]") -> Tuple[np.ndarray, np.ndarray]:
+    # one table: pad ragged rows to a (rows x cols) grid and reduce the masks along axis 0
+    flat: List[Any] = []
+    for r in rows:
+        flat.extend(r)
+        if len(r) < n_cols:
+            flat.extend([""] * (n_cols - len(r)))
+    if not flat:
+        zeros = np.zeros(n_cols, dtype=np.int64)
+        return zeros, zeros.copy()
+    cells = _stripped(flat)
+    non_empty = np.fromiter(map(len, cells), dtype=np.int64, count=len(cells)).reshape(-1, n_cols) > 0
+    numeric = np.fromiter(map(bool, map(numeric_re.fullmatch, cells)), dtype=bool, count=len(cells)).reshape(-1, n_cols)
+    return non_empty.sum(axis=0), (numeric & non_empty).sum(axis=0)
+
+def _column_major_counts(columns: Sequence[Sequence[Any]], numeric_re: "re.Pattern[str]") -> Tuple[np.ndarray, np.ndarray]:
+    # equal-length columns: the flat cell list reshapes to (cols x rows) without padding
+    n_cols = len(columns)
+    flat = list(itertools.chain.from_iterable(columns))
+    if not flat:
+        zeros = np.zeros(n_cols, dtype=np.int64)
+        return zeros, zeros.copy()
+    cells = _stripped(flat)
+    non_empty = np.fromiter(map(len, cells), dtype=np.int64, count=len(cells)).reshape(n_cols, -1) > 0
+    numeric = np.fromiter(map(bool, map(numeric_re.fullmatch, cells)), dtype=bool, count=len(cells)).reshape(n_cols, -1)
+    return non_empty.sum(axis=1), (numeric & non_empty).sum(axis=1)
+
+def column_purity(non_empty: np.ndarray, numeric: np.ndarray) -> np.ndarray:
+    """max(f, 1-f) per column with f = numeric/non-empty; empty columns score 0."""
+    ne = np.asarray(non_empty)
+    frac = np.asarray(numeric) / np.maximum(ne, 1)
+    return np.where(ne > 0, np.maximum(frac, 1.0 - frac), 0.0)
+
+def column_counts(rows: Sequence[Sequence[Any]], weighting: str = "surgeon") -> Tuple[np.ndarray, np.ndarray]:
+    """(non_empty, numeric) cell counts per column of one table."""
+    _, ne, num = _grid_counts([rows], WEIGHTINGS[weighting].numeric_re)
+    return ne, num
+
+def column_counts_cm(columns: Sequence[Sequence[Any]], weighting: str = "surgeon") -> Tuple[np.ndarray, np.ndarray]:
+    """column_counts() for a table already held column-major (columns of equal length)."""
+    return _column_major_counts(columns, WEIGHTINGS[weighting].numeric_re)
+
+def _label_signal(rows: Sequence[Sequence[Any]]) -> float:
+    left = [_WS_RE.sub(" ", str(r[0]).strip()) for r in rows if r and r[0]]
+    left = [c for c in left if c]
+    label_diversity = len(set(left))/max(1, len(left))
+    return 1 - min(1.0, label_diversity) * 0.5
+
+def score_from_purity(col_scores: List[float], n_cols: int, weighting: str, rows: Sequence[Sequence[Any]] = ()) -> float:
+    """Combine per-column purities into a tabularity score under a named weighting."""
+    w = WEIGHTINGS[weighting]
+    if n_cols <= 1:
+        return 0.0
+    # builtin sum on purpose: it is what every caller used, so scores stay bit-identical
+    purity = sum(col_scores)/len(col_scores)
+    width = 1.0 if (n_cols >= 2 and any(f > 0.7 for f in col_scores)) else 0.0
+    if w.label:
+        score = w.purity*purity + w.label*_label_signal(rows) + w.width*width
+    else:
+        score = w.purity*purity + w.width*width
+    return round(score, w.ndigits) if w.ndigits is not None else score
+
+def tabularity(rows: Sequence[Sequence[Any]], weighting: str = "surgeon") -> float:
+    """Tabularity of one table (list of rows of cells)."""
+    if not rows or max(map(len, rows), default=0) <= 1:
+        return 0.0
+    return tabularity_batch([rows], weighting)[0]
+
+def tabularity_batch(tables: Sequence[Sequence[Sequence[Any]]], weighting: str = "surgeon") -> List[float]:
+    """Tabularity of every table; all cells are classified in a single pass."""
+    return [score for score, _ in tabularity_numeric_batch(tables, weighting)]
+
+def tabularity_numeric_batch(tables: Sequence[Sequence[Sequence[Any]]], weighting: str = "surgeon"
+                             ) -> List[Tuple[float, int]]:
+    """(tabularity, numeric cell count) of every table, from the same single classification pass."""
+    if not tables:
+        return []
+    n_cols, ne, num = _grid_counts(tables, WEIGHTINGS[weighting].numeric_re)
+    purity = column_purity(ne, num).tolist()
+    num_l = num.tolist()
+    out: List[Tuple[float, int]] = []
+    pos = 0
+    for rows, c in zip(tables, n_cols):
+        out.append((score_from_purity(purity[pos:pos + c], c, weighting, rows) if rows else 0.0,
+                    sum(num_l[pos:pos + c])))
+        pos += c
+    return out
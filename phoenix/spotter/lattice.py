@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lattice-mode Spotter: ruled tables from line / rect primitives.
+
+Input is what pdfplumber exposes per page: `page.lines` and `page.rects` dicts with
+x0, x1, top, bottom (PDF points, top-down y), plus the page's words (spotter_heuristic
+WORD_DTYPE array + texts, optional).
+  1. edges: lines become horizontal / vertical segments; a thin rect is one rule, any
+     other rect contributes its four sides.
+  2. snap + join: segments within `snap` of each other are moved to their cluster's
+     mean coordinate; collinear pieces that overlap or touch within `join` are merged.
+  3. intersections: verticals sorted by x, each horizontal binary-searches the x range
+     it spans and keeps the verticals whose y extent covers it, O((n + k) log n) for
+     k crossings, no all-pairs test.
+  4. tables: connected components of crossing segments (min-label propagation); a
+     component whose distinct x / y coordinates form >= 2 cells (>= 2 of one and
+     >= 3 of the other) is a table with those grid lines.
+  5. cells: each word lands in the cell holding its centre; a cell's words are joined
+     in reading order, lines separated by "\\n" like the legacy extractor.
+Tables come out in the legacy table schema ({page_number, table_data: [{"col_i": ...}],
+rows, cols}) plus bbox / xs / ys, ready for Surgeon.preprocess_table.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SNAP_TOLERANCE = 3.0
+JOIN_TOLERANCE = 3.0
+LINE_TOLERANCE = 3.0  # words of one cell further apart in y start a new text line
+
+# (coordinate, lo, hi): y, x0, x1 for horizontals; x, top, bottom for verticals
+_SEG_DTYPE = np.dtype([("c", "f8"), ("lo", "f8"), ("hi", "f8")])
+
+def edges(lines: Sequence[Dict[str, Any]], rects: Sequence[Dict[str, Any]] = (),
+          thin: float = 2 * SNAP_TOLERANCE) -> Tuple[np.ndarray, np.ndarray]:
+    """(horizontal, vertical) _SEG_DTYPE segments of pdfplumber-shaped lines and rects."""
+    hs: List[Tuple[float, float, float]] = []
+    vs: List[Tuple[float, float, float]] = []
+    for o in lines:
+        x0, x1, top, bottom = float(o["x0"]), float(o["x1"]), float(o["top"]), float(o["bottom"])
+        if x1 - x0 >= bottom - top:
+            hs.append(((top + bottom) / 2, x0, x1))
+        else:
+            vs.append(((x0 + x1) / 2, top, bottom))
+    for o in rects:
+        x0, x1, top, bottom = float(o["x0"]), float(o["x1"]), float(o["top"]), float(o["bottom"])
+        if bottom - top <= thin and x1 - x0 > thin:
+            hs.append(((top + bottom) / 2, x0, x1))
+        elif x1 - x0 <= thin and bottom - top > thin:
+            vs.append(((x0 + x1) / 2, top, bottom))
+        elif x1 - x0 > thin:
+            hs += [(top, x0, x1), (bottom, x0, x1)]
+            vs += [(x0, top, bottom), (x1, top, bottom)]
+    return np.array(hs, dtype=_SEG_DTYPE), np.array(vs, dtype=_SEG_DTYPE)
+
+def snap_join(segs: np.ndarray, snap: float = SNAP_TOLERANCE, join: float = JOIN_TOLERANCE) -> np.ndarray:
+    """Cluster segments by coordinate (gap > snap splits), then merge overlapping runs in each cluster."""
+    if len(segs) < 2:
+        return segs.copy()
+    s = segs[np.argsort(segs["c"], kind="stable")]
+    cl = np.concatenate(([0], np.cumsum(np.diff(s["c"]) > snap)))
+    c = (np.bincount(cl, weights=s["c"]) / np.bincount(cl))[cl]
+    o = np.lexsort((s["lo"], cl))
+    cl, c, lo, hi = cl[o], c[o], s["lo"][o], s["hi"][o]
+    # running max of hi per cluster: offset clusters so a global cummax never crosses one
+    span = float(hi.max() - lo.min()) + 2 * join + 1.0
+    reach = np.maximum.accumulate(hi + cl * span) - cl * span
+    start = np.ones(len(lo), dtype=bool)
+    start[1:] = (cl[1:] != cl[:-1]) | (lo[1:] > reach[:-1] + join)
+    at = np.flatnonzero(start)
+    out = np.zeros(len(at), dtype=_SEG_DTYPE)
+    out["c"] = c[at]
+    out["lo"] = np.minimum.reduceat(lo, at)
+    out["hi"] = np.maximum.reduceat(hi, at)
+    return out
+
+def intersections(h: np.ndarray, v: np.ndarray, tol: float = JOIN_TOLERANCE) -> Tuple[np.ndarray, np.ndarray]:
+    """(h index, v index) of every crossing / touching pair; verticals are searched by sorted x."""
+    if not len(h) or not len(v):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    vo = np.argsort(v["c"], kind="stable")
+    vx = v["c"][vo]
+    first = np.searchsorted(vx, h["lo"] - tol, "left")
+    last = np.searchsorted(vx, h["hi"] + tol, "right")
+    n = np.maximum(last - first, 0)
+    hi_idx = np.repeat(np.arange(len(h)), n)
+    pos = np.arange(int(n.sum())) - np.repeat(np.cumsum(n) - n, n) + np.repeat(first, n)
+    vi_idx = vo[pos]
+    y = h["c"][hi_idx]
+    keep = (v["lo"][vi_idx] - tol <= y) & (y <= v["hi"][vi_idx] + tol)
+    return hi_idx[keep], vi_idx[keep]
+
+def _components(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Component label (smallest member) of each of n nodes joined by edges a-b."""
+    lab = np.arange(n)
+    while True:
+        m = np.minimum(lab[a], lab[b])
+        new = lab.copy()
+        np.minimum.at(new, a, m)
+        np.minimum.at(new, b, m)
+        new = new[new]  # pointer jumping
+        if np.array_equal(new, lab):
+            return lab
+        lab = new
+
+def _grid_lines(cs: np.ndarray, tol: float) -> np.ndarray:
+    cs = np.sort(cs)
+    keep = np.ones(len(cs), dtype=bool)
+    keep[1:] = np.diff(cs) > tol
+    return cs[keep]
+
+def _cell_texts(words: np.ndarray, texts: Sequence[str], xs: np.ndarray, ys: np.ndarray) -> List[List[str]]:
+    n_rows, n_cols = len(ys) - 1, len(xs) - 1
+    grid = [[""] * n_cols for _ in range(n_rows)]
+    if not len(words):
+        return grid
+    cx = words["x"] + words["w"] / 2
+    cy = words["y"] + words["h"] / 2
+    inside = (cx >= xs[0]) & (cx <= xs[-1]) & (cy >= ys[0]) & (cy <= ys[-1])
+    w = words[inside]
+    if not len(w):
+        return grid
+    col = np.clip(np.searchsorted(xs, cx[inside], "right") - 1, 0, n_cols - 1)
+    row = np.clip(np.searchsorted(ys, cy[inside], "right") - 1, 0, n_rows - 1)
+    cell = row * n_cols + col
+    o = np.lexsort((w["x"], w["y"], cell))
+    cell, y = cell[o], w["y"][o]
+    new_cell = np.ones(len(o), dtype=bool)
+    new_cell[1:] = cell[1:] != cell[:-1]
+    newline = np.zeros(len(o), dtype=bool)
+    newline[1:] = ~new_cell[1:] & (np.abs(y[1:] - y[:-1]) > LINE_TOLERANCE)
+    tx = [texts[i] for i in w["text"][o].tolist()]
+    bounds = np.append(np.flatnonzero(new_cell), len(o)).tolist()
+    nl = newline.tolist()
+    cells = cell.tolist()
+    for s, e in zip(bounds, bounds[1:]):
+        parts = [tx[s]]
+        for k in range(s + 1, e):
+            parts.append("\n" if nl[k] else " ")
+            parts.append(tx[k])
+        r, c = divmod(cells[s], n_cols)
+        grid[r][c] = "".join(parts)
+    return grid
+
+def lattice_tables(page_number: int, lines: Sequence[Dict[str, Any]], rects: Sequence[Dict[str, Any]] = (),
+                   words: Optional[np.ndarray] = None, texts: Sequence[str] = (),
+                   snap: float = SNAP_TOLERANCE, join: float = JOIN_TOLERANCE) -> List[Dict[str, Any]]:
+    """Ruled tables of one page, top to bottom, in the legacy table schema (+ bbox, xs, ys)."""
+    h, v = edges(lines, rects)
+    h, v = snap_join(h, snap, join), snap_join(v, snap, join)
+    hi, vi = intersections(h, v, join)
+    if not len(hi):
+        return []
+    lab = _components(len(h) + len(v), hi, vi + len(h))
+    hl, vl = lab[:len(h)], lab[len(h):]
+    if words is not None and len(words) and "page" in (words.dtype.names or ()):
+        words = words[words["page"] == page_number]
+    tables = []
+    for comp in np.unique(lab[hi]):
+        xs = _grid_lines(v["c"][vl == comp], snap)
+        ys = _grid_lines(h["c"][hl == comp], snap)
+        if len(xs) < 2 or len(ys) < 2 or (len(xs) < 3 and len(ys) < 3):
+            continue  # a lone box (boxed paragraph, page border) is one cell, not a table
+        grid = _cell_texts(words if words is not None else np.zeros(0), texts, xs, ys)
+        tables.append({
+            "page_number": page_number,
+            "table_data": [{f"col_{j}": cell for j, cell in enumerate(row)} for row in grid],
+            "rows": len(grid),
+            "cols": len(xs) - 1,
+            "bbox": [float(xs[0]), float(ys[0]), float(xs[-1]), float(ys[-1])],
+            "xs": xs.tolist(),
+            "ys": ys.tolist(),
+            "source_extractor": "lattice",
+        })
+    tables.sort(key=lambda t: (t["bbox"][1], t["bbox"][0]))
+    return tables
+
+def lattice_document(pages: Iterable[Tuple[int, Sequence[Dict[str, Any]], Sequence[Dict[str, Any]]]],
+                     words: Optional[np.ndarray] = None, texts: Sequence[str] = ()) -> List[Dict[str, Any]]:
+    """lattice_tables over (page_number, lines, rects) pages sharing one document word array."""
+    out: List[Dict[str, Any]] = []
+    if words is not None and len(words):
+        words = words[np.argsort(words["page"], kind="stable")]
+    for page_number, lines, rects in pages:
+        pw = None
+        if words is not None and len(words):
+            lo, hi = np.searchsorted(words["page"], [page_number, page_number + 1])
+            pw = words[lo:hi]
+        out += lattice_tables(page_number, lines, rects, pw, texts)
+    return out
@@ -4,75 +4,181 @@
 Phoenix Heuristic Spotter (stub/MVP)
 - For PDFs with word coordinates, groups lines by Y, merges into regions by X-span IoU,
   then emits candidate boxes. Gate candidates with tabularity_score before passing to Surgeon.
+- Batch API for whole documents: words_array() packs every page's words into one
+  WORD_DTYPE array; propose_regions_batch() sorts it once by (page, y, x), finds line
+  breaks and line / region extents with NumPy, and returns REGION_DTYPE boxes tagged
+  with their page. Only the region merge (a running X-span intersection over lines) is
+  a scalar scan over lines, cheaper than shipping them to worker processes; document
+  level parallelism is per page chunk in phoenix.ingest.pdf_ingest.
 """
-import argparse, json, re
+import argparse, importlib, importlib.util, json, re, sys
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+def _shared_module(name: str):
+    """Import phoenix.<name>, or load it from its file when run as a plain script (root not on sys.path)."""
+    try:
+        return importlib.import_module(f"phoenix.{name}")
+    except ImportError:
+        qual = f"phoenix.{name}"
+        if qual in sys.modules:
+            return sys.modules[qual]
+        path = Path(__file__).resolve().parents[1].joinpath(*name.split(".")).with_suffix(".py")
+        spec = importlib.util.spec_from_file_location(qual, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[qual] = mod
+        spec.loader.exec_module(mod)
+        return mod
+
+_tabularity = _shared_module("metrics.tabularity")
 
 def tabularity_score(rows: List[List[str]]) -> float:
-    if not rows: return 0.0
-    cols = max((len(r) for r in rows), default=0)
-    if cols <= 1: return 0.0
-    def isnum(v: str) -> bool: return bool(re.match(r"^[0-9,.\-\(\)%₹`]+$", (v or "").strip()))
-    col_scores = []
-    for j in range(cols):
-        vals = [r[j] for r in rows if j < len(r) and (r[j] or "").strip()]
-        if not vals: col_scores.append(0.0); continue
-        num = sum(isnum(v) for v in vals)
-        frac = max(num/len(vals), 1 - num/len(vals))
-        col_scores.append(frac)
-    purity = sum(col_scores)/len(col_scores)
-    strong = sum(1 for f in col_scores if f > 0.7)
-    width = 1.0 if (cols >= 2 and strong >= 1) else 0.0
-    return round(0.7*purity + 0.3*width, 3)
+    return _tabularity.tabularity(rows, "spotter")
 
-def propose_regions(words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    if not words: return []
-    words = sorted(words, key=lambda w: (w["y"], w["x"]))
-    lines, cur = [], []
-    for w in words:
-        if not cur: cur=[w]; continue
-        if abs(w["y"] - cur[-1]["y"]) <= max(2, 0.25*cur[-1]["h"]):
-            cur.append(w)
-        else:
-            lines.append(cur); cur=[w]
-    if cur: lines.append(cur)
-
-    def span(line): return (min(t["x"] for t in line), max(t["x"]+t["w"] for t in line))
-    regions, bucket, last_span = [], [], None
-    for ln in lines:
-        sp = span(ln)
-        if not bucket: bucket=[ln]; last_span=sp; continue
-        overlap = min(last_span[1], sp[1]) - max(last_span[0], sp[0])
-        width = max(last_span[1]-last_span[0], sp[1]-sp[0])
+# word boxes of a document; text is an index into the caller's list of strings
+WORD_DTYPE = np.dtype([("x", "f8"), ("y", "f8"), ("w", "f8"), ("h", "f8"), ("page", "i4"), ("text", "i4")])
+# region boxes; words order[start:end] of propose_regions_batch's sort order lie in the region
+REGION_DTYPE = np.dtype([("page", "i4"), ("x1", "f8"), ("y1", "f8"), ("x2", "f8"), ("y2", "f8"),
+                         ("score", "f4"), ("start", "i4"), ("end", "i4")])
+
+def words_array(pages: Iterable[Tuple[int, Sequence[Dict[str, Any]]]]) -> Tuple[np.ndarray, List[str]]:
+    """Pack (page_number, word dicts with x, y, w, h, text) pairs into (WORD_DTYPE array, texts)."""
+    recs: List[Tuple[float, float, float, float, int, int]] = []
+    texts: List[str] = []
+    for page, words in pages:
+        for w in words:
+            recs.append((w["x"], w["y"], w["w"], w["h"], int(page), len(texts)))
+            texts.append(str(w.get("text", "")))
+    return np.array(recs, dtype=WORD_DTYPE), texts
+
+def _region_starts(x1: List[float], x2: List[float], page_start: List[bool]) -> List[bool]:
+    """Per line: does it open a new region? (IoU of its X span with the running intersection <= 0.6)"""
+    out: List[bool] = []
+    lo = hi = 0.0
+    for a, b, first in zip(x1, x2, page_start):
+        if first:
+            out.append(True); lo, hi = a, b; continue
+        overlap = min(hi, b) - max(lo, a)
+        width = max(hi - lo, b - a)
         iou = overlap/width if width>0 else 0
         if iou > 0.6:
-            bucket.append(ln)
-            last_span=(max(last_span[0], sp[0]), min(last_span[1], sp[1]))
+            out.append(False); lo, hi = max(lo, a), min(hi, b)
         else:
-            regions.append(bucket); bucket=[ln]; last_span=sp
-    if bucket: regions.append(bucket)
-
-    boxes=[]
-    for reg in regions:
-        xs=[t["x"] for ln in reg for t in ln]
-        ys=[t["y"] for ln in reg for t in ln]
-        x2s=[t["x"]+t["w"] for ln in reg for t in ln]
-        y2s=[t["y"]+t["h"] for ln in reg for t in ln]
-        boxes.append({"x1": min(xs), "y1": min(ys), "x2": max(x2s), "y2": max(y2s), "score": 0.5})
-    return boxes
+            out.append(True); lo, hi = a, b
+    return out
+
+def propose_regions_batch(words: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Regions of every page of a WORD_DTYPE array: (REGION_DTYPE[n] in (page, y) order, order),
+    where order sorts the words by (page, y, x) (stable) and region k holds words
+    order[start:end]. Same grouping as propose_regions on each page's words.
+    """
+    if not len(words):
+        return np.zeros(0, dtype=REGION_DTYPE), np.zeros(0, dtype=np.int64)
+    order = np.lexsort((words["x"], words["y"], words["page"]))
+    w = words[order]
+    x, y, h, page = w["x"], w["y"], w["h"], w["page"]
+    x2, y2 = x + w["w"], y + h
+
+    # lines: a word joins the previous word's line when on the same page and within max(2, h/4) in y
+    new_page = np.empty(len(w), dtype=bool)
+    new_page[0] = True
+    new_page[1:] = page[1:] != page[:-1]
+    new_line = new_page.copy()
+    new_line[1:] |= np.abs(y[1:] - y[:-1]) > np.maximum(2, 0.25 * h[:-1])
+    line_at = np.flatnonzero(new_line)
+    lx1 = np.minimum.reduceat(x, line_at)
+    lx2 = np.maximum.reduceat(x2, line_at)
+    lpage_start = new_page[line_at]
+
+    # regions: sequential merge over line spans
+    starts = _region_starts(lx1.tolist(), lx2.tolist(), lpage_start.tolist())
+    reg_at = line_at[np.flatnonzero(starts)]
+
+    out = np.zeros(len(reg_at), dtype=REGION_DTYPE)
+    out["page"] = page[reg_at]
+    out["x1"] = np.minimum.reduceat(x, reg_at)
+    out["y1"] = np.minimum.reduceat(y, reg_at)
+    out["x2"] = np.maximum.reduceat(x2, reg_at)
+    out["y2"] = np.maximum.reduceat(y2, reg_at)
+    out["score"] = 0.5
+    out["start"] = reg_at
+    out["end"] = np.append(reg_at[1:], len(w))
+    return out, order
+
+CELL_GAP = 6.0  # pt; a wider horizontal gap between words of a line starts a new cell
+
+def region_rows(words: np.ndarray, order: np.ndarray, region: np.void, texts: Sequence[str],
+                gap: float = CELL_GAP) -> List[List[str]]:
+    """One region's lines as rows of cells: each line's words in x order, split at gaps > max(gap, h)."""
+    w = words[order[int(region["start"]):int(region["end"])]]
+    y, h = w["y"], w["h"]
+    brk = np.flatnonzero(np.abs(y[1:] - y[:-1]) > np.maximum(2, 0.25 * h[:-1])) + 1
+    rows: List[List[str]] = []
+    for ln in np.split(w, brk):
+        ln = ln[np.argsort(ln["x"], kind="stable")]
+        gaps = ln["x"][1:] - (ln["x"][:-1] + ln["w"][:-1])
+        cut = (gaps > np.maximum(gap, ln["h"][:-1])).tolist()
+        cells, cur = [], [texts[ln["text"][0]]]
+        for c, t in zip(cut, ln["text"][1:].tolist()):
+            if c:
+                cells.append(" ".join(cur)); cur = []
+            cur.append(texts[t])
+        cells.append(" ".join(cur))
+        rows.append(cells)
+    return rows
+
+def table_candidates(words: np.ndarray, texts: Sequence[str], regions: np.ndarray, order: np.ndarray,
+                     gate: float = 0.35, min_rows: int = 2) -> List[Tuple[int, List[List[str]], float]]:
+    """(region index, rows, tabularity) of regions with >= min_rows lines scoring >= gate."""
+    out = []
+    for k, reg in enumerate(regions):
+        rows = region_rows(words, order, reg, texts)
+        if len(rows) < min_rows:
+            continue
+        score = tabularity_score(rows)
+        if score >= gate:
+            out.append((k, rows, score))
+    return out
+
+def region_dicts(regions: np.ndarray) -> List[Dict[str, Any]]:
+    return [{"page_number": int(r["page"]), "x1": float(r["x1"]), "y1": float(r["y1"]),
+             "x2": float(r["x2"]), "y2": float(r["y2"]), "score": float(r["score"])} for r in regions]
+
+def propose_regions(words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Regions of one page's word dicts (x, y, w, h)."""
+    if not words: return []
+    regions, _ = propose_regions_batch(words_array([(0, words)])[0])
+    return [{k: v for k, v in d.items() if k != "page_number"} for d in region_dicts(regions)]
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--words_json", help="Path to JSON: list of word dicts with x,y,w,h,text for one page")
+    ap.add_argument("--pages_json", help="Path to JSON: list of {page_number, words} for a whole document")
+    ap.add_argument("--lattice", action="store_true",
+                    help="--pages_json pages also carry pdfplumber lines/rects: emit ruled tables (legacy col_* schema)")
     ap.add_argument("--debug_out", help="Optional JSON to write proposed boxes")
     args = ap.parse_args()
 
-    if not args.words_json:
+    tables = None
+    if args.pages_json:
+        pages = json.loads(Path(args.pages_json).read_text(encoding="utf-8"))
+        arr, texts = words_array((p["page_number"], p.get("words", [])) for p in pages)
+        boxes = region_dicts(propose_regions_batch(arr)[0])
+        if args.lattice:
+            lattice = _shared_module("spotter.lattice")
+            tables = lattice.lattice_document(((p["page_number"], p.get("lines", []), p.get("rects", [])) for p in pages),
+                                              arr, texts)
+    elif not args.words_json:
         print(json.dumps({"regions": [], "note":"no coords"})); return
-    words = json.loads(Path(args.words_json).read_text(encoding="utf-8"))
-    boxes = propose_regions(words)
+    else:
+        words = json.loads(Path(args.words_json).read_text(encoding="utf-8"))
+        boxes = propose_regions(words)
     out = {"regions": boxes, "count": len(boxes)}
+    if tables is not None:
+        out["tables"] = tables
     if args.debug_out:
         Path(args.debug_out).write_text(json.dumps(out, ensure_ascii=False, indent=2), encoding="utf-8")
     print(json.dumps(out, ensure_ascii=False))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content-addressed on-disk cache for per-table Surgeon results.
+
+- One JSON file per key under <root>/<key[:2]>/<key>.json, written atomically
+  (tmp + os.replace) so several Surgeon workers can share a cache directory.
+- LRU by file mtime: a hit touches the entry; when the tracked size passes
+  max_bytes the oldest entries are evicted down to 90% of the budget.
+- Keys are built by the caller (table content + code/config version + patterns
+  digest); this module only stores and evicts.
+"""
+from __future__ import annotations
+
+import hashlib, json, os, tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+def digest_bytes(chunks: Iterable[bytes]) -> str:
+    h = hashlib.sha1()
+    for c in chunks:
+        h.update(c)
+    return h.hexdigest()
+
+def file_digest(path: Path) -> str:
+    """sha1 of a file's bytes, or "absent" when it does not exist."""
+    try:
+        return digest_bytes([Path(path).read_bytes()])
+    except OSError:
+        return "absent"
+
+class DiskLRUCache:
+    def __init__(self, root: str, max_bytes: int = 256 * 1024 * 1024):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self._size: Optional[int] = None  # scanned lazily on first put
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "writes": 0, "evicted": 0}
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        p = self._path(key)
+        try:
+            with p.open("r", encoding="utf-8") as f:
+                val = json.load(f)
+        except (OSError, ValueError):
+            self.stats["misses"] += 1
+            return None
+        try:
+            os.utime(p)  # mark as recently used
+        except OSError:
+            pass
+        self.stats["hits"] += 1
+        return val
+
+    def put(self, key: str, value: Any) -> None:
+        p = self._path(key)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        fd, tmp = tempfile.mkstemp(dir=p.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, p)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        self.stats["writes"] += 1
+        if self._size is None:
+            self._size = self._scan_size()
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self.prune()
+
+    def _entries(self):
+        for sub in self.root.iterdir():
+            if not sub.is_dir():
+                continue
+            for f in sub.glob("*.json"):
+                try:
+                    st = f.stat()
+                except OSError:
+                    continue
+                yield st.st_mtime, st.st_size, f
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def prune(self, target_fraction: float = 0.9) -> None:
+        """Evict least-recently-used entries until the cache fits target_fraction * max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        budget = int(self.max_bytes * target_fraction)
+        for _, size, f in entries:
+            if total <= budget:
+                break
+            try:
+                f.unlink()
+                self.stats["evicted"] += 1
+            except OSError:
+                pass
+            total -= size
+        self._size = total
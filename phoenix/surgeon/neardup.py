@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Near-duplicate detection for processed tables (PHASE_1B_PLAN lever 4: repeated FP contact slabs).
+
+- simhash64(text): 64-bit SimHash over word unigrams + bigrams (count-weighted), with
+  feature hashes from blake2b so fingerprints are stable across processes and runs.
+- SimHashIndex: per-dossier banded index. The fingerprint is cut into max_distance+1
+  bands; two fingerprints within max_distance bits must agree on at least one band
+  (pigeonhole), so a lookup only verifies the entries sharing a band with the query.
+"""
+from __future__ import annotations
+
+import hashlib, re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9@._+-]+")
+_BITS = np.arange(64, dtype=np.uint64)
+
+def _h64(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+def simhash64(text: str) -> int:
+    """SimHash of a text blob; 0 for text without tokens."""
+    toks = _TOKEN_RE.findall(text.lower())
+    if not toks:
+        return 0
+    weights: Dict[str, int] = {}
+    for f in toks + [a + " " + b for a, b in zip(toks, toks[1:])]:
+        weights[f] = weights.get(f, 0) + 1
+    hashes = np.fromiter((_h64(f) for f in weights), dtype=np.uint64, count=len(weights))
+    w = np.fromiter(weights.values(), dtype=np.int64, count=len(weights))
+    bits = ((hashes[:, None] >> _BITS) & np.uint64(1)).astype(np.int64)  # (features, 64)
+    votes = (w[:, None] * (2 * bits - 1)).sum(axis=0)
+    return int(np.packbits((votes > 0)[::-1]).view(">u8")[0])
+
+def table_text(headers: List[str], data: List[List[str]]) -> str:
+    return " ".join(headers or []) + " " + " ".join(" ".join(r) for r in (data or []))
+
+class SimHashIndex:
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = int(max_distance)
+        n_bands = self.max_distance + 1
+        edges = [round(i * 64 / n_bands) for i in range(n_bands + 1)]
+        self._bands: List[Tuple[int, int]] = [(lo, (1 << (hi - lo)) - 1) for lo, hi in zip(edges, edges[1:])]
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in self._bands]
+        self._entries: List[Tuple[int, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def query(self, fp: int) -> Optional[Tuple[Any, int]]:
+        """(payload, distance) of the closest indexed fingerprint within max_distance, else None."""
+        best: Optional[Tuple[Any, int]] = None
+        seen = set()
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            for i in buckets.get((fp >> shift) & mask, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                other, payload = self._entries[i]
+                d = bin(fp ^ other).count("1")
+                if d <= self.max_distance and (best is None or d < best[1]):
+                    best = (payload, d)
+        return best
+
+    def add(self, fp: int, payload: Any) -> None:
+        i = len(self._entries)
+        self._entries.append((fp, payload))
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            buckets.setdefault((fp >> shift) & mask, []).append(i)
@@ -1875,27 +1875,58 @@ Directives implemented:
 
 from __future__ import annotations
 
-import json, re, hashlib
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+import glob, importlib, importlib.util, itertools, json, os, re, hashlib, sys, time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+def _shared_module(name: str):
+    """
+    Import phoenix.<name>. When this file runs as a plain script the package root
+    is not on sys.path; the module is then loaded from its file rather than by
+    adding the root (which would also switch on the optional memory-layer hooks).
+    """
+    try:
+        return importlib.import_module(f"phoenix.{name}")
+    except ImportError:
+        qual = f"phoenix.{name}"
+        if qual in sys.modules:
+            return sys.modules[qual]
+        path = Path(__file__).resolve().parents[1].joinpath(*name.split(".")).with_suffix(".py")
+        spec = importlib.util.spec_from_file_location(qual, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[qual] = mod
+        spec.loader.exec_module(mod)
+        return mod
+
+KeywordMatcher = _shared_module("utils.text").KeywordMatcher
+_cache = _shared_module("surgeon.cache")
+_tabularity = _shared_module("metrics.tabularity")
+_neardup = _shared_module("surgeon.neardup")
+_anchors = _shared_module("utils.anchors")
 
 # -------------------- helpers --------------------
 
+_WS_RE = re.compile(r"\s+")
+
 def normalize_cell(x: Any) -> str:
     if x is None:
         return ""
-    return re.sub(r"\s+", " ", str(x).strip())
+    # same result as _WS_RE.sub(" ", s.strip()): str.split() and \s agree on what is whitespace
+    return " ".join(str(x).split())
 
 def safe_get_max_cols(table_data: List[Dict[str,str]]) -> int:
     max_cols = 0
-    for row in table_data:
-        for k in row.keys():
-            if k.lower().startswith("col_"):
-                try:
-                    i = int(k.split("_")[1])
-                    max_cols = max(max_cols, i + 1)
-                except Exception:
-                    pass
+    keys = {k for row in table_data for k in row.keys()}  # rows share keys; parse each once
+    for k in keys:
+        if k.lower().startswith("col_"):
+            try:
+                i = int(k.split("_")[1])
+                max_cols = max(max_cols, i + 1)
+            except Exception:
+                pass
     return max_cols
 
 def pad_to_len(arr: List[str], n: int) -> List[str]:
@@ -1921,44 +1952,276 @@ def concat_row_fields(row: Dict[str, Any]) -> str:
                 vals.append(s)
     return normalize_cell(" ".join(vals))
 
+# -------------------- Table features --------------------
+
+NUMERIC_TOKEN_RE = re.compile(r"[\d,.%₹-]+")
+NUMERIC_MARK_RE  = re.compile(r"[\d,.%₹-]")
+ALPHA_RE         = re.compile(r"[A-Za-z]")
+YEAR_RE          = re.compile(r"\b(19\d{2}|20\d{2})\b")
+MONTH_LEAD_RE    = re.compile(r"^(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)", re.I)
+
+_COL_KEY_RE = re.compile(r"(?i)col_\d+")
+
+class CompactTable:
+    """
+    Column-major form of one legacy table (list of row dicts), built once at ingestion:
+      - keys:      every key in first-seen order (the original key order)
+      - columns:   per key, the normalized value of each row as an interned string
+                   ("" where the value is None or the row lacks the key)
+      - row_valid: NumPy bool mask, True where a row has any non-empty value
+      - slots:     col_j -> index into columns for j < n_cols (None when the table has
+                   no exact "col_j" key); n_cols follows safe_get_max_cols
+    Rows are not materialized as dicts; the few rows whose key list differs from
+    `keys` keep it in row_keys so record(i) still reproduces the original order.
+    """
+    __slots__ = ("keys", "columns", "row_keys", "row_valid", "n_rows", "n_cols", "slots", "_filled")
+
+    def __init__(self, table_data: List[Dict[str, Any]]):
+        first = list(table_data[0].keys()) if table_data else []
+        keys = list(first)
+        known = set(keys)
+        row_keys: Dict[int, Tuple[str, ...]] = {}
+        for i, row in enumerate(table_data):
+            if len(row) != len(first) or list(row) != first:
+                row_keys[i] = tuple(row)
+                for k in row:
+                    if k not in known:
+                        known.add(k)
+                        keys.append(k)
+        if len(keys) != len(first):  # the union grew: rows with the first key list keep it
+            for i in range(len(table_data)):
+                row_keys.setdefault(i, tuple(first))
+        intern = sys.intern
+        self.keys: List[str] = keys
+        self.columns: List[List[str]] = [
+            [intern(" ".join(v.split())) if v.__class__ is str else intern(normalize_cell(v))
+             for v in [row.get(k) for row in table_data]]
+            for k in keys
+        ]
+        self.row_keys = row_keys
+        self.n_rows = len(table_data)
+        self.n_cols = safe_get_max_cols([dict.fromkeys(keys)])
+        index = {k: j for j, k in enumerate(keys)}
+        self.slots: List[Optional[int]] = [index.get(f"col_{j}") for j in range(self.n_cols)]
+        if self.columns and self.n_rows:
+            lens = np.fromiter(map(len, itertools.chain.from_iterable(self.columns)),
+                               dtype=np.int64, count=len(keys)*self.n_rows).reshape(len(keys), self.n_rows)
+            self.row_valid = (lens > 0).any(axis=0)
+            self._filled = ((lens > 0).sum(axis=1) - np.array([c.count("-") for c in self.columns])).tolist()
+        else:
+            self.row_valid = np.zeros(self.n_rows, dtype=bool)
+            self._filled = [0]*len(keys)
+
+    def column(self, key: str) -> List[str]:
+        """Normalized values of one key ("" for every row when the key is absent)."""
+        try:
+            return self.columns[self.keys.index(key)]
+        except ValueError:
+            return [""]*self.n_rows
+
+    def slot_columns(self) -> List[List[str]]:
+        """col_0 .. col_{n_cols-1} as columns; missing slots read as empty."""
+        empty: Optional[List[str]] = None
+        out: List[List[str]] = []
+        for s in self.slots:
+            if s is None:
+                empty = empty or [""]*self.n_rows
+                out.append(empty)
+            else:
+                out.append(self.columns[s])
+        return out
+
+    def filled(self, key: str) -> int:
+        """Rows whose value for key is neither empty nor a bare dash."""
+        try:
+            return self._filled[self.keys.index(key)]
+        except ValueError:
+            return 0
+
+    def record(self, i: int) -> Dict[str, str]:
+        """Normalized row i as a dict in its original key order."""
+        keys = self.row_keys.get(i, self.keys)
+        cols = self.columns
+        index = self.keys.index
+        if keys is self.keys:
+            return {k: cols[j][i] for j, k in enumerate(keys)}
+        return {k: cols[index(k)][i] for k in keys}
+
+    def values(self, i: int) -> List[str]:
+        return list(self.record(i).values()) if i in self.row_keys else [c[i] for c in self.columns]
+
+    def any_value_contains(self, needle: str) -> bool:
+        return any(needle in "\x00".join(col) for col in self.columns)
+
+class TableFeatures:
+    """
+    Normalized cell grid of one table plus per-cell / per-column flags.
+
+    Built once per grid and shared by every Surgeon pass, so each cell goes
+    through normalize_cell and the type regexes exactly once:
+      - TableFeatures(rows)                   -> grid of data rows (List[List[str]])
+      - TableFeatures.from_table_data(rows)   -> legacy row dicts, held column-major
+                                                 as a CompactTable; the row grid is
+                                                 only built if a caller asks for it
+    Per-row flags (numeric mark / alpha / year / month) are computed lazily since
+    only the header band needs them.
+    """
+
+    def __init__(self, rows: List[List[Any]], cells: Optional[List[List[str]]] = None):
+        self.rows = rows
+        self._cells: Optional[List[List[str]]] = cells if cells is not None else [[normalize_cell(c) for c in r] for r in rows]
+        self.n_cols = max((len(r) for r in self._cells), default=0)
+        self.table: Optional[CompactTable] = None
+        self._columns: Optional[List[List[str]]] = None
+        self._table_data: List[Dict[str, Any]] = []
+        self._row_flags: Dict[int, List[Tuple[str, bool, bool, bool, bool]]] = {}
+        self._col_stats: Optional[Tuple[Any, Any]] = None
+        self._col_filled: Optional[List[int]] = None
+        self._tabularity: Optional[float] = None
+        self._flat: Optional[str] = None
+        self._text_lower: Optional[str] = None
+
+    @classmethod
+    def from_table_data(cls, table_data: List[Dict[str, Any]]) -> "TableFeatures":
+        table = CompactTable(table_data)
+        feats = cls([], cells=[])
+        feats.rows = None
+        feats._cells = None
+        feats.n_cols = table.n_cols
+        feats.table = table
+        feats._columns = table.slot_columns()
+        feats._table_data = table_data
+        return feats
+
+    # --- grid views ---
+    @property
+    def cells(self) -> List[List[str]]:
+        """Row-major grid (col_0..col_{n_cols-1} for legacy tables)."""
+        if self._cells is None:
+            n = self.table.n_rows
+            self._cells = [list(r) for r in zip(*self._columns)] if self._columns else [[] for _ in range(n)]
+        return self._cells
+
+    @property
+    def columns(self) -> List[List[str]]:
+        """Column-major grid; ragged data rows read as "" past their end."""
+        if self._columns is None:
+            self._columns = [list(c) for c in itertools.zip_longest(*self._cells, fillvalue="")]
+        return self._columns
+
+    def cell(self, i: int, j: int) -> str:
+        if self._columns is not None and self._cells is None:
+            return self._columns[j][i] if j < len(self._columns) else ""
+        row = self.cells[i]
+        return row[j] if j < len(row) else ""
+
+    def rows_of(self, cols: List[int], skip: Set[int] = frozenset()) -> List[List[str]]:
+        """Rows restricted to the given columns, leaving out the row indices in skip."""
+        picked = [self.columns[j] for j in cols]
+        if not skip:
+            return [list(r) for r in zip(*picked)]
+        return [list(r) for i, r in enumerate(zip(*picked)) if i not in skip]
+
+    def record(self, i: int) -> Dict[str, str]:
+        """Normalized legacy row i (original key order); grid rows map to col_j keys."""
+        if self.table is not None:
+            return self.table.record(i)
+        return {f"col_{j}": c for j, c in enumerate(self.cells[i])}
+
+    # --- text views ---
+    @property
+    def flat(self) -> str:
+        """Rows joined verbatim (cell spacing preserved for the anchor/KV regexes)."""
+        if self._flat is None:
+            self._flat = " ".join(" ".join(r) for r in (self.rows or []))
+        return self._flat
+
+    @property
+    def text_lower(self) -> str:
+        """Normalized lowercase blob over every raw value (classification text)."""
+        if self._text_lower is None:
+            # raw values on purpose: None reads as "None" and empty cells add spacing
+            all_text_raw = " ".join(str(v) for row in self._table_data for v in row.values())
+            self._text_lower = normalize_cell(all_text_raw).lower()
+        return self._text_lower
+
+    # --- per-cell flags ---
+    def row_flags(self, i: int) -> List[Tuple[str, bool, bool, bool, bool]]:
+        """(text, has_numeric_mark, has_alpha, has_year, month_lead) for every value of record/row i."""
+        flags = self._row_flags.get(i)
+        if flags is None:
+            vals = self.table.values(i) if self.table is not None else self.cells[i]
+            flags = [
+                (s, bool(NUMERIC_MARK_RE.search(s)), bool(ALPHA_RE.search(s)),
+                 bool(YEAR_RE.search(s)), bool(MONTH_LEAD_RE.search(s)))
+                for s in vals
+            ]
+            self._row_flags[i] = flags
+        return flags
+
+    # --- per-column stats ---
+    @property
+    def col_stats(self) -> Tuple[Any, Any]:
+        """(non_empty, numeric) cell counts per column (NumPy arrays, see metrics.tabularity)."""
+        if self._col_stats is None:
+            if self._cells is None:
+                self._col_stats = _tabularity.column_counts_cm(self._columns, "surgeon")
+            else:
+                self._col_stats = _tabularity.column_counts(self._cells, "surgeon")
+        return self._col_stats
+
+    @property
+    def col_filled(self) -> List[int]:
+        """Per-column count of cells that are neither empty nor a bare dash."""
+        if self._col_filled is None:
+            if self.table is not None:
+                t = self.table
+                self._col_filled = [0 if s is None else t._filled[s] for s in t.slots]
+            else:
+                self._col_filled = [len(c) - c.count("") - c.count("-") for c in self.columns]
+        return self._col_filled
+
+    @property
+    def col_purity(self) -> List[float]:
+        return _tabularity.column_purity(*self.col_stats).tolist()
+
+    @property
+    def tabularity(self) -> float:
+        if self._tabularity is None:
+            self._tabularity = self._score_tabularity()
+        return self._tabularity
+
+    def _score_tabularity(self) -> float:
+        if self.n_cols <= 1 or not (self.table.n_rows if self.table is not None else self.cells):
+            return 0.0
+        # only the first column feeds the label signal
+        first = [[c] for c in self.columns[0]] if self._cells is None else self.cells
+        return _tabularity.score_from_purity(self.col_purity, self.n_cols, "surgeon", first)
+
+    def non_empty_density(self) -> float:
+        non_empty = sum(1 for r in self.cells for c in r if c)
+        total = sum(len(r) for r in self.cells) or 1
+        return non_empty / total
+
 # -------------------- Directives --------------------
 
 # (1) Structural triage
 def tabularity_score(rows: List[List[str]]) -> float:
-    if not rows:
-        return 0.0
-    cols = max((len(r) for r in rows), default=0)
-    if cols <= 1:
-        return 0.0
-
-    numeric_col_frac: List[float] = []
-    for j in range(cols):
-        vals = [normalize_cell(r[j]) for r in rows if j < len(r) and normalize_cell(r[j])]
-        if not vals:
-            numeric_col_frac.append(0.0)
-            continue
-        num = sum(bool(re.fullmatch(r"[0-9,.\-()%₹]+", v)) for v in vals)
-        frac = max(num/len(vals), 1 - num/len(vals))  # purity of type
-        numeric_col_frac.append(frac)
-
-    purity = sum(numeric_col_frac)/len(numeric_col_frac)
-    left = [normalize_cell(r[0]) for r in rows if r and normalize_cell(r[0])]
-    label_diversity = len(set(left))/max(1, len(left))
-    label_signal = 1 - min(1.0, label_diversity) * 0.5
-    width = 1.0 if (cols >= 2 and any(f > 0.7 for f in numeric_col_frac)) else 0.0
-    return 0.5*purity + 0.3*label_signal + 0.2*width
+    return TableFeatures(rows).tabularity
 
 # (3a) Row-label slab guard
 ROW_LABEL_TOKENS = {"assets","liabilities","equity","income","expenses","particulars","notes"}
+ROW_LABEL_MATCHER = KeywordMatcher(sorted(ROW_LABEL_TOKENS))
 
 def looks_like_row_label_band(row: Dict[str,str]) -> bool:
+    # rows from CompactTable.record() are already normalized; normalize_cell is idempotent
     cells = [normalize_cell(v) for k,v in row.items() if k.lower().startswith("col_")]
     if not cells:
         return False
     left = normalize_cell(row.get("col_0",""))
     other_text = " ".join(normalize_cell(row.get(f"col_{j}","")) for j in range(1, min(6, len(cells))))
     left_heavy = len(left) > 20 and len(other_text) < 10
-    has_fin_labels = sum(t in left.lower() for t in ROW_LABEL_TOKENS) >= 2
+    has_fin_labels = left_heavy and ROW_LABEL_MATCHER.n_hits(left.lower()) >= 2
     return left_heavy and has_fin_labels
 
 
@@ -1985,11 +2248,18 @@ FP_TOKENS = (
     "issue opens", "issue closes", "price band", "isin", "cin", "pan", "sebi"
 )
 
-def try_compose_period_headers(table_data: List[Dict[str,str]], kept_cols: List[int], search_rows: int = 4) -> Optional[List[str]]:
+FP_MATCHER = KeywordMatcher(FP_TOKENS)
+
+def try_compose_period_headers(table_data: List[Dict[str,str]], kept_cols: List[int], search_rows: int = 4,
+                               features: Optional[TableFeatures] = None) -> Optional[List[str]]:
     if not table_data or not kept_cols:
         return None
-    rows = [[normalize_cell(table_data[r].get(f"col_{c}","")) 
-             for c in kept_cols] for r in range(min(search_rows, len(table_data)))]
+    if features is not None:
+        rows = [[features.cell(r, c) if c < features.n_cols else "" for c in kept_cols]
+                for r in range(min(search_rows, len(table_data)))]
+    else:
+        rows = [[normalize_cell(table_data[r].get(f"col_{c}",""))
+                 for c in kept_cols] for r in range(min(search_rows, len(table_data)))]
     if not rows:
         return None
     cols = list(zip(*rows))
@@ -2058,6 +2328,48 @@ class PreprocessorConfig:
     dedupe: bool = True
     output_compression: bool = False  # handled by caller
     prose_split_char_threshold: int = 250
+    # incremental runs: per-table results cached on disk by content + code/config version
+    cache_dir: Optional[str] = None
+    cache_max_mb: int = 256
+    # seed for the memory layer's exploration draws (None = time-seeded; a cache implies 0)
+    learning_seed: Optional[int] = None
+    # per-stage wall time / call counts / skip reasons (StageTimer); off = no-op timer
+    timings: bool = False
+    # near-duplicate slabs (SimHash): "off" | "mark" (lineage only) | "skip"
+    near_dup: str = "mark"
+    near_dup_max_distance: int = 3
+    near_dup_types: Tuple[str, ...] = ("FRONT_PAGE",)
+    # cheap structural rejection before classify / salvage / memory hooks (see Surgeon.pre_triage)
+    pre_triage: bool = True
+    triage_glossary: bool = False  # also reject two-column "Term | Description" glossaries
+    # anchor / KV regexes scan at most this many chars of a table's text (utils.anchors)
+    scan_window: int = 16384
+    # per-table wall-time budget; a table over it is skipped as "budget_exceeded" (None = no budget)
+    table_budget_ms: Optional[float] = None
+    # learning events: "file" (one events_path, batch-atomic appends) | "sharded" (per-worker
+    # shards with rotation + index under events_path minus ".jsonl"; see memory.eventlog)
+    events_layout: str = "file"
+    # memory layer: patterns (JSONL, or a SQLite store when it ends in .db / .sqlite) and events file
+    patterns_path: str = "out/patterns/patterns.jsonl"
+    events_path: str = "out/review/learning_events.jsonl"
+    # event writer / store polling (memory_layer): batch size, daemon-thread appends, shard
+    # rotation (sharded layout only), min seconds between patterns-store stat()s
+    events_flush_every: int = 256
+    events_background: bool = False
+    events_rotate_mb: float = 64.0
+    events_rotate_s: Optional[float] = 86400.0
+    patterns_recheck_s: float = 2.0
+
+# Sources whose code shapes a table's result; any edit invalidates cached results.
+_CACHE_SOURCES = ("surgeon/preproc_v6_2.py", "memory/memory_layer.py", "utils/text.py", "metrics/tabularity.py",
+                  "surgeon/neardup.py", "utils/anchors.py")
+# budget_exceeded skips are never cached, so the budget does not key the cache either
+_CACHE_CFG_EXCLUDE = ("cache_dir", "cache_max_mb", "timings", "near_dup", "near_dup_max_distance", "near_dup_types",
+                      "table_budget_ms", "events_layout", "patterns_path", "events_path")  # paths: keyed via learn_cfg
+# learning-config keys that only decide where / when events are written and how often patterns are polled
+_EVENT_KEYS = ("events_flush_every", "events_background", "events_rotate_mb", "events_rotate_s", "patterns_recheck_s")
+_CACHE_CFG_EXCLUDE += _EVENT_KEYS
+_CACHE_LEARN_EXCLUDE = ("events_layout",) + _EVENT_KEYS
 
 HEADER_HINTS  = [
     'total','amount','year','period','march','december','fy','q1','q2','q3','q4','half year','h1','h2',
@@ -2068,11 +2380,77 @@ FINANCIAL_STATEMENT_KEYWORDS = [
     'balance sheet','profit and loss','statement of profit and loss','cash flow','statement of operations',
     'consolidated financial','shareholder equity','financial position','notes to accounts'
 ]
+HEADER_HINT_MATCHER = KeywordMatcher(HEADER_HINTS)
+FINANCIAL_STATEMENT_MATCHER = KeywordMatcher(FINANCIAL_STATEMENT_KEYWORDS)
 FRONT_PAGE_KEYWORDS = [
     'offer','issue','price band','registrar','lead manager','merchant banker','rta','ipo','equity share',
     'fresh issue','offer for sale','contact person','telephone','tel','phone','fax','website','email','e-mail'
 ]
 
+class StageTimer:
+    """
+    Per-stage instrumentation for Surgeon.preprocess_table.
+
+    Stages are timed as consecutive laps: begin() at the top of a table, lap(stage)
+    after each stage (time since the previous mark goes to that stage), end(skip)
+    when the table is done. The disabled variant (_NullTimer) keeps the same calls
+    as empty methods, so the instrumented code path costs a few no-op calls.
+    """
+    __slots__ = ("stages", "skips", "counters", "tables", "seconds", "_t0", "_mark")
+
+    def __init__(self):
+        self.stages: Dict[str, List[float]] = {}  # stage -> [calls, seconds]
+        self.skips: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self.tables = 0
+        self.seconds = 0.0
+        self._t0 = self._mark = 0.0
+
+    def begin(self) -> None:
+        self._t0 = self._mark = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        rec = self.stages.get(stage)
+        if rec is None:
+            rec = self.stages[stage] = [0, 0.0]
+        rec[0] += 1
+        rec[1] += now - self._mark
+        self._mark = now
+
+    def count(self, name: str) -> None:
+        self.counters[name] = self.counters.get(name, 0) + 1
+
+    def end(self, skip: Optional[Dict[str, Any]]) -> None:
+        self.tables += 1
+        self.seconds += time.perf_counter() - self._t0
+        if skip:
+            reason = skip.get("reason", "unknown")
+            self.skips[reason] = self.skips.get(reason, 0) + 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "tables": self.tables,
+            "seconds": round(self.seconds, 4),
+            "stages": {k: {"calls": int(c), "seconds": round(s, 4)}
+                       for k, (c, s) in sorted(self.stages.items(), key=lambda kv: -kv[1][1])},
+            "skips": dict(sorted(self.skips.items())),
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+class _NullTimer:
+    __slots__ = ()
+    def begin(self) -> None: pass
+    def lap(self, stage: str) -> None: pass
+    def count(self, name: str) -> None: pass
+    def end(self, skip: Optional[Dict[str, Any]]) -> None: pass
+
+def format_timings(name: str, timings: Dict[str, Any], top: int = 4) -> str:
+    """One-line per-dossier summary of a StageTimer.as_dict() block."""
+    stages = " ".join(f"{k}={v['seconds']:.3f}s/{v['calls']}" for k, v in list(timings["stages"].items())[:top])
+    skips = " ".join(f"{k}={v}" for k, v in timings["skips"].items()) or "-"
+    return f"[timings] {name}: tables={timings['tables']} total={timings['seconds']:.3f}s | {stages} | skips {skips}"
+
 class TableType:
     FRONT_PAGE = "FRONT_PAGE"
     FINANCIAL_STATEMENT = "FINANCIAL_STATEMENT"
@@ -2081,38 +2459,78 @@ class TableType:
 class Surgeon:
     def __init__(self, cfg: PreprocessorConfig):
         self.cfg = cfg
-        # universal anchors for front-page “contact slab” salvage
-        self.EMAIL_RE  = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
-        self.URL_RE    = re.compile(r"(?:(?:https?://)?(?:www\.)?[A-Za-z0-9.-]+\.[A-Za-z]{2,}(?:/[^\s]*)?)", re.I)
-        self.PHONE_RE  = re.compile(r"(?:\+?\d[\d\s\-]{7,}\d)")
+        # universal anchors for front-page “contact slab” salvage (bounded, see utils/anchors.py)
+        self.EMAIL_RE  = _anchors.EMAIL_RE
+        self.URL_RE    = _anchors.URL_RE
+        self.PHONE_RE  = _anchors.PHONE_RE
         self.ROLE_TOKS = (
             "registrar","lead manager","merchant banker","brlm",
             "contact person","compliance officer","company secretary",
             "telephone","tel","phone","fax","website","email","e-mail",
             "bid","issue opens","issue closes","anchor investor","rta"
         )
+        self.ROLE_MATCHER = KeywordMatcher(self.ROLE_TOKS)
+        seed = cfg.learning_seed
+        if seed is None and cfg.cache_dir:
+            seed = 0  # a time-seeded draw would freeze into the cache at random
+        self.learn_cfg: Dict[str, Any] = {
+            "enabled": True,
+            "events_path": cfg.events_path,
+            "patterns_path": cfg.patterns_path,
+            "exploration_rate": 0.15,
+        }
+        if seed is not None:
+            self.learn_cfg["seed"] = int(seed)
+        if cfg.events_layout != "file":
+            self.learn_cfg["events_layout"] = cfg.events_layout
+        self.learn_cfg.update({k: getattr(cfg, k) for k in _EVENT_KEYS})
+        self.timer = StageTimer() if cfg.timings else _NullTimer()
+        self._deadline: Optional[Any] = None
+        self.cache = None
+        if cfg.cache_dir:
+            self.cache = _cache.DiskLRUCache(cfg.cache_dir, max_bytes=int(cfg.cache_max_mb) * 1024 * 1024)
+            self._cache_version = self._version_digest()
+
+    def _version_digest(self) -> str:
+        """Code + config + learning-state fingerprint mixed into every cache key."""
+        root = Path(__file__).resolve().parents[1]
+        try:
+            from phoenix.memory import memory_layer
+            pp = Path(self.learn_cfg["patterns_path"])
+            memory = memory_layer.patterns_digest(pp) if memory_layer.is_store_path(pp) else _cache.file_digest(pp)
+        except Exception:
+            memory = "off"
+        cfg = {k: v for k, v in asdict(self.cfg).items() if k not in _CACHE_CFG_EXCLUDE}
+        parts = [_cache.file_digest(root / s).encode() for s in _CACHE_SOURCES]
+        learn = {k: v for k, v in self.learn_cfg.items() if k not in _CACHE_LEARN_EXCLUDE}
+        parts += [json.dumps(cfg, sort_keys=True).encode(), json.dumps(learn, sort_keys=True).encode(), memory.encode()]
+        return _cache.digest_bytes(parts)
 
     def _anchor_kv_stats(self, text: str) -> tuple[int,int,int]:
-        """Return (anchors, kv_labels, role_hits) computed from a flat lowercase blob."""
-        anchors = 0
-        anchors += 1 if self.EMAIL_RE.search(text) else 0
-        anchors += 1 if self.URL_RE.search(text)   else 0
-        anchors += 1 if self.PHONE_RE.search(text) else 0
-        kv_labels = len(re.findall(r"[A-Za-z][A-Za-z\s]{1,30}:", text))
-        role_hits = sum(1 for t in self.ROLE_TOKS if t in text)
+        """
+        Return (anchors, kv_labels, role_hits) computed from a flat lowercase blob.
+        kv_labels saturates at 3, the highest threshold any caller compares it with.
+        """
+        if self._deadline is not None:
+            self._deadline.check("anchors")
+        w = self.cfg.scan_window
+        anchors = _anchors.anchor_count(text, w)
+        kv_labels = _anchors.count(_anchors.KV_RE, text, cap=3, limit=w)
+        role_hits = self.ROLE_MATCHER.n_hits(text)
         return anchors, kv_labels, role_hits
 
     # --- classification ---
-    def classify(self, table_data: List[Dict[str, Any]], page_number: Optional[int]) -> str:
+    def classify(self, table_data: List[Dict[str, Any]], page_number: Optional[int],
+                 features: Optional[TableFeatures] = None) -> str:
         # Early pages are front-page by default
         if page_number is not None and page_number <= 2:
             return TableType.FRONT_PAGE
 
-        all_text_raw = " ".join(str(v) for row in table_data for v in row.values())
-        all_text = normalize_cell(all_text_raw).lower()
+        feats = features or TableFeatures.from_table_data(table_data)
+        all_text = feats.text_lower
 
         # Financial statements get priority classification
-        if any(k in all_text for k in FINANCIAL_STATEMENT_KEYWORDS):
+        if FINANCIAL_STATEMENT_MATCHER.any(all_text):
             return TableType.FINANCIAL_STATEMENT
 
         anchors, kv, roles = self._anchor_kv_stats(all_text)
@@ -2135,33 +2553,36 @@ class Surgeon:
         return TableType.GENERIC
 
     # --- header helpers ---
-    def detect_header_rows(self, table_data: List[Dict[str,str]], max_header_rows: int) -> List[int]:
-        def score_header_row(row: Dict[str,str]) -> float:
+    def detect_header_rows(self, table_data: List[Dict[str,str]], max_header_rows: int,
+                           features: Optional[TableFeatures] = None) -> List[int]:
+        feats = features or TableFeatures.from_table_data(table_data)
+
+        def score_header_row(flags: List[Tuple[str, bool, bool, bool, bool]]) -> float:
             hits, labels, numerics, unique_labels = 0, 0, 0, set()
-            for _, v in row.items():
-                s = normalize_cell(v); sl = s.lower()
+            for s, _, _, has_year, month_lead in flags:
                 if not s:
                     continue
-                if any(h in sl for h in HEADER_HINTS):
+                sl = s.lower()
+                if HEADER_HINT_MATCHER.any(sl):
                     hits += 2
-                if re.search(r"\b(19\d{2}|20\d{2})\b", sl) or re.search(r"^(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)", sl, re.I):
+                if has_year or month_lead:
                     hits += 1
                 for t in s.split():
                     if t.isalpha():
                         labels += 1; unique_labels.add(t.lower())
-                    elif re.fullmatch(r"[\d,.%₹-]+", t):
+                    elif NUMERIC_TOKEN_RE.fullmatch(t):
                         numerics += 1
             ratio = labels / (labels + numerics) if (labels + numerics) > 0 else 0.0
             return hits + 0.5 * ratio - (0.1 if hits == 0 and len(unique_labels) <= 1 else 0)
 
         header_indices: List[int] = []
         for i in range(min(max_header_rows, len(table_data))):
-            row = table_data[i]
-            if looks_like_row_label_band(row):
+            if looks_like_row_label_band(feats.record(i)):
                 continue  # Directive 3a
-            sc = score_header_row(row)
-            numerics = sum(bool(re.search(r"[\d,.%₹-]", normalize_cell(v))) for v in row.values())
-            labels = sum(bool(re.search(r"[A-Za-z]", normalize_cell(v))) for v in row.values())
+            flags = feats.row_flags(i)
+            sc = score_header_row(flags)
+            numerics = sum(1 for f in flags if f[1])
+            labels = sum(1 for f in flags if f[2])
             nr = numerics / max(1, (numerics + labels))
             if sc >= 0.5 and nr < 0.25:
                 header_indices.append(i)
@@ -2173,14 +2594,15 @@ class Surgeon:
         table_data: List[Dict[str,str]],
         header_rows: List[int],
         kept_cols: List[int],
-        max_len: int
+        max_len: int,
+        features: Optional[TableFeatures] = None
     ) -> Tuple[List[str], List[List[str]], Optional[str], List[int]]:
         table_title = None
         raw_header_parts: List[List[str]] = []
         used_indices: List[int] = []
 
         # Directive 3b: try compose period headers first
-        period_headers = try_compose_period_headers(table_data, kept_cols)
+        period_headers = try_compose_period_headers(table_data, kept_cols, features=features)
         if period_headers:
             display_headers = [h if h else f"Column_{i}" for i,h in enumerate(period_headers)]
             raw_header_parts = [[h] if h else [] for h in display_headers]
@@ -2191,7 +2613,10 @@ class Surgeon:
                 raw_header_parts = [[h] for h in display_headers]
             else:
                 usable = [idx for idx in header_rows]
-                raw_parts = [[normalize_cell(table_data[hr].get(f"col_{c}","")) for hr in usable] for c in kept_cols]
+                if features is not None:
+                    raw_parts = [[features.cell(hr, c) for hr in usable] for c in kept_cols]
+                else:
+                    raw_parts = [[normalize_cell(table_data[hr].get(f"col_{c}","")) for hr in usable] for c in kept_cols]
                 raw_header_parts = [[p for p in parts if p] for parts in raw_parts]
                 display_headers = [" ".join(parts) if parts else f"Column_{idx}" for idx, parts in enumerate(raw_header_parts)]
                 used_indices = sorted(list(set(usable)))
@@ -2200,22 +2625,55 @@ class Surgeon:
         return display_headers, raw_header_parts, table_title, used_indices
 
     # --- triage ---
-    def is_contextually_valuable(self, data_rows: List[List[str]], table_type: str, page_no: Optional[int] = None) -> bool:
-        ts = tabularity_score(data_rows)
+    def pre_triage(self, table_data: List[Dict[str, Any]], page_no: Optional[int],
+                   col_keys: List[str], features: TableFeatures) -> Optional[str]:
+        """
+        Cost-ordered first gate, run before classify / salvage / the memory hooks.
+        Returns the rule name when the table is a certain loser, else None.
+
+        single_column: past page 3, a table without "@" can never become FRONT_PAGE
+          (classify and salvage both need email+url+phone anchors there), and a
+          non-FRONT_PAGE table that ends with <=1 data column always fails the
+          context gate (GENERIC: tabularity 0; FINANCIAL_STATEMENT: width <= 1).
+          Columns are counted exactly as the main path keeps them.
+        glossary (opt-in): two dense columns of short labels + prose definitions,
+          with almost no numeric cells in a sample of rows.
+        """
+        if page_no is None or page_no <= 3:
+            return None
+        if features.table.any_value_contains("@"):
+            return None
+        n_rows = len(table_data)
+        kept = [j for j, filled in enumerate(features.col_filled[:features.n_cols]) if filled/n_rows >= 0.30]
+        if not col_keys or len(kept or range(features.n_cols)) <= 1:
+            return "single_column"
+        if self.cfg.triage_glossary and len(kept) == 2 and n_rows >= 3:
+            step = max(1, n_rows // 12)
+            terms = [c for c in features.columns[kept[0]][::step][:12] if c]
+            defs = [c for c in features.columns[kept[1]][::step][:12] if c]
+            numeric = sum(1 for c in terms + defs if NUMERIC_TOKEN_RE.fullmatch(c))
+            if (len(terms) >= 3 and len(defs) >= 3 and numeric <= 0.05*(len(terms) + len(defs))
+                    and sum(map(len, terms))/len(terms) <= 40
+                    and sum(len(d.split()) for d in defs)/len(defs) >= 8
+                    and not FINANCIAL_STATEMENT_MATCHER.any(features.text_lower)):
+                return "glossary"
+        return None
+
+    def is_contextually_valuable(self, data_rows: List[List[str]], table_type: str, page_no: Optional[int] = None,
+                                 features: Optional[TableFeatures] = None) -> bool:
+        feats = features or TableFeatures(data_rows)
+        ts = feats.tabularity
 
         # FRONT_PAGE salvage: early pages lenient, later pages strict
         if table_type == TableType.FRONT_PAGE and ts < 0.35:
-            flat = " ".join(" ".join(r) for r in (data_rows or []))
+            flat = feats.flat
             lflat = flat.lower()
-            hits = 0
-            if self.EMAIL_RE.search(flat): hits += 1
-            if self.URL_RE.search(flat):   hits += 1
-            if self.PHONE_RE.search(flat): hits += 1
-            hits += sum(1 for t in self.ROLE_TOKS if t in lflat)
-            non_empty = sum(1 for r in data_rows for c in r if (c or "").strip())
-            total     = sum(len(r) for r in data_rows) or 1
-            density   = non_empty / total
-            kv_labels = len(re.findall(r"[A-Za-z][A-Za-z\s]{1,30}:", flat))
+            if self._deadline is not None:
+                self._deadline.check("anchors")
+            hits = _anchors.anchor_count(flat, self.cfg.scan_window)
+            hits += self.ROLE_MATCHER.n_hits(lflat)
+            density   = feats.non_empty_density()
+            kv_labels = _anchors.count(_anchors.KV_RE, flat, cap=3, limit=self.cfg.scan_window)
 
             if page_no is None or page_no <= 2:
                 if hits >= 2 or density >= 0.70 or kv_labels >= 3:
@@ -2239,32 +2697,117 @@ class Surgeon:
 
     # --- main per-table ---
     def preprocess_table(
+        self,
+        table: Dict[str,Any],
+        table_index: int,
+        seen_hashes: set[str],
+        near_index: Optional[Any] = None
+    ) -> Tuple[Optional[Dict[str,Any]], Optional[Dict[str,Any]]]:
+        """
+        near_index: per-dossier SimHashIndex (new_near_dup_index()); when given, in-scope
+        processed tables get a "simhash" and, if they nearly repeat an earlier one,
+        "near_duplicate_of" lineage (or are skipped with cfg.near_dup == "skip").
+        """
+        self.timer.begin()
+        budget = self.cfg.table_budget_ms
+        self._deadline = _anchors.Deadline(budget / 1000.0) if budget else None
+        try:
+            proc, skip = self._cached_preprocess_table(table, table_index, seen_hashes)
+        except _anchors.BudgetExceeded as e:
+            proc, skip = None, {"page_number": table.get("page_number"), "table_index": table_index,
+                                "reason": "budget_exceeded", "stage": e.stage, "elapsed_ms": round(e.elapsed * 1e3, 1)}
+        finally:
+            self._deadline = None
+        if proc is not None and near_index is not None and proc.get("table_type") in self.cfg.near_dup_types:
+            proc, skip = self._near_duplicate_check(proc, near_index)
+            self.timer.lap("near_dup")
+        self.timer.end(skip)
+        return proc, skip
+
+    def new_near_dup_index(self) -> Optional[Any]:
+        if self.cfg.near_dup == "off":
+            return None
+        return _neardup.SimHashIndex(self.cfg.near_dup_max_distance)
+
+    def _near_duplicate_check(self, proc: Dict[str,Any], index: Any
+                              ) -> Tuple[Optional[Dict[str,Any]], Optional[Dict[str,Any]]]:
+        fp = _neardup.simhash64(_neardup.table_text(proc.get("headers", []), proc.get("data", [])))
+        hit = index.query(fp) if fp else None
+        if hit is None:
+            if fp:
+                index.add(fp, {"content_hash": proc["content_hash"], "page_number": proc["page_number"],
+                               "table_index": proc["table_index"]})
+            return dict(proc, simhash=f"{fp:016x}"), None
+        lineage = dict(hit[0], distance=hit[1])
+        if self.cfg.near_dup == "skip":
+            return None, {"page_number": proc["page_number"], "table_index": proc["table_index"],
+                          "reason": "near_duplicate", "near_duplicate_of": lineage}
+        return dict(proc, simhash=f"{fp:016x}", near_duplicate_of=lineage), None
+
+    def _cached_preprocess_table(
         self,
         table: Dict[str,Any],
         table_index: int,
         seen_hashes: set[str]
     ) -> Tuple[Optional[Dict[str,Any]], Optional[Dict[str,Any]]]:
+        if self.cache is None:
+            return self._preprocess_table(table, table_index, seen_hashes)
+
+        # cached results are stored pre-dedupe; duplicates are resolved against this run's hashes
+        key = _cache.digest_bytes([
+            self._cache_version.encode(),
+            json.dumps([table_index, table], sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"),
+        ])
+        hit = self.cache.get(key)
+        self.timer.lap("cache")
+        if hit is None:
+            proc, skip = self._preprocess_table(table, table_index, None)
+            self.cache.put(key, [proc, skip])
+            self.timer.lap("cache_put")
+        else:
+            proc, skip = hit
+        if proc is not None and self.cfg.dedupe:
+            if proc["content_hash"] in seen_hashes:
+                return None, {"page_number": proc["page_number"], "table_index": table_index, "reason": "duplicate"}
+            seen_hashes.add(proc["content_hash"])
+        return proc, skip
+
+    def _preprocess_table(
+        self,
+        table: Dict[str,Any],
+        table_index: int,
+        seen_hashes: Optional[set[str]]
+    ) -> Tuple[Optional[Dict[str,Any]], Optional[Dict[str,Any]]]:
 
+        lap = self.timer.lap
+        if self._deadline is not None:
+            timer_lap, deadline = self.timer.lap, self._deadline
+            def lap(stage: str) -> None:
+                timer_lap(stage)
+                deadline.check(stage)
         page_no = table.get("page_number")
         table_data = table.get("table_data") or []
         if not table_data:
             return None, {"page_number": page_no, "table_index": table_index, "reason": "empty_table"}
 
-        table_type = self.classify(table_data, page_no)
+        feats = TableFeatures.from_table_data(table_data)
+        raw_keys = list(table_data[0].keys()) if table_data else []
+        col_keys = [k for k in raw_keys if _COL_KEY_RE.fullmatch(k)]
+        lap("features")
+        if self.cfg.pre_triage:
+            rule = self.pre_triage(table_data, page_no, col_keys, feats)
+            lap("pre_triage")
+            if rule:
+                self.timer.count(f"triage:{rule}")
+                return None, {"page_number": page_no, "table_index": table_index, "reason": "skipped_non_valuable"}
+        table_type = self.classify(table_data, page_no, features=feats)
+        lap("classify")
 
         # --- Schema-agnostic salvage: synthesize single text column when col_* are missing/sparse ---
         salvage = False
-        raw_keys = list(table_data[0].keys()) if table_data else []
-        col_keys = [k for k in raw_keys if re.fullmatch(r"(?i)col_\d+", k)]
-        nonempty_colvals = sum(
-            1 for row in table_data for k in col_keys
-            if normalize_cell(row.get(k, "")) not in {"", "-"}
-        )
+        nonempty_colvals = sum(feats.table.filled(k) for k in col_keys)
         texty_keys = [k for k in raw_keys if k not in col_keys]
 
-        def row_to_text(row: Dict[str, Any]) -> str:
-            return concat_row_fields(row)
-
         display_headers: List[str] = []
         raw_header_parts: Optional[List[List[str]]] = None
         used_header_rows: List[int] = []
@@ -2272,11 +2815,12 @@ class Surgeon:
         table_title: Optional[str] = None
 
         if (len(col_keys) == 0) or (nonempty_colvals <= 1) or (texty_keys and nonempty_colvals == 0):
-            cat_rows = [[row_to_text(r)] for r in table_data if row_to_text(r)]
+            valid = feats.table.row_valid
+            cat_rows = [[txt] for txt in (concat_row_fields(r) for r, ok in zip(table_data, valid) if ok) if txt]
             cat_rows = [r for r in cat_rows if len(r[0]) >= 40]  # discard trivial lines
             if cat_rows:
                 blob = " ".join(r[0].lower() for r in cat_rows[:6])
-                is_fp_soft = any(tok in blob for tok in FP_TOKENS) or bool(re.search(r'@|https?://|www\.', blob))
+                is_fp_soft = FP_MATCHER.any(blob) or bool(re.search(r'@|https?://|www\.', blob))
                 anchors, kv, roles = self._anchor_kv_stats(blob)
 
                 if is_fp_soft:
@@ -2297,29 +2841,27 @@ class Surgeon:
                 raw_header_parts = None
                 data_rows = cat_rows
                 salvage = True
+        lap("salvage")
 
         # If not salvaged, follow the normal pipeline
         if not salvage:
             has_col_keys = len(col_keys) > 0
-            cols = safe_get_max_cols(table_data) if has_col_keys else 1
+            cols = feats.n_cols if has_col_keys else 1
             empty_cols: List[int] = []
             if table_type != TableType.FRONT_PAGE and has_col_keys:
-                for j in range(cols):
-                    non_empty = sum(1 for row in table_data if normalize_cell(row.get(f"col_{j}", "")) not in {"","-"})
+                for j, non_empty in enumerate(feats.col_filled[:cols]):
                     if len(table_data) and (non_empty/len(table_data)) < 0.30:
                         empty_cols.append(j)
             kept_cols = [j for j in range(cols) if j not in empty_cols] or list(range(cols))
 
             if has_col_keys:
-                header_rows = self.detect_header_rows(table_data, max_header_rows=self.cfg.max_header_rows)
+                header_rows = self.detect_header_rows(table_data, max_header_rows=self.cfg.max_header_rows, features=feats)
                 display_headers, raw_header_parts, table_title, used_header_rows = self.extract_headers(
-                    table_data, header_rows, kept_cols, self.cfg.max_header_length
+                    table_data, header_rows, kept_cols, self.cfg.max_header_length, features=feats
                 )
-                # Build data rows (omit header rows)
-                raw_data_rows_initial = [
-                    [normalize_cell(row.get(f"col_{j}", "")) for j in kept_cols]
-                    for i, row in enumerate(table_data) if i not in set(used_header_rows)
-                ]
+                # Build data rows (omit header rows) straight from the normalized columns
+                raw_data_rows_initial = feats.rows_of(kept_cols, set(used_header_rows))
+                lap("headers")
             else:
                 # Fallback (rare): synthesize a single text column
                 display_headers = ["Column_0"]
@@ -2339,7 +2881,7 @@ class Surgeon:
                     for i in range(max_lines):
                         data_rows.append([normalize_cell(p[i]) if i < len(p) else "" for p in parts])
                 else:
-                    data_rows.append([normalize_cell(x) for x in r])
+                    data_rows.append(r)
 
             # FRONT_PAGE semantic compact labels (Directive 4)
             if table_type == TableType.FRONT_PAGE and all(h.startswith("Column_") for h in display_headers):
@@ -2357,6 +2899,7 @@ class Surgeon:
                     pruned.append(r)
                     seen_lines.add(k)
             data_rows = pruned
+        lap("rows")
 
         # --------------------
         # POLICY PRE-GATE (before any rejection)
@@ -2372,27 +2915,25 @@ class Surgeon:
         accept_override = False
         try:
             from phoenix.memory import memory_layer
-            learn_cfg = {
-                "enabled": True,
-                "events_path": "out/review/learning_events.jsonl",
-                "patterns_path": "out/patterns/patterns.jsonl",
-                "exploration_rate": 0.15,
-            }
             dossier_name = str(table.get("source_file","")) or "unknown"
-            proc_table_peek, decision = memory_layer.apply(proc_table_peek, dossier_name, learn_cfg, stage="pre_gate")
+            proc_table_peek, decision = memory_layer.apply(proc_table_peek, dossier_name, self.learn_cfg, stage="pre_gate")
             accept_override = bool(decision.get("accept_override", False))
             display_headers = proc_table_peek.get("headers", display_headers)
             data_rows = proc_table_peek.get("data", data_rows)
         except Exception:
             pass
+        lap("pre_gate")
 
         # Honest context gate (policy may override)
-        if not accept_override and not self.is_contextually_valuable(data_rows, table_type, page_no):
+        data_feats = TableFeatures(data_rows)
+        valuable = accept_override or self.is_contextually_valuable(data_rows, table_type, page_no, features=data_feats)
+        lap("valuable_gate")
+        if not valuable:
             return None, {"page_number": page_no, "table_index": table_index, "reason":"skipped_non_valuable"}
 
         # Demote weak late FRONT_PAGE to GENERIC to avoid inflating counts
         if (table_type == TableType.FRONT_PAGE) and (page_no is not None and page_no > 3):
-            flat = " ".join(" ".join(r) for r in (data_rows or [])).lower()
+            flat = data_feats.flat.lower()
             a, k, roles = self._anchor_kv_stats(flat)
             if not (a >= 3 and k >= 3):
                 table_type = TableType.GENERIC
@@ -2405,19 +2946,20 @@ class Surgeon:
         # hash + dedupe
         t_hash = compute_table_hash(display_headers, data_rows, table_index, raw_header_parts,
                                     sample_rows=40, page_no=page_no, title=table_title)
-        if self.cfg.dedupe and t_hash in seen_hashes:
-            return None, {"page_number": page_no, "table_index": table_index, "reason": "duplicate"}
-        seen_hashes.add(t_hash)
-
-        # confidence (simple)
+        lap("hash")
+        if seen_hashes is not None:
+            if self.cfg.dedupe and t_hash in seen_hashes:
+                return None, {"page_number": page_no, "table_index": table_index, "reason": "duplicate"}
+            seen_hashes.add(t_hash)
+
+        # confidence (simple): padding/blank-row pruning never adds numeric cells,
+        # so the per-column numeric counts from the gate features still hold.
         numeric_cols = 0
-        for j in range(target_cols):
-            vals = [r[j] for r in data_rows if j < len(r)]
-            if not vals:
-                continue
-            num = sum(bool(re.fullmatch(r"[0-9,.\-()%₹]+", v or "")) for v in vals)
-            if num >= max(1, int(0.5*len(vals))):
-                numeric_cols += 1
+        if data_rows:
+            col_numeric = data_feats.col_stats[1]
+            for j in range(min(target_cols, len(col_numeric))):
+                if col_numeric[j] >= max(1, int(0.5*len(data_rows))):
+                    numeric_cols += 1
         period_detected = any(re.search(r"(19|20)\d{2}", h) or "ended" in h.lower() for h in display_headers)
         confidence = min(1.0, 0.15 + 0.35*(numeric_cols/max(1,target_cols)) + (0.25 if period_detected else 0))
 
@@ -2431,26 +2973,143 @@ class Surgeon:
             "content_hash": t_hash,
             "confidence": round(confidence, 3),
         }
+        lap("confidence")
 
         # Optional post-gate learning hook
         try:
             from phoenix.memory import memory_layer
-            learn_cfg = {
-                "enabled": True,
-                "events_path": "out/review/learning_events.jsonl",
-                "patterns_path": "out/patterns/patterns.jsonl",
-                "exploration_rate": 0.15,
-            }
             dossier_name = str(table.get("source_file","")) or "unknown"
-            proc_table, _ = memory_layer.apply(proc_table, dossier_name, learn_cfg, stage="post_gate")
+            proc_table, _ = memory_layer.apply(proc_table, dossier_name, self.learn_cfg, stage="post_gate")
         except Exception:
             pass
+        lap("post_gate")
 
         return proc_table, None
 
+# -------------------- Streaming I/O --------------------
+
+class _JsonStream:
+    """
+    Minimal pull parser over a JSON text file: structural characters are read
+    one at a time and whole values are decoded with raw_decode, so only the
+    value currently being decoded (one table) has to fit in the buffer.
+    """
+
+    def __init__(self, f, chunk_size: int = 1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, need: int) -> bool:
+        if self.eof:
+            return False
+        if self.pos > self.chunk_size:  # drop consumed text
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        chunk = self.f.read(max(self.chunk_size, need))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def peek(self) -> str:
+        while True:
+            n = len(self.buf)
+            while self.pos < n and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < n:
+                return self.buf[self.pos]
+            if not self._fill(0):
+                return ""
+
+    def expect(self, chars: str) -> str:
+        c = self.peek()
+        if not c or c not in chars:
+            raise ValueError(f"legacy JSON: expected one of {chars!r} at offset {self.pos}, got {c!r}")
+        self.pos += 1
+        return c
+
+    def value(self) -> Any:
+        self.peek()
+        need = self.chunk_size
+        while True:
+            try:
+                val, end = self.decoder.raw_decode(self.buf, self.pos)
+                # a number may be cut at the buffer edge; make sure it really ended
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return val
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._fill(need):
+                continue
+            need *= 2  # large value: grow reads geometrically instead of retrying per chunk
+
+def iter_legacy_tables(input_json_path: str) -> Iterator[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+    """
+    Stream (key, meta, table) from a legacy ``{key: {..., "tables": [...]}}`` file
+    one table at a time (first top-level key only, like run_on_legacy).
+    ``meta`` holds the scalar fields seen so far (filename precedes tables in
+    every extract we produce).
+    """
+    with open(input_json_path, "r", encoding="utf-8") as f:
+        js = _JsonStream(f)
+        js.expect("{")
+        if js.peek() == "}":
+            return
+        key = js.value()
+        js.expect(":")
+        js.expect("{")
+        meta: Dict[str, Any] = {}
+        if js.peek() == "}":
+            return
+        while True:
+            field = js.value()
+            js.expect(":")
+            if field == "tables" and js.peek() == "[":
+                js.expect("[")
+                if js.peek() != "]":
+                    while True:
+                        yield key, meta, js.value()
+                        if js.expect(",]") == "]":
+                            break
+                else:
+                    js.expect("]")
+            else:
+                meta[field] = js.value()
+            if js.expect(",}") == "}":
+                return
+
+def _surgeon_results(tables: Iterable[Tuple[str, Dict[str, Any]]], surgeon: Optional["Surgeon"] = None
+                     ) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    """Run one Surgeon over (dossier_name, legacy_table) pairs, yielding (proc, skip) per table."""
+    surgeon = surgeon or Surgeon(PreprocessorConfig())
+    seen: set[str] = set()
+    near = surgeon.new_near_dup_index()
+    try:
+        for idx, (dossier_name, t) in enumerate(tables):
+            t = dict(t)  # shallow copy to annotate
+            t["source_file"] = dossier_name
+            yield surgeon.preprocess_table(t, idx, seen, near)
+    finally:
+        _flush_learning_events()
+
+def _flush_learning_events() -> None:
+    # learning events are buffered; pool workers exit without atexit, so flush per dossier
+    try:
+        from phoenix.memory import memory_layer
+        memory_layer.flush_events()
+    except Exception:
+        pass
+
 # -------------------- Runner --------------------
 
-def run_on_legacy(input_json_path: str) -> Dict[str, Any]:
+def run_on_legacy(input_json_path: str, cfg: Optional[PreprocessorConfig] = None) -> Dict[str, Any]:
     with open(input_json_path, "r", encoding="utf-8") as f:
         legacy = json.load(f)
 
@@ -2458,15 +3117,11 @@ def run_on_legacy(input_json_path: str) -> Dict[str, Any]:
     meta = legacy[key]
     tables = meta.get("tables", [])
 
-    surgeon = Surgeon(PreprocessorConfig())
-    seen = set()
     processed, skipped = [], []
 
     dossier_name = (meta.get("filename") or key or "unknown")
-    for idx, t in enumerate(tables):
-        t = dict(t)  # shallow copy to annotate
-        t["source_file"] = dossier_name
-        proc, skip = surgeon.preprocess_table(t, idx, seen)
+    surgeon = Surgeon(cfg or PreprocessorConfig())
+    for proc, skip in _surgeon_results(((dossier_name, t) for t in tables), surgeon):
         if proc:
             processed.append(proc)
         elif skip:
@@ -2480,16 +3135,216 @@ def run_on_legacy(input_json_path: str) -> Dict[str, Any]:
         "processed": processed,
         "skipped": skipped
     }
+    if surgeon.cache is not None:
+        result["cache"] = dict(surgeon.cache.stats)
+    if isinstance(surgeon.timer, StageTimer):
+        result["timings"] = surgeon.timer.as_dict()
     return result
 
+def run_on_legacy_stream(input_json_path: str, output_jsonl_path: str,
+                         cfg: Optional[PreprocessorConfig] = None) -> Dict[str, Any]:
+    """
+    Bounded-memory variant of run_on_legacy: tables are read one at a time and
+    every processed/skipped record is appended to a JSONL file as soon as it is
+    produced. Lines are tagged with "kind":
+      {"kind": "header", "source", "filename"}      first line
+      {"kind": "processed", ...proc_table}          one per processed table
+      {"kind": "skipped", ...skip}                  one per skipped table
+      {"kind": "summary", "processed_count", "skipped_count"}   last line
+    Returns the header+summary fields (no table payloads).
+    """
+    counts = {"processed": 0, "skipped": 0}
+    header: Dict[str, Any] = {"source": None, "filename": None}
+
+    with open(output_jsonl_path, "w", encoding="utf-8") as out:
+        def tables() -> Iterator[Tuple[str, Dict[str, Any]]]:
+            for key, meta, t in iter_legacy_tables(input_json_path):
+                if header["source"] is None:
+                    header.update(source=key, filename=meta.get("filename"))
+                    out.write(json.dumps({"kind": "header", **header}, ensure_ascii=False) + "\n")
+                yield (meta.get("filename") or key or "unknown"), t
+
+        surgeon = Surgeon(cfg or PreprocessorConfig())
+        for proc, skip in _surgeon_results(tables(), surgeon):
+            rec = proc or skip
+            if not rec:
+                continue
+            kind = "processed" if proc else "skipped"
+            counts[kind] += 1
+            out.write(json.dumps({"kind": kind, **rec}, ensure_ascii=False) + "\n")
+        if header["source"] is None:  # no tables at all: still emit a header line
+            out.write(json.dumps({"kind": "header", **header}, ensure_ascii=False) + "\n")
+        summary = {"processed_count": counts["processed"], "skipped_count": counts["skipped"]}
+        if surgeon.cache is not None:
+            summary["cache"] = dict(surgeon.cache.stats)
+        if isinstance(surgeon.timer, StageTimer):
+            summary["timings"] = surgeon.timer.as_dict()
+        out.write(json.dumps({"kind": "summary", **summary}, ensure_ascii=False) + "\n")
+    return {**header, **summary, "out": output_jsonl_path}
+
+_OUTPUT_SUFFIX = ".preproc_v6_2.json"
+
+def dossier_paths(indir: str) -> List[str]:
+    """Legacy dossiers (*.json) in indir, without Surgeon outputs written next to earlier inputs."""
+    return sorted(p for p in glob.glob(os.path.join(indir, "*.json"))
+                  if not os.path.basename(p).endswith(_OUTPUT_SUFFIX))
+
+def _dossier_stem(path: str) -> str:
+    base = os.path.basename(path)
+    for ext in (".json.gz", ".json"):
+        if base.endswith(ext):
+            return base[: -len(ext)]
+    return os.path.splitext(base)[0]
+
+def _run_dossier(input_json_path: str, out_dir: Optional[str] = None, stream: bool = False,
+                 cfg: Optional[PreprocessorConfig] = None) -> Dict[str, Any]:
+    """Worker for run_on_corpus: one dossier, never raises (failures are reported, not propagated)."""
+    t0 = time.perf_counter()
+    rec: Dict[str, Any] = {"input": input_json_path, "ok": False}
+    try:
+        if stream and out_dir:
+            out = os.path.join(out_dir, _dossier_stem(input_json_path) + ".preproc_v6_2.jsonl")
+            res = run_on_legacy_stream(input_json_path, out, cfg)
+            rec.update(ok=True, processed=res["processed_count"], skipped=res["skipped_count"], out=out)
+            if "timings" in res:
+                rec["timings"] = res["timings"]
+            rec["seconds"] = round(time.perf_counter() - t0, 3)
+            return rec
+        res = run_on_legacy(input_json_path, cfg)
+        rec.update(ok=True, processed=res["processed_count"], skipped=res["skipped_count"])
+        if "timings" in res:
+            rec["timings"] = res["timings"]
+        if out_dir:
+            out = os.path.join(out_dir, _dossier_stem(input_json_path) + ".preproc_v6_2.json")
+            with open(out, "w", encoding="utf-8") as f:
+                json.dump(res, f, ensure_ascii=False, indent=2)
+            rec["out"] = out
+        else:
+            rec["result"] = res
+    except Exception as e:
+        rec["error"] = f"{type(e).__name__}: {e}"
+    rec["seconds"] = round(time.perf_counter() - t0, 3)
+    return rec
+
+def run_on_corpus(paths: List[str], jobs: int = 1, out_dir: Optional[str] = None, stream: bool = False,
+                  cfg: Optional[PreprocessorConfig] = None) -> Dict[str, Any]:
+    """
+    Run the Surgeon over many legacy dossiers on a process pool.
+
+    - Results come back in input order regardless of completion order.
+    - A dossier that fails (bad JSON, crash, dead worker) is reported with ok=False
+      and an error string; the rest of the batch keeps going.
+    - With out_dir, each worker writes <stem>.preproc_v6_2.json itself and only a
+      small status record travels back to the parent (stream=True writes
+      <stem>.preproc_v6_2.jsonl via run_on_legacy_stream instead).
+    """
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    t0 = time.perf_counter()
+    jobs = max(1, min(int(jobs or 1), len(paths) or 1))
+    records: List[Dict[str, Any]] = []
+    if jobs == 1:
+        records = [_run_dossier(p, out_dir, stream, cfg) for p in paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as ex:
+            futures = [ex.submit(_run_dossier, p, out_dir, stream, cfg) for p in paths]
+            for p, fut in zip(paths, futures):
+                try:
+                    records.append(fut.result())
+                except Exception as e:  # worker died (BrokenProcessPool etc.)
+                    records.append({"input": p, "ok": False, "error": f"{type(e).__name__}: {e}", "seconds": None})
+
+    wall = time.perf_counter() - t0
+    ok = [r for r in records if r.get("ok")]
+    tables = sum(r["processed"] + r["skipped"] for r in ok)
+    summary = {
+        "dossiers": len(records),
+        "ok": len(ok),
+        "failed": len(records) - len(ok),
+        "tables": tables,
+        "jobs": jobs,
+        "wall_seconds": round(wall, 3),
+        "dossier_seconds": round(sum(r["seconds"] for r in ok), 3),
+        "tables_per_sec": round(tables / wall, 1) if wall > 0 else 0.0,
+        "dossiers_per_min": round(len(records) * 60.0 / wall, 2) if wall > 0 else 0.0,
+    }
+    return {"summary": summary, "dossiers": records}
+
 def main():
-    import argparse, os
+    import argparse
     ap = argparse.ArgumentParser(description="Phoenix Surgeon v6.2 — run on legacy JSON")
-    ap.add_argument("--input", required=True, help="Path to legacy JSON file")
+    ap.add_argument("--input", required=False, help="Path to legacy JSON file")
     ap.add_argument("--output", required=False, help="Output JSON path")
+    ap.add_argument("--inputs", nargs="+", help="Batch mode: several legacy JSON files")
+    ap.add_argument("--indir", help="Batch mode: every *.json in this directory")
+    ap.add_argument("--outdir", help="Batch mode: output directory (default: next to each input)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Batch mode: worker processes")
+    ap.add_argument("--stream", action="store_true",
+                    help="Bounded-memory mode: read tables incrementally and write JSONL (.preproc_v6_2.jsonl)")
+    ap.add_argument("--cache-dir", help="Reuse per-table results across runs (content-addressed, LRU-bounded)")
+    ap.add_argument("--cache-max-mb", type=int, default=256, help="Size bound for --cache-dir")
+    ap.add_argument("--seed", type=int, default=None,
+                    help="Deterministic memory-layer exploration (default with --cache-dir: 0)")
+    ap.add_argument("--near-dup", choices=("off", "mark", "skip"), default="mark",
+                    help="Near-duplicate FRONT_PAGE slabs: off, mark with near_duplicate_of lineage, or skip")
+    ap.add_argument("--timings", action="store_true",
+                    help="Record per-stage wall time / counts; adds a 'timings' block and prints a summary line per dossier to stderr")
+    ap.add_argument("--table-budget-ms", type=float, default=None,
+                    help="Per-table time budget; tables over it are skipped with reason budget_exceeded")
+    ap.add_argument("--patterns", default="out/patterns/patterns.jsonl",
+                    help="Memory-layer patterns: JSONL, or a SQLite store (.db/.sqlite, see phoenix.memory.store)")
+    ap.add_argument("--events", default="out/review/learning_events.jsonl", help="Learning events path")
+    ap.add_argument("--events-layout", choices=("file", "sharded"), default="file",
+                    help="Learning events: one JSONL file, or per-worker rotated shards with an index (safe with --jobs)")
+    ap.add_argument("--events-flush-every", type=int, default=256, help="Learning events per batched append")
+    ap.add_argument("--events-background", action="store_true", help="Append learning events from a daemon thread")
+    ap.add_argument("--events-rotate-mb", type=float, default=64.0, help="Sharded events: seal a segment at this size")
+    ap.add_argument("--events-rotate-s", type=float, default=86400.0,
+                    help="Sharded events: seal a segment open this long (0 = size only)")
+    ap.add_argument("--patterns-recheck-s", type=float, default=2.0,
+                    help="Stat the patterns file / store at most this often")
     args = ap.parse_args()
-
-    res = run_on_legacy(args.input)
+    cfg = PreprocessorConfig(cache_dir=args.cache_dir, cache_max_mb=args.cache_max_mb, learning_seed=args.seed,
+                             timings=args.timings, near_dup=args.near_dup, table_budget_ms=args.table_budget_ms,
+                             events_layout=args.events_layout, patterns_path=args.patterns, events_path=args.events,
+                             events_flush_every=args.events_flush_every, events_background=args.events_background,
+                             events_rotate_mb=args.events_rotate_mb, events_rotate_s=args.events_rotate_s or None,
+                             patterns_recheck_s=args.patterns_recheck_s)
+
+    if args.inputs or args.indir:
+        paths = list(args.inputs or [])
+        if args.indir:
+            paths += dossier_paths(args.indir)
+        if args.stream and not args.outdir:
+            ap.error("--stream in batch mode needs --outdir")
+        batch = run_on_corpus(paths, jobs=args.jobs, out_dir=args.outdir, stream=args.stream, cfg=cfg)
+        for rec in batch["dossiers"]:
+            if not rec.get("ok"):
+                continue
+            if "timings" in rec:
+                print(format_timings(_dossier_stem(rec["input"]), rec["timings"]), file=sys.stderr)
+            if "result" in rec:  # no --outdir: write next to the input, like single mode
+                out = os.path.splitext(rec["input"])[0] + ".preproc_v6_2.json"
+                with open(out, "w", encoding="utf-8") as f:
+                    json.dump(rec.pop("result"), f, ensure_ascii=False, indent=2)
+                rec["out"] = out
+        print(json.dumps({"ok": batch["summary"]["failed"] == 0, **batch}, ensure_ascii=False))
+        return
+    if not args.input:
+        ap.error("one of --input, --inputs or --indir is required")
+
+    if args.stream:
+        out = args.output or (os.path.splitext(args.input)[0] + ".preproc_v6_2.jsonl")
+        res = run_on_legacy_stream(args.input, out, cfg)
+        if "timings" in res:
+            print(format_timings(_dossier_stem(args.input), res["timings"]), file=sys.stderr)
+        print(json.dumps({"ok": True, "processed": res["processed_count"], "skipped": res["skipped_count"], "out": out}))
+        return
+
+    res = run_on_legacy(args.input, cfg)
+    if "timings" in res:
+        print(format_timings(_dossier_stem(args.input), res["timings"]), file=sys.stderr)
     out = args.output or (os.path.splitext(args.input)[0] + ".preproc_v6_2.json")
     with open(out, "w", encoding="utf-8") as f:
         json.dump(res, f, ensure_ascii=False, indent=2)
@@ -2497,7 +3352,8 @@ def main():
         "ok": True,
         "processed": res["processed_count"],
         "skipped": res["skipped_count"],
-        "out": out
+        "out": out,
+        **({"cache": res["cache"]} if "cache" in res else {}),
     }))
 
 if __name__ == "__main__":
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bounded anchor / key-value scanning shared by the Surgeon, memory layer and SVR.
+
+Contact-slab anchors (email, URL, phone) and "Label:" key-value markers are
+searched over flattened table text. Two guards keep a scan linear in the text:
+  - backtracking guard: the EMAIL local part and the EMAIL/URL host runs carry an
+    upper bound ({1,64} / {1,255}). Unbounded, a long [A-Za-z0-9.-] run without
+    a dot-TLD (OCR'd digit strings, "-----" rules) is retried from every start
+    position, i.e. quadratic. A run longer than the bound still matches through
+    its suffix, so which texts contain an anchor does not change.
+    PHONE_RE keeps its shape: each start digit's run ends at the run's last digit,
+    so it is already linear (and bounding it would split ledger digit runs into
+    several "phones").
+  - windows: at most `limit` characters (SCAN_WINDOW by default) are scanned.
+Counters take a `cap` and stop at the first `cap` matches, for callers that only
+compare against a threshold (>= 3 anchors, >= 3 KV labels).
+"""
+from __future__ import annotations
+
+import re
+import time
+from itertools import islice
+from typing import Optional, Tuple
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Za-z]{2,}")
+URL_RE   = re.compile(r"(?:(?:https?://)?(?:www\.)?[A-Za-z0-9.-]{1,255}\.[A-Za-z]{2,}(?:/[^\s]*)?)", re.I)
+PHONE_RE = re.compile(r"(?:\+?\d[\d\s\-]{7,}\d)")
+KV_RE    = re.compile(r"[A-Za-z][A-Za-z\s]{1,30}:")
+# a URL_RE match exists iff some [A-Za-z0-9.-] char is followed by "." and two letters
+# (the run can shrink to that one char), so presence is probed without the run
+_URL_PROBE = re.compile(r"[A-Za-z0-9.-]\.[A-Za-z]{2}", re.I)
+# cheap necessary conditions checked before a full scan
+_REQUIRES = {EMAIL_RE: "@", KV_RE: ":"}
+
+SCAN_WINDOW = 16384  # chars; the largest legacy table blob in data/ is ~13.5k
+
+def window(text: str, limit: Optional[int] = SCAN_WINDOW) -> str:
+    return text if not limit or len(text) <= limit else text[:limit]
+
+def count(regex: "re.Pattern[str]", text: str, cap: Optional[int] = None, limit: Optional[int] = SCAN_WINDOW) -> int:
+    """Non-overlapping matches of regex in the window, stopping once cap is reached."""
+    t = window(text, limit)
+    need = _REQUIRES.get(regex)
+    if (need is not None and need not in t) or (regex is URL_RE and _URL_PROBE.search(t) is None):
+        return 0
+    it = regex.finditer(t)
+    return sum(1 for _ in (it if cap is None else islice(it, cap)))
+
+def anchor_flags(text: str, limit: Optional[int] = SCAN_WINDOW) -> Tuple[bool, bool, bool]:
+    """(has_email, has_url, has_phone); the email scan is skipped when there is no "@"."""
+    t = window(text, limit)
+    return ("@" in t and EMAIL_RE.search(t) is not None,
+            _URL_PROBE.search(t) is not None,
+            PHONE_RE.search(t) is not None)
+
+def anchor_count(text: str, limit: Optional[int] = SCAN_WINDOW) -> int:
+    """Number of anchor kinds (0..3) present."""
+    return sum(anchor_flags(text, limit))
+
+# -------------------- per-table time budget --------------------
+
+class BudgetExceeded(Exception):
+    def __init__(self, stage: str, elapsed: float):
+        super().__init__(f"time budget exceeded at {stage} ({elapsed*1e3:.1f} ms)")
+        self.stage = stage
+        self.elapsed = elapsed
+
+class Deadline:
+    """Cooperative watchdog: check(stage) raises BudgetExceeded once the budget is spent."""
+    __slots__ = ("budget", "t0")
+
+    def __init__(self, budget_s: float):
+        self.budget = float(budget_s)
+        self.t0 = time.perf_counter()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.t0
+
+    def check(self, stage: str) -> None:
+        el = time.perf_counter() - self.t0
+        if el > self.budget:
+            raise BudgetExceeded(stage, el)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared text helpers (dependency-free; safe to load from the plain-script entry points).
+
+KeywordMatcher: single-pass multi-keyword substring matcher.
+  All keywords are compiled into one prefix-factored regex (a trie rendered as
+  nested alternations), so a text is scanned once no matter how many aliases a
+  lexicon grows. Semantics match the `k in text` loops it replaces: every
+  keyword that occurs anywhere counts, including overlapping ones
+  ("tel" inside "telephone", "phone" inside "telephone").
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, Set, Tuple
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    trie: Dict[str, dict] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def render(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + render(sub) for ch, sub in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # greedy optional tail: at any position the longest keyword wins
+        return "(?:" + body + ")?" if "" in node else body
+
+    return render(trie)
+
+class KeywordMatcher:
+    """
+    Compiled keyword set.
+      any(text)     -> bool             (stops at the first hit)
+      hits(text)    -> set of keywords present
+      n_hits(text)  -> number of distinct keywords present
+      counts(text)  -> {keyword: occurrences}, overlapping occurrences included
+    Matching is case-sensitive; callers lowercase text the same way they
+    lowercased it for the old substring loops.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(k for k in keywords if k))
+        body = _trie_pattern(self.keywords) if self.keywords else "(?!)"
+        self._search = re.compile(body).search
+        # zero-width lookahead so matches starting inside another match are still seen
+        self._scan = re.compile("(?=(" + body + "))").finditer
+        # keywords matching at a position are exactly the prefixes of the longest one there
+        self._prefixes: Dict[str, Tuple[str, ...]] = {
+            k: tuple(p for p in self.keywords if k.startswith(p)) for k in self.keywords
+        }
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def any(self, text: str) -> bool:
+        return bool(text) and self._search(text) is not None
+
+    def hits(self, text: str) -> Set[str]:
+        found: Set[str] = set()
+        if not text:
+            return found
+        seen_longest: Set[str] = set()
+        for m in self._scan(text):
+            longest = m.group(1)
+            if longest not in seen_longest:
+                seen_longest.add(longest)
+                found.update(self._prefixes[longest])
+        return found
+
+    def n_hits(self, text: str) -> int:
+        return len(self.hits(text))
+
+    def counts(self, text: str) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        if not text:
+            return out
+        for m in self._scan(text):
+            for k in self._prefixes[m.group(1)]:
+                out[k] = out.get(k, 0) + 1
+        return out
+
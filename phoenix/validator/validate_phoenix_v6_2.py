@@ -17,10 +17,27 @@ Surgeon path resolution order:
   --preproc arg > $PREPROC_PATH > ./test_dir/preproc_v6_2.py >
   ./phoenix/surgeon/preproc_v6_2.py > /mnt/data/preproc_v6_2.py
 """
-import argparse, json, os, re, sys, tempfile, subprocess
+import argparse, importlib, importlib.util, json, os, re, sys, tempfile, subprocess
 from pathlib import Path
 from typing import Any, Dict, List
 
+def _shared_module(name: str):
+    """Import phoenix.<name>, or load it from its file when run as a plain script (root not on sys.path)."""
+    try:
+        return importlib.import_module(f"phoenix.{name}")
+    except ImportError:
+        qual = f"phoenix.{name}"
+        if qual in sys.modules:
+            return sys.modules[qual]
+        path = Path(__file__).resolve().parents[1].joinpath(*name.split(".")).with_suffix(".py")
+        spec = importlib.util.spec_from_file_location(qual, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[qual] = mod
+        spec.loader.exec_module(mod)
+        return mod
+
+_tabularity = _shared_module("metrics.tabularity")
+
 HERE = Path(__file__).resolve().parent
 
 def find_preproc(explicit: str|None) -> Path|None:
@@ -51,21 +68,7 @@ def load_legacy_counts(legacy_path: Path) -> int:
     return -1
 
 def tabularity_score(rows: List[List[str]]) -> float:
-    if not rows: return 0.0
-    cols = max((len(r) for r in rows), default=0)
-    if cols <= 1: return 0.0
-    def isnum(v: str) -> bool: return bool(re.match(r"^[0-9,.\-\(\)%₹`]+$", (v or "").strip()))
-    col_scores = []
-    for j in range(cols):
-        vals = [r[j] for r in rows if j < len(r) and (r[j] or "").strip()]
-        if not vals: col_scores.append(0.0); continue
-        num = sum(isnum(v) for v in vals)
-        frac = max(num/len(vals), 1 - num/len(vals))
-        col_scores.append(frac)
-    purity = sum(col_scores)/len(col_scores)
-    strong = sum(1 for f in col_scores if f > 0.7)
-    width = 1.0 if (cols >= 2 and strong >= 1) else 0.0
-    return round(0.7*purity + 0.3*width, 3)
+    return _tabularity.tabularity(rows, "validator")
 
 def main() -> None:
     ap = argparse.ArgumentParser()
@@ -127,15 +130,11 @@ def main() -> None:
         reasons.append(f"unexpected_output_count:{pcount+scount} vs legacy:{raw_count}")
 
 # G4: Structural integrity — measure only on genuinely tabular candidates
-    weak = 0
-    considered = 0
-    for t in processed:
-        if t.get("synthetic_singlecol") or t.get("table_type") == "FRONT_PAGE":
-            continue  # text salvage and FP contact slabs are allowed to be low-tabular
-        considered += 1
-        score = tabularity_score(t.get("data", []))
-        if score < 0.25:
-            weak += 1
+    # text salvage and FP contact slabs are allowed to be low-tabular
+    candidates = [t.get("data", []) or [] for t in processed
+                  if not (t.get("synthetic_singlecol") or t.get("table_type") == "FRONT_PAGE")]
+    considered = len(candidates)
+    weak = sum(1 for score in _tabularity.tabularity_batch(candidates, "validator") if score < 0.25)
     if considered and weak/considered > 0.25:
         reasons.append("low_tabularity_fraction")
 
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Speed benchmark for the Phase-1A chain (Surgeon -> SVR -> financials ETL) over data/*.json.
+
+Usage:
+  python scripts/bench_surgeon.py                          # 3 trials (+1 warmup), print JSON report
+  python scripts/bench_surgeon.py --save --stamp           # write ci/baseline/bench_<ts>.json + bench_golden.json
+  python scripts/bench_surgeon.py --compare --tol 0.15     # exit 2 if any stage's tables/sec regressed > 15%
+
+Reported per stage (surgeon / svr / etl): tables/sec over the median trial, p50/p95/p99
+per-table latency (ms) pooled over all trials; per dossier: median wall time; process peak RSS.
+The Surgeon runs with its StageTimer on, so the report also carries its per-stage breakdown.
+
+Like run_phase1a.sh, modules are loaded from their files without putting the repo root on
+sys.path, so the optional memory layer stays off (the mode the golden KPIs are taken in);
+--memory switches it on. The ETL stage needs pandas; without it the stage is reported as
+unavailable rather than failing the run.
+"""
+import argparse, importlib.util, json, math, os, platform, resource, statistics, subprocess, sys, time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+DEF_TOL = 0.15
+STAGES = ("surgeon", "svr", "etl")
+
+def load_module(qual: str, path: Path):
+    if qual in sys.modules:
+        return sys.modules[qual]
+    spec = importlib.util.spec_from_file_location(qual, path)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[qual] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+def load_etl(path: Path):
+    try:
+        return load_module("phoenix_bench_etl", path), None
+    except Exception as e:  # pandas etc. missing
+        sys.modules.pop("phoenix_bench_etl", None)
+        return None, f"{type(e).__name__}: {e}"
+
+def percentile(sorted_vals: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_vals:
+        return 0.0
+    k = max(0, min(len(sorted_vals) - 1, math.ceil(q / 100.0 * len(sorted_vals)) - 1))
+    return sorted_vals[k]
+
+def peak_rss_mb() -> float:
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(kb / (1024.0 * 1024.0) if sys.platform == "darwin" else kb / 1024.0, 1)
+
+def git_rev() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "-C", str(ROOT), "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+# -------------------- one dossier --------------------
+
+def run_dossier(P, S, etl, etl_hints, path: str, lat: Dict[str, List[float]]) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    with open(path, "r", encoding="utf-8") as f:
+        legacy = json.load(f)
+    key = next(iter(legacy.keys()))
+    meta = legacy[key]
+    tables = meta.get("tables", [])
+    dossier_name = meta.get("filename") or key or "unknown"
+    t_load = time.perf_counter() - t0
+
+    # Surgeon, timed per table between generator yields
+    surgeon = P.Surgeon(P.PreprocessorConfig(timings=True))
+    processed, skipped = [], []
+    results = P._surgeon_results(((dossier_name, t) for t in tables), surgeon)
+    t_surgeon = 0.0
+    while True:
+        t1 = time.perf_counter()
+        try:
+            proc, skip = next(results)
+        except StopIteration:
+            break
+        dt = time.perf_counter() - t1
+        t_surgeon += dt
+        lat["surgeon"].append(dt)
+        if proc:
+            processed.append(proc)
+        elif skip:
+            skipped.append(skip)
+    res = {"source": key, "filename": meta.get("filename"),
+           "processed_count": len(processed), "skipped_count": len(skipped),
+           "processed": processed, "skipped": skipped}
+
+    # SVR (whole-dossier call; latency is per processed table on average)
+    t1 = time.perf_counter()
+    S.compute_svr(res, source=key)
+    t_svr = time.perf_counter() - t1
+    if processed:
+        lat["svr"].extend([t_svr / len(processed)] * len(processed))
+
+    # ETL over FINANCIAL_STATEMENT tables
+    t_etl, n_etl = 0.0, 0
+    if etl is not None:
+        for t in processed:
+            if t.get("table_type") != "FINANCIAL_STATEMENT":
+                continue
+            t1 = time.perf_counter()
+            if etl_hints is None:
+                etl.build_rows_from_table(dossier_name, t)
+            else:
+                etl.build_rows_from_table(dossier_name, t, etl_hints)
+            dt = time.perf_counter() - t1
+            t_etl += dt
+            n_etl += 1
+            lat["etl"].append(dt)
+
+    return {
+        "dossier": Path(path).stem,
+        "tables": len(tables),
+        "processed": len(processed),
+        "etl_tables": n_etl,
+        "seconds": {"load": t_load, "surgeon": t_surgeon, "svr": t_svr, "etl": t_etl},
+        "wall_seconds": time.perf_counter() - t0,
+        "surgeon_stages": surgeon.timer.as_dict()["stages"],
+        "rss_mb": peak_rss_mb(),
+    }
+
+# -------------------- report --------------------
+
+def summarize(trials: List[List[Dict[str, Any]]], lat: Dict[str, List[float]], etl_error: Optional[str]) -> Dict[str, Any]:
+    def med(vals: List[float]) -> float:
+        return statistics.median(vals) if vals else 0.0
+
+    stages: Dict[str, Any] = {}
+    for st in STAGES:
+        if st == "etl" and etl_error:
+            stages[st] = {"unavailable": etl_error}
+            continue
+        count_key = {"surgeon": "tables", "svr": "processed", "etl": "etl_tables"}[st]
+        n_tables = sum(d[count_key] for d in trials[0])
+        secs = med([sum(d["seconds"][st] for d in trial) for trial in trials])
+        vals = sorted(lat[st])
+        stages[st] = {
+            "tables": n_tables,
+            "seconds": round(secs, 4),
+            "tables_per_sec": round(n_tables / secs, 1) if secs > 0 else 0.0,
+            "p50_ms": round(percentile(vals, 50) * 1e3, 3),
+            "p95_ms": round(percentile(vals, 95) * 1e3, 3),
+            "p99_ms": round(percentile(vals, 99) * 1e3, 3),
+        }
+
+    dossiers = []
+    for i, d in enumerate(trials[0]):
+        runs = [trial[i] for trial in trials]
+        dossiers.append({
+            "dossier": d["dossier"],
+            "tables": d["tables"],
+            "wall_seconds": round(med([r["wall_seconds"] for r in runs]), 4),
+            **{f"{st}_seconds": round(med([r["seconds"][st] for r in runs]), 4) for st in ("load",) + STAGES},
+            "rss_mb": max(r["rss_mb"] for r in runs),
+        })
+
+    breakdown: Dict[str, Dict[str, float]] = {}
+    for d in trials[-1]:
+        for name, rec in d["surgeon_stages"].items():
+            agg = breakdown.setdefault(name, {"calls": 0, "seconds": 0.0})
+            agg["calls"] += rec["calls"]
+            agg["seconds"] += rec["seconds"]
+    breakdown = {k: {"calls": v["calls"], "seconds": round(v["seconds"], 4)}
+                 for k, v in sorted(breakdown.items(), key=lambda kv: -kv[1]["seconds"])}
+
+    return {"stages": stages, "dossiers": dossiers, "surgeon_stages": breakdown, "peak_rss_mb": peak_rss_mb()}
+
+def compare(report: Dict[str, Any], golden: Dict[str, Any], tol: float) -> List[str]:
+    bad = []
+    for st, g in golden.get("stages", {}).items():
+        cur = report["stages"].get(st, {})
+        if "tables_per_sec" not in g or "tables_per_sec" not in cur:
+            continue
+        gv, cv = float(g["tables_per_sec"]), float(cur["tables_per_sec"])
+        if gv > 0 and cv < gv * (1.0 - tol):
+            bad.append(f"[SLOWER] {st}: {cv:.1f} tables/sec vs golden {gv:.1f} ({(cv/gv - 1)*100:+.1f}%, tol={tol})")
+    return bad
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark Surgeon / SVR / ETL throughput over legacy dossiers")
+    ap.add_argument("--indir", default=str(ROOT / "data"))
+    ap.add_argument("--trials", type=int, default=3)
+    ap.add_argument("--warmup", type=int, default=1, help="Untimed trials run first (imports, caches)")
+    ap.add_argument("--etl", default=str(ROOT / "scripts" / "etl_financials_v2.py"), help="ETL module (build_rows_from_table)")
+    ap.add_argument("--memory", action="store_true", help="Enable the memory layer (puts the repo root on sys.path)")
+    ap.add_argument("--outdir", default=str(ROOT / "ci" / "baseline"))
+    ap.add_argument("--save", action="store_true", help="Write bench results (+ bench_golden.json alias) to --outdir")
+    ap.add_argument("--stamp", action="store_true")
+    ap.add_argument("--compare", action="store_true", help="Fail (exit 2) if throughput regressed vs <outdir>/bench_golden.json")
+    ap.add_argument("--golden", default=None, help="Golden file for --compare (default: <outdir>/bench_golden.json)")
+    ap.add_argument("--tol", type=float, default=DEF_TOL, help="Allowed fractional drop in tables/sec")
+    args = ap.parse_args()
+    if args.save and args.compare:
+        ap.error("--save rewrites the golden --compare reads; run --compare first, then --save")
+
+    if args.memory and str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    P = load_module("phoenix.surgeon.preproc_v6_2", ROOT / "phoenix" / "surgeon" / "preproc_v6_2.py")
+    S = load_module("phoenix.audit.blind_faith_svr", ROOT / "phoenix" / "audit" / "blind_faith_svr.py")
+    etl, etl_error = load_etl(Path(args.etl))
+    etl_hints = None
+    if etl is not None and hasattr(etl, "_load_unit_hints"):
+        etl_hints = etl._load_unit_hints()
+
+    paths = P.dossier_paths(args.indir)
+    if not paths:
+        print(f"No dossiers in {args.indir}"); sys.exit(1)
+
+    trials: List[List[Dict[str, Any]]] = []
+    lat: Dict[str, List[float]] = {st: [] for st in STAGES}
+    for i in range(max(0, args.warmup) + max(1, args.trials)):
+        warm = i < args.warmup
+        scratch: Dict[str, List[float]] = {st: [] for st in STAGES}
+        trial = [run_dossier(P, S, etl, etl_hints, p, scratch) for p in paths]
+        if warm:
+            continue
+        trials.append(trial)
+        for st in STAGES:
+            lat[st].extend(scratch[st])
+
+    ts = datetime.now().strftime("%Y%m%d_%H%M")
+    report = {
+        "stamp": ts,
+        "git": git_rev(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "memory_layer": bool(args.memory),
+        "trials": len(trials),
+        "warmup": args.warmup,
+        **summarize(trials, lat, etl_error),
+    }
+
+    outdir = Path(args.outdir)
+    if args.save:
+        outdir.mkdir(parents=True, exist_ok=True)
+        stamped = outdir / f"bench{'_' + ts if args.stamp else ''}.json"
+        stamped.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        (outdir / "bench_golden.json").write_text(stamped.read_text(encoding="utf-8"), encoding="utf-8")
+
+    print(json.dumps(report, ensure_ascii=False))
+
+    if args.compare:
+        golden_path = Path(args.golden) if args.golden else outdir / "bench_golden.json"
+        if not golden_path.exists():
+            print(f"Missing benchmark golden: {golden_path} (create it with --save)"); sys.exit(1)
+        bad = compare(report, json.loads(golden_path.read_text(encoding="utf-8")), args.tol)
+        if bad:
+            print("=== THROUGHPUT REGRESSION ===")
+            print("\n".join(bad))
+            sys.exit(2)
+        print("Benchmark comparison: PASS")
+
+if __name__ == "__main__":
+    main()
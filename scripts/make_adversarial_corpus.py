@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Synthetic adversarial perf corpus in the legacy dossier format ({key: {filename, tables[page_number, table_data]}}).
+
+One table family per item of docs/adversarial_dossier_checklist.md, plus the regex stressors the
+anchor scanners are guarded against (long digit / dotted runs with no TLD, "----" rules, whole-page
+prose, KV-label floods). Every table is labelled in <outdir>/labels.csv using the columns of
+docs/adversarial_label_template.csv.
+
+Usage:
+  python scripts/make_adversarial_corpus.py                                  # 3 dossiers -> out/perf/adversarial
+  python scripts/make_adversarial_corpus.py --dossiers 10 --scale 4 --seed 7
+  python scripts/bench_surgeon.py --indir out/perf/adversarial               # throughput / p99 on it
+  python phoenix/surgeon/preproc_v6_2.py --indir out/perf/adversarial --outdir out/perf/adversarial_pp \\
+      --table-budget-ms 250 --timings
+"""
+import argparse, csv, json, random
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+LABEL_FIELDS = ["file", "page", "bbox_x1", "bbox_y1", "bbox_x2", "bbox_y2",
+                "header_rows", "cols", "expected_headers", "issues", "notes"]
+
+MONTHS = ["March", "June", "September", "December"]
+LINE_ITEMS = ["Revenue from operations", "Other income", "Cost of materials consumed", "Employee benefits expense",
+              "Finance costs", "Depreciation and amortisation", "Other expenses", "Profit before tax",
+              "Current tax", "Deferred tax", "Profit for the year", "Trade receivables", "Inventories",
+              "Cash and cash equivalents", "Borrowings", "Trade payables", "Total equity"]
+WORDS = ("the company issue offer shares equity capital objects net proceeds investors bid price band "
+         "allotment registrar promoter group selling shareholders risk factors business operations").split()
+
+Table = Tuple[List[Dict[str, Any]], Dict[str, Any]]  # (table_data, label fields)
+
+def _rows(grid: List[List[Any]]) -> List[Dict[str, Any]]:
+    return [{f"col_{j}": v for j, v in enumerate(r)} for r in grid]
+
+def _num(rng: random.Random) -> str:
+    return f"{rng.randint(1, 99999):,}.{rng.randint(0, 99):02d}"
+
+def _years(rng: random.Random, n: int) -> List[int]:
+    y = rng.randint(2019, 2024)
+    return [y - i for i in range(n)]
+
+# -------------------- checklist: table structure --------------------
+
+def nested_headers(rng: random.Random, scale: int) -> Table:
+    ys = _years(rng, 3)
+    grid = [["Particulars", "For the period ended", "", "As at", "", ""],
+            ["", f"{rng.choice(MONTHS)} 30, {ys[0]}", "", f"March 31, {ys[1]}", f"March 31, {ys[2]}", ""],
+            ["", "(₹ in million)", "(% of total)", "(₹ in million)", "(₹ in million)", "Notes"]]
+    for item in rng.sample(LINE_ITEMS, min(len(LINE_ITEMS), 8 + 2 * scale)):
+        grid.append([item, _num(rng), f"{rng.uniform(0, 100):.2f}%", _num(rng), _num(rng), str(rng.randint(1, 40))])
+    return _rows(grid), {"header_rows": 3, "issues": "nested_headers;period_hybrid"}
+
+def merged_cells(rng: random.Random, scale: int) -> Table:
+    grid = [["Segment", "Fiscal 2024", "", "Fiscal 2023", ""], ["", "Amount", "%", "Amount", "%"]]
+    for seg in ("Domestic", "Exports"):
+        for i, item in enumerate(rng.sample(LINE_ITEMS, 3 + scale)):
+            grid.append([seg if i == 0 else None, _num(rng), f"{rng.uniform(0, 60):.2f}", _num(rng), f"{rng.uniform(0, 60):.2f}"])
+    return _rows(grid), {"header_rows": 2, "issues": "vertical_merge;horizontal_merge"}
+
+def kpi_panel(rng: random.Random, scale: int) -> Table:
+    ys = _years(rng, 3)
+    grid = [["Key Performance Indicator", f"Fiscal {ys[0]}", f"Fiscal {ys[1]}", f"Fiscal {ys[2]}"]]
+    for k in ("EBITDA", "EBITDA Margin (%)", "PAT", "RoCE (%)", "RoNW (%)", "Net Debt / Equity", "Order book")[:4 + scale]:
+        grid.append([k] + [_num(rng) if "%" not in k else f"{rng.uniform(1, 40):.2f}%" for _ in ys])
+    return _rows(grid), {"header_rows": 1, "issues": "kpi_panel;period_stitching"}
+
+def inline_footnotes(rng: random.Random, scale: int) -> Table:
+    ys = _years(rng, 2)
+    grid = [["Particulars", "Note", f"March 31, {ys[0]}", f"March 31, {ys[1]}"]]
+    for item in rng.sample(LINE_ITEMS, min(len(LINE_ITEMS), 6 + 2 * scale)):
+        grid.append([item + rng.choice(["", "*", "(1)", "#", "^"]), str(rng.randint(1, 45)), _num(rng), _num(rng)])
+        if rng.random() < 0.3:
+            grid.append(["(1) Refer note " + str(rng.randint(1, 45)) + " of the Restated Financial Information", "", "", ""])
+    return _rows(grid), {"header_rows": 1, "issues": "inline_footnotes"}
+
+def row_stub_band(rng: random.Random, scale: int) -> Table:
+    grid = [["Sr. No.", "Particulars", "Notes", "Assets Liabilities Equity Income Expenses", ""],
+            ["", "Particulars of assets and liabilities and equity and income", "", "", ""]]
+    for i, item in enumerate(rng.sample(LINE_ITEMS, min(len(LINE_ITEMS), 6 + scale)), 1):
+        grid.append([str(i), item, str(rng.randint(1, 30)), _num(rng), _num(rng)])
+    return _rows(grid), {"header_rows": 1, "issues": "row_stub_band"}
+
+# -------------------- checklist: page composition / formatting --------------------
+
+def sparse_micro(rng: random.Random, scale: int) -> Table:
+    return _rows([["Face value", "₹ 10 each"], ["Price band", "[●] to [●]"]]), {"header_rows": 0, "issues": "sparse_page;micro_table"}
+
+def multi_panel(rng: random.Random, scale: int) -> Table:
+    grid = [["Panel A", "", "", "Panel B", ""], ["Metric", "FY24", "FY23", "Metric", "FY24"]]
+    for _ in range(4 + scale):
+        grid.append([rng.choice(LINE_ITEMS), _num(rng), _num(rng), rng.choice(LINE_ITEMS), _num(rng)])
+    grid.append(["Total", _num(rng), _num(rng), "", ""])
+    return _rows(grid), {"header_rows": 2, "issues": "multi_panel;varying_cols"}
+
+def ocr_noise(rng: random.Random, scale: int) -> Table:
+    def noisy(s: str) -> str:
+        return "".join(c if rng.random() > 0.08 else rng.choice("Il1|0O.,'`~ ") for c in s)
+    grid = [["Partlculars", "Marcb 31, 2O23", "Marcb 31, 2O22"]]
+    for item in rng.sample(LINE_ITEMS, min(len(LINE_ITEMS), 8 + scale)):
+        grid.append([noisy(item), noisy(_num(rng)), noisy(_num(rng)) + "`"])
+    return _rows(grid), {"header_rows": 1, "issues": "ocr_artifacts;format_drift"}
+
+# -------------------- checklist: front-page metadata --------------------
+
+def brlm_block(rng: random.Random, scale: int) -> Table:
+    name = rng.choice(["Axis Capital Limited", "ICICI Securities Limited", "Link Intime India Private Limited"])
+    host = name.split()[0].lower()
+    grid = [["BOOK RUNNING LEAD MANAGER", "REGISTRAR TO THE OFFER"],
+            [name + "\nTel: +91 22 4325 " + str(rng.randint(1000, 9999)),
+             "KFin Technologies Limited\nTel: +91 40 6716 2222"],
+            [f"E-mail: ipo@{host}.com\nWebsite: www.{host}.com", "E-mail: ipo.kfin@kfintech.com\nWebsite: www.kfintech.com"],
+            ["Contact Person: " + rng.choice(["Ms. A. Shah", "Mr. R. Iyer"]), "Contact Person: M. Murali Krishna"],
+            ["SEBI Registration No.: INM000012029", "SEBI Registration No.: INR000000221"]]
+    return _rows(grid), {"header_rows": 1, "issues": "brlm_registrar;anchors"}
+
+def timeline_placeholders(rng: random.Random, scale: int) -> Table:
+    grid = [["BID / OFFER PROGRAMME", ""], ["ANCHOR INVESTOR BIDDING DATE", "[●]"],
+            ["BID / OFFER OPENS ON", "[●]"], ["BID / OFFER CLOSES ON", "[●]" + "*" * rng.randint(1, 3)]]
+    return _rows(grid), {"header_rows": 1, "issues": "timeline_placeholders"}
+
+# -------------------- regex stressors --------------------
+
+def digit_run(rng: random.Random, scale: int) -> Table:
+    # OCR'd ledger: column separators lost, one huge digit/dot string per cell (no TLD anywhere)
+    run = "".join(rng.choice("0123456789.") for _ in range(6000 * scale))
+    return _rows([["Ledger", run], ["", run[::-1]]]), {"header_rows": 0, "issues": "stress:digit_dot_run"}
+
+def dash_rules(rng: random.Random, scale: int) -> Table:
+    grid = [["1 " + "-" * (4000 * scale), "2" + " -" * (2000 * scale)] for _ in range(3)]
+    return _rows(grid), {"header_rows": 0, "issues": "stress:rule_lines"}
+
+def prose_page(rng: random.Random, scale: int) -> Table:
+    para = " ".join(rng.choice(WORDS) for _ in range(2500 * scale))
+    return _rows([[para]]), {"header_rows": 0, "issues": "stress:whole_page_prose"}
+
+def kv_flood(rng: random.Random, scale: int) -> Table:
+    grid = [[f"{rng.choice(WORDS)} {rng.choice(WORDS)}: {rng.choice(WORDS)}" * 40 * scale,
+             "contact person: " + "x" * 20 + " email:" * 200 * scale] for _ in range(4)]
+    return _rows(grid), {"header_rows": 0, "issues": "stress:kv_labels"}
+
+def near_miss_email(rng: random.Random, scale: int) -> Table:
+    # long local-part runs with no "@" close by, and hosts without a TLD
+    local = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789._-") for _ in range(5000 * scale))
+    return _rows([[local + " @ " + local, "a@" + "b" * (3000 * scale)]]), {"header_rows": 0, "issues": "stress:email_near_miss"}
+
+FAMILIES: List[Tuple[str, Callable[[random.Random, int], Table], Tuple[int, int]]] = [
+    ("nested_headers", nested_headers, (30, 200)),
+    ("merged_cells", merged_cells, (30, 200)),
+    ("kpi_panel", kpi_panel, (20, 120)),
+    ("inline_footnotes", inline_footnotes, (150, 300)),
+    ("row_stub_band", row_stub_band, (150, 300)),
+    ("sparse_micro", sparse_micro, (1, 3)),
+    ("multi_panel", multi_panel, (20, 200)),
+    ("ocr_noise", ocr_noise, (40, 300)),
+    ("brlm_block", brlm_block, (1, 3)),
+    ("timeline_placeholders", timeline_placeholders, (1, 3)),
+    ("digit_run", digit_run, (4, 300)),
+    ("dash_rules", dash_rules, (4, 300)),
+    ("prose_page", prose_page, (4, 300)),
+    ("kv_flood", kv_flood, (3, 300)),
+    ("near_miss_email", near_miss_email, (3, 300)),
+]
+
+def build_dossier(rng: random.Random, idx: int, scale: int, per_family: int) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    fname = f"Adversarial_{idx:02d}.pdf"
+    tables: List[Dict[str, Any]] = []
+    labels: List[Dict[str, Any]] = []
+    for fam, make, (lo, hi) in FAMILIES:
+        for _ in range(per_family):
+            data, lab = make(rng, scale)
+            page = rng.randint(lo, hi)
+            tables.append({"page_number": page, "table_data": data})
+            cols = max((len(r) for r in data), default=0)
+            headers = [str(v) for v in data[0].values()] if lab.get("header_rows") and data else []
+            labels.append({"file": fname, "page": page, "header_rows": lab.get("header_rows", 0), "cols": cols,
+                           "expected_headers": " | ".join(h.replace("\n", " ") for h in headers),
+                           "issues": lab.get("issues", ""), "notes": fam})
+    rng.shuffle(tables)
+    tables.sort(key=lambda t: t["page_number"])
+    return {fname: {"filename": fname, "file_size_mb": 0.0, "tables": tables}}, labels
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate a synthetic adversarial perf corpus (legacy JSON dossiers)")
+    ap.add_argument("--outdir", default="out/perf/adversarial")
+    ap.add_argument("--dossiers", type=int, default=3)
+    ap.add_argument("--per-family", type=int, default=2, help="Tables per family per dossier")
+    ap.add_argument("--scale", type=int, default=1, help="Multiplier for table sizes (stressors grow linearly)")
+    ap.add_argument("--seed", type=int, default=13)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    outdir = Path(args.outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+    all_labels: List[Dict[str, Any]] = []
+    n_tables = 0
+    for i in range(1, args.dossiers + 1):
+        doc, labels = build_dossier(rng, i, max(1, args.scale), max(1, args.per_family))
+        key = next(iter(doc))
+        (outdir / f"{Path(key).stem}.json").write_text(json.dumps(doc, ensure_ascii=False, indent=1), encoding="utf-8")
+        all_labels.extend(labels)
+        n_tables += len(doc[key]["tables"])
+    with (outdir / "labels.csv").open("w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=LABEL_FIELDS)
+        w.writeheader()
+        for lab in all_labels:
+            w.writerow({k: lab.get(k, "") for k in LABEL_FIELDS})
+    print(json.dumps({"outdir": str(outdir), "dossiers": args.dossiers, "tables": n_tables,
+                      "families": [f for f, _, _ in FAMILIES], "seed": args.seed}))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Small synthetic prospectus-like PDFs for exercising `phoenix ingest` without real filings.
+
+Written with raw PDF operators (Helvetica text, stroked rules), no PDF library needed.
+Each page is one of:
+  - ruled:    a lined financial grid (period columns x line items) under a title
+  - unruled:  the same kind of grid with whitespace-aligned columns only
+  - contact:  a front-page style "Label: value" block
+  - prose:    paragraphs of running text (no table)
+The page plan is printed as JSON so a test can check which pages yielded tables.
+
+Usage:
+  python scripts/make_test_pdfs.py --outdir out/perf/pdfs --docs 2 --pages 40 --seed 7
+  python -m phoenix.ingest.pdf_ingest out/perf/pdfs/doc_000.pdf --out out/perf/pdfs/doc_000.json --jobs 2
+"""
+import argparse, json, random
+from pathlib import Path
+from typing import List, Tuple
+
+PAGE_W, PAGE_H = 612, 792
+LINE_ITEMS = ["Revenue from operations", "Other income", "Employee benefits expense", "Finance costs",
+              "Depreciation and amortisation", "Other expenses", "Profit before tax", "Current tax",
+              "Profit for the year", "Trade receivables", "Inventories", "Borrowings"]
+WORDS = ("the company issue offer shares equity capital objects net proceeds investors bid price band "
+         "allotment registrar promoter group selling shareholders risk factors business operations").split()
+
+def _esc(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+class _Page:
+    def __init__(self):
+        self.ops: List[str] = []
+
+    def text(self, x: float, top: float, s: str, size: float = 9) -> None:
+        self.ops.append(f"BT /F1 {size} Tf {x:.2f} {PAGE_H - top - size:.2f} Td ({_esc(s)}) Tj ET")
+
+    def rule(self, x0: float, top0: float, x1: float, top1: float) -> None:
+        self.ops.append(f"0.5 w {x0:.2f} {PAGE_H - top0:.2f} m {x1:.2f} {PAGE_H - top1:.2f} l S")
+
+def _num(rng: random.Random) -> str:
+    return f"{rng.randint(1, 99999):,}.{rng.randint(0, 99):02d}"
+
+def _grid(pg: _Page, rng: random.Random, ruled: bool, top: float = 120) -> None:
+    years = [f"FY {y}" for y in range(2024, 2024 - rng.randint(2, 4), -1)]
+    items = rng.sample(LINE_ITEMS, rng.randint(4, 10))
+    xs = [50, 230] + [230 + 90 * (k + 1) for k in range(len(years))]
+    rh = 18
+    pg.text(50, top - 30, "Restated Statement of Profit and Loss (in lakhs)", 11)
+    rows = [["Particulars"] + years] + [[it] + [_num(rng) for _ in years] for it in items]
+    for r, row in enumerate(rows):
+        for c, cell in enumerate(row):
+            pg.text(xs[c] + 4, top + r * rh + 4, cell)
+    if ruled:
+        bottom = top + len(rows) * rh
+        for r in range(len(rows) + 1):
+            pg.rule(xs[0], top + r * rh, xs[-1], top + r * rh)
+        for x in xs:
+            pg.rule(x, top, x, bottom)
+
+def _contact(pg: _Page, rng: random.Random) -> None:
+    pg.text(50, 60, "BOOK RUNNING LEAD MANAGER", 11)
+    fields = [("Telephone", f"+91 22 {rng.randint(1000, 9999)} {rng.randint(1000, 9999)}"),
+              ("Email", f"ipo{rng.randint(1, 99)}@leadmanager.example.com"),
+              ("Website", "www.leadmanager.example.com"), ("Contact Person", "A. Sharma"),
+              ("SEBI Registration No", f"INM{rng.randint(10**8, 10**9 - 1)}")]
+    for k, (label, value) in enumerate(fields):
+        pg.text(50, 90 + 16 * k, f"{label}: {value}")
+
+def _prose(pg: _Page, rng: random.Random) -> None:
+    for k in range(40):
+        pg.text(50, 50 + 16 * k, " ".join(rng.choice(WORDS) for _ in range(14)))
+
+def write_pdf(path: Path, pages: List[_Page]) -> None:
+    objs: List[bytes] = []
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages)))
+    objs.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objs.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    objs.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    for i, pg in enumerate(pages):
+        stream = "\n".join(pg.ops).encode("latin-1", "replace")
+        objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_W} {PAGE_H}] "
+                    f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode())
+        objs.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for n, body in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % n + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref)
+    path.write_bytes(bytes(out))
+
+def make_doc(path: Path, n_pages: int, rng: random.Random) -> List[Tuple[int, str]]:
+    plan, pages = [], []
+    for p in range(1, n_pages + 1):
+        kind = "contact" if p == 1 else rng.choice(("ruled", "ruled", "unruled", "prose", "prose"))
+        pg = _Page()
+        if kind == "ruled":
+            _grid(pg, rng, ruled=True)
+        elif kind == "unruled":
+            _grid(pg, rng, ruled=False)
+        elif kind == "contact":
+            _contact(pg, rng)
+        else:
+            _prose(pg, rng)
+        pages.append(pg)
+        plan.append((p, kind))
+    write_pdf(path, pages)
+    return plan
+
+def main():
+    ap = argparse.ArgumentParser(description="Write synthetic PDFs (ruled / unruled tables, contact blocks, prose)")
+    ap.add_argument("--outdir", default="out/perf/pdfs")
+    ap.add_argument("--docs", type=int, default=2)
+    ap.add_argument("--pages", type=int, default=40)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+    rng = random.Random(args.seed)
+    out = Path(args.outdir)
+    out.mkdir(parents=True, exist_ok=True)
+    plans = {}
+    for d in range(args.docs):
+        path = out / f"doc_{d:03d}.pdf"
+        plans[path.name] = make_doc(path, args.pages, rng)
+    print(json.dumps({"outdir": str(out), "docs": args.docs, "pages": args.pages, "plans": plans}))
+
+if __name__ == "__main__":
+    main()
@@ -373,6 +373,14 @@ fi
 # shellcheck disable=SC1090
 source "$VENV_DIR/bin/activate" || die "venv activate failed"
 python --version || die "Python not working in venv"
+# the Phase-1A chain (preproc, validator, SVR) needs numpy (metrics/tabularity.py); the rest of
+# requirements.txt (OCR, NLP, pandas) is for other stages, so only numpy is installed here
+if ! python -c "import numpy" >/dev/null 2>&1; then
+  NUMPY_REQ="$(grep -iE '^numpy([<>=~!].*)?$' "$PROJECT_ROOT/requirements.txt" 2>/dev/null | head -1)"
+  info "Installing ${NUMPY_REQ:-numpy} into $VENV_DIR"
+  python -m pip install --quiet "${NUMPY_REQ:-numpy}" \
+    || die "numpy is required (phoenix/metrics/tabularity.py) and could not be installed into $VENV_DIR; install it (pip install '${NUMPY_REQ:-numpy}') or point VENV_DIR at an environment that has it"
+fi
 
 # ---------- helpers ----------
 strip_name() {
@@ -0,0 +1,23 @@
+import os, socket
+
+from phoenix.memory.eventlog import EventLog, ShardWriter
+
+def _events(n, start=0, dossier="d1"):
+    return [{"ts": float(start + i), "dossier": dossier, "stage": "apply", "i": start + i} for i in range(n)]
+
+def test_seal_idle_then_append_keeps_every_event(tmp_path):
+    w = ShardWriter(tmp_path, worker="otherhost-1")
+    w.append(_events(3))
+    assert EventLog(tmp_path).seal_idle(0)        # worker not of this host: sealed by age
+    w.append(_events(1, start=3))
+    w.seal()
+    log = EventLog(tmp_path)
+    assert [e["i"] for e in log.read()] == [0, 1, 2, 3]
+    assert [e["i"] for e in log.read(dossier="d1")] == [0, 1, 2, 3]
+    assert not list(tmp_path.glob("*.jsonl.gz.tmp"))
+
+def test_seal_idle_skips_live_worker_of_this_host(tmp_path):
+    w = ShardWriter(tmp_path, worker=f"{socket.gethostname()}-{os.getpid()}")
+    w.append(_events(2))
+    assert EventLog(tmp_path).seal_idle(0) == []
+    assert w.segment.exists()
@@ -0,0 +1,22 @@
+from phoenix.spotter.lattice import lattice_tables
+from phoenix.spotter.spotter_heuristic import words_array
+
+def _hline(y, x0, x1):
+    return {"x0": x0, "x1": x1, "top": y, "bottom": y}
+
+def _vline(x, top, bottom):
+    return {"x0": x, "x1": x, "top": top, "bottom": bottom}
+
+def test_single_box_is_not_a_table():
+    assert lattice_tables(1, [], [{"x0": 10, "x1": 200, "top": 10, "bottom": 100}]) == []
+    box = [_hline(10, 10, 200), _hline(100, 10, 200), _vline(10, 10, 100), _vline(200, 10, 100)]
+    assert lattice_tables(1, box) == []
+
+def test_two_by_two_grid():
+    lines = [_hline(y, 10, 210) for y in (10, 30, 50)] + [_vline(x, 10, 50) for x in (10, 110, 210)]
+    words = [{"x": 20, "y": 15, "w": 30, "h": 8, "text": "Item"}, {"x": 120, "y": 15, "w": 30, "h": 8, "text": "FY24"},
+             {"x": 20, "y": 35, "w": 30, "h": 8, "text": "Revenue"}, {"x": 120, "y": 35, "w": 30, "h": 8, "text": "1,200"}]
+    arr, texts = words_array([(1, words)])
+    (t,) = lattice_tables(1, lines, (), arr, texts)
+    assert (t["rows"], t["cols"]) == (2, 2)
+    assert t["table_data"] == [{"col_0": "Item", "col_1": "FY24"}, {"col_0": "Revenue", "col_1": "1,200"}]
@@ -0,0 +1,54 @@
+import random
+
+from phoenix.memory.matcher import (PatternIndex, _sketch_minhash, compute_signature, family_hints,
+                                    match_patterns, minhash, minhash_similarity)
+
+WORDS = "revenue profit loss total year period assets equity cash note particulars email telephone".split()
+FAMILIES = ["FRONT_CONTACT", "FIN_STATEMENT", "contact_slab", "period_grid", "micro_tables", "generic"]
+
+def _linear(sig, patterns, topk=3):
+    hints = family_hints(sig)
+    scored = []
+    for p in patterns:
+        sketch = p.get("signature_sketch", {}) or {}
+        c = sketch.get("cols")
+        score = 0.5 * minhash_similarity(sig.minhash, _sketch_minhash(sketch))
+        score += 0.25 * min(1.0, abs(sig.cols - (sig.cols if c is None else c)) / max(1, sig.cols))
+        score += 0.25 * (1.0 if p.get("family", "generic") in hints else 0.0)
+        scored.append((p.get("family", "generic"), round(score, 3)))
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return scored[:topk]
+
+def _patterns(rng, n):
+    out = []
+    for _ in range(n):
+        sketch = {"cols": rng.randint(1, 6)}
+        if rng.random() < 0.8:
+            sketch["minhash"] = minhash(rng.sample(WORDS, rng.randint(1, 5)))
+        out.append({"family": rng.choice(FAMILIES), "signature_sketch": sketch})
+    return out
+
+def _table(rng, headers):
+    cols = max(1, len(headers) or rng.randint(1, 5))
+    return {"headers": headers, "data": [[rng.choice(["1,200", "x", "Email", ""]) for _ in range(cols)]
+                                         for _ in range(rng.randint(1, 6))]}
+
+def test_headerless_table_is_ranked_like_the_linear_scan():
+    pats = [{"family": "FRONT_CONTACT", "signature_sketch": {"cols": 1, "minhash": minhash(["email", "telephone"])}},
+            {"family": "FIN_STATEMENT", "signature_sketch": {"cols": 3, "minhash": minhash(["revenue", "profit"])}}]
+    sig = compute_signature({"headers": [], "data": [["a", "b", "c"], ["1", "2", "3"]]})
+    assert sig.minhash == []
+    assert match_patterns(sig, pats) == _linear(sig, pats) != []
+
+def test_sparse_candidates_fall_back_to_the_linear_scan():
+    rng = random.Random(3)
+    pats = _patterns(rng, 200)
+    idx = PatternIndex(pats)
+    checked = 0
+    for _ in range(300):
+        headers = rng.sample(WORDS + ["zeta", "omega", "kappa"], rng.randint(0, 4))
+        sig = compute_signature(_table(rng, headers))
+        if len(idx.candidates(sig.minhash)) < 3:
+            assert idx.query(sig) == _linear(sig, pats)
+            checked += 1
+    assert checked > 20
@@ -0,0 +1,28 @@
+import json
+
+from phoenix.memory import memory_layer
+
+FRONT = {
+    "table_type": "FRONT_PAGE", "page_number": 1, "headers": ["BOOK RUNNING LEAD MANAGER"],
+    "data": [["Telephone: +91 22 6305 3471"], ["Email: ipo51@leadmanager.example.com"],
+             ["Website: www.leadmanager.example.com"], ["Contact Person: A. Sharma"]],
+}
+
+def _config(tmp_path, patterns):
+    path = tmp_path / "patterns.jsonl"
+    path.write_text("".join(json.dumps(p) + "\n" for p in patterns), encoding="utf-8")
+    return {"patterns_path": str(path), "events_path": str(tmp_path / "events.jsonl"), "patterns_recheck_s": 0}
+
+def test_front_page_override_without_covering_pattern(tmp_path):
+    cfg = _config(tmp_path, [{"family": "FRONT_CONTACT_KV", "signature": {"table_type": "FINANCIAL"}}])
+    table, decision = memory_layer.apply(FRONT, "doc", cfg, stage="pre_gate")
+    assert decision["action"] == "none" and decision["accept_override"] is True
+    assert table is FRONT
+
+def test_uncovered_table_stays_untouched(tmp_path):
+    cfg = _config(tmp_path, [{"family": "FRONT_CONTACT_KV", "signature": {"table_type": "FINANCIAL"}}])
+    other = dict(FRONT, table_type="OTHER")
+    assert memory_layer.apply(other, "doc", cfg, stage="pre_gate") == (other, {
+        "action": "none", "family": None, "accept_override": False, "reward_proxy": 0.0})
+    _, decision = memory_layer.apply(FRONT, "doc", cfg, stage="post_gate")
+    assert decision["accept_override"] is False
@@ -0,0 +1,23 @@
+from phoenix.ingest.pdf_ingest import spot_page
+
+def _line(y, text):
+    words, x = [], 20.0
+    for tok in text.split():
+        words.append({"x": x, "y": y, "w": 6.0 * len(tok), "h": 9, "text": tok})
+        x += 6.0 * len(tok) + 4
+    return words
+
+def test_contact_slab_is_flagged():
+    lines = ["BOOK RUNNING LEAD MANAGER", "Telephone: +91 22 6305 3471", "Email: ipo51@leadmanager.example.com",
+             "Website: www.leadmanager.example.com", "Contact Person: A. Sharma"]
+    words = [w for i, t in enumerate(lines) for w in _line(40 + 14 * i, t)]
+    spot = spot_page(1, words, (), ())
+    assert not spot["text"] and not spot["ruled"]
+    assert [" ".join(r).strip() for r in spot["contact"]][1:] == lines[1:]
+
+def test_prose_is_not_a_contact_slab():
+    lines = ["The registrar to the issue will process each bid received during",
+             "the bid period in accordance with the applicable regulations and",
+             "the allotment will be finalised as described in this section."]
+    words = [w for i, t in enumerate(lines) for w in _line(40 + 14 * i, t)]
+    assert spot_page(1, words, (), ())["contact"] == []
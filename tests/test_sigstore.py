@@ -0,0 +1,22 @@
+import numpy as np
+
+from phoenix.memory.schemas import Signature
+from phoenix.memory.sigstore import SignatureStore
+
+def _sig(i):
+    return Signature(page_no=i, table_idx=0, cols=3, rows=5 + i, num_frac_per_col=[0.1 * (i % 10), 0.5, 1.0],
+                     alpha_frac_per_col=[0.9, 0.5, 0.0], header_ngrams=[f"h{i}"])
+
+def test_load_save_load_round_trip_over_mmap(tmp_path):
+    st = SignatureStore()
+    st.extend(_sig(i) for i in range(50))
+    st.save(tmp_path)
+    mapped = SignatureStore.load(tmp_path)            # memory-mapped from the files save() rewrites
+    mapped.save(tmp_path)
+    again = SignatureStore.load(tmp_path)
+    assert [again.id_at(i) for i in range(50)] == [_sig(i).id() for i in range(50)]
+    assert np.array_equal(np.asarray(again.features), np.asarray(mapped.features))
+    mapped.add(_sig(50))                              # first add after load copies out of the mmap
+    mapped.save(tmp_path)
+    assert SignatureStore.load(tmp_path, mmap=False).id_at(50) == _sig(50).id()
+    assert not list(tmp_path.glob("*.tmp"))
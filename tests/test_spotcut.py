@@ -0,0 +1,33 @@
+import importlib.util, random
+from pathlib import Path
+
+from phoenix.ingest import spotcut
+
+ROOT = Path(__file__).resolve().parents[1]
+
+class _DictCache(dict):
+    def put(self, key, value):
+        self[key] = value
+
+def _make_pdf(path):
+    spec = importlib.util.spec_from_file_location("make_test_pdfs", ROOT / "scripts" / "make_test_pdfs.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    mod.make_doc(path, 6, random.Random(3))
+
+def _tables(pdf, cache):
+    return [(pn, run()) for pn, run in spotcut.pdf_page_jobs(str(pdf), cache)]
+
+def test_raw_page_hit_skips_word_extraction(tmp_path, monkeypatch):
+    pdf = tmp_path / "doc.pdf"
+    _make_pdf(pdf)
+    cache = _DictCache()
+    first = _tables(pdf, cache)
+    assert len(cache) and not any(hit for _, (_, hit) in first)
+
+    def boom(page):
+        raise AssertionError("words extracted on a cache hit")
+    monkeypatch.setattr(spotcut._ingest, "page_words", boom)
+    second = _tables(pdf, cache)
+    assert all(hit for _, (_, hit) in second)
+    assert [(pn, t) for pn, (t, _) in second] == [(pn, t) for pn, (t, _) in first]